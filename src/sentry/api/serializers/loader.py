@@ -0,0 +1,220 @@
+"""
+Batched loading of the attributes of a serializer call.
+
+`get_attrs` of serializers like `GroupSerializerBase` runs a number of
+separate lookups for the same list of items. `AttrsLoader` is a registry of
+those lookups for a single call:
+
+>>> loader = AttrsLoader("group")
+>>> loader.add("bookmarks", lambda: get_bookmarks(item_list))
+>>> loader.add("subscriptions", lambda: get_subscriptions(item_list))
+>>> loader.add_batch("users", lambda user_ids: get_users(user_ids))
+>>> loader.add(
+...     "snoozes",
+...     lambda: request_snooze_actors(loader, item_list),
+...     batches=("users",),
+... )
+>>> results = loader.load()
+
+Lookups which depend on the results of other lookups declare them in
+`requires`, and are passed their results as keyword arguments. Lookups which
+need the same kind of object can `request` the keys they need from a batch
+instead of fetching them themselves. A batch runs once after all lookups
+feeding it have finished, so compatible queries are merged into a single one.
+
+With `concurrent=True`, lookups which don't depend on each other run at the
+same time on a shared thread pool, in a copy of the caller's context so that
+context variables such as feature check scopes still apply. Lookups running on
+the pool use the database connections of the pool's threads, which can't see
+uncommitted writes of the caller, so lookups run sequentially while the caller
+is in a transaction. They can't rely on thread locals such as the current
+request either.
+
+The number of queries of every lookup is counted, and reported along with the
+duration of the whole call as `api.serializers.attrs_loader.*`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import dataclasses
+import threading
+import time
+from collections.abc import Callable, Collection, Generator, Hashable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import sentry_sdk
+from django.db import connections
+
+from sentry.utils import metrics
+
+_attrs_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="serializer-attrs")
+
+atexit.register(_attrs_pool.shutdown, False)
+
+
+@dataclasses.dataclass
+class _Lookup:
+    name: str
+    func: Callable[..., Any]
+    requires: tuple[str, ...] = ()
+    # Batches are resolved from the keys requested by the lookups they require
+    is_batch: bool = False
+
+
+class AttrsLoader:
+    def __init__(self, name: str, concurrent: bool = False) -> None:
+        self.name = name
+        self.concurrent = concurrent
+        self.query_counts: dict[str, int] = {}
+        self._lookups: dict[str, _Lookup] = {}
+        self._keys: dict[str, set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        requires: Iterable[str] = (),
+        batches: Iterable[str] = (),
+    ) -> None:
+        """
+        Register a lookup. `func` is called with the results of the lookups in `requires` as
+        keyword arguments, and may request keys from the `batches` it names.
+        """
+        if name in self._lookups:
+            raise ValueError(f"Lookup {name!r} is already registered")
+        self._lookups[name] = _Lookup(name, func, tuple(requires))
+        for batch in batches:
+            self._lookups[batch].requires += (name,)
+
+    def add_batch(self, name: str, func: Callable[[set[Any]], Mapping[Any, Any]]) -> None:
+        """
+        Register a batch, which is called with the union of all keys requested from it.
+        """
+        self._keys[name] = set()
+        self.add(name, func)
+        self._lookups[name].is_batch = True
+
+    def request(self, batch: str, keys: Iterable[Hashable]) -> None:
+        """
+        Request keys from a batch. Only valid for lookups that named the batch when they were
+        added.
+        """
+        with self._lock:
+            self._keys[batch].update(keys)
+
+    def load(self) -> dict[str, Any]:
+        """
+        Run all lookups and return their results by name.
+        """
+        for lookup in self._lookups.values():
+            for required in lookup.requires:
+                if required not in self._lookups:
+                    raise ValueError(f"Lookup {lookup.name!r} requires unknown {required!r}")
+
+        start = time.monotonic()
+        results: dict[str, Any] = {}
+        if self.concurrent and not _in_transaction():
+            self._load_concurrently(results)
+        else:
+            self._load_sequentially(results)
+
+        metrics.timing(
+            "api.serializers.attrs_loader.duration",
+            time.monotonic() - start,
+            tags={"serializer": self.name, "concurrent": self.concurrent},
+        )
+        metrics.distribution(
+            "api.serializers.attrs_loader.queries",
+            sum(self.query_counts.values()),
+            tags={"serializer": self.name},
+        )
+        return results
+
+    def _ready(self, done: Collection[str], started: Collection[str]) -> list[_Lookup]:
+        return [
+            lookup
+            for name, lookup in self._lookups.items()
+            if name not in started and all(required in done for required in lookup.requires)
+        ]
+
+    def _load_sequentially(self, results: dict[str, Any]) -> None:
+        while len(results) < len(self._lookups):
+            ready = self._ready(results, results)
+            if not ready:
+                raise ValueError(f"Lookups of {self.name!r} have circular requirements")
+            for lookup in ready:
+                results[lookup.name] = self._run(lookup, results)
+
+    def _load_concurrently(self, results: dict[str, Any]) -> None:
+        pending: dict[Future[Any], _Lookup] = {}
+        started: set[str] = set()
+        try:
+            while len(results) < len(self._lookups):
+                for lookup in self._ready(results, started):
+                    started.add(lookup.name)
+                    future = _attrs_pool.submit(
+                        contextvars.copy_context().run, self._run_on_pool, lookup, dict(results)
+                    )
+                    pending[future] = lookup
+                if not pending:
+                    raise ValueError(f"Lookups of {self.name!r} have circular requirements")
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future).name] = future.result()
+        finally:
+            # Don't leave lookups running against the results of a failed call
+            for future in pending:
+                future.cancel()
+
+    def _run_on_pool(self, lookup: _Lookup, results: Mapping[str, Any]) -> Any:
+        try:
+            return self._run(lookup, results)
+        finally:
+            # Connections of the pool's threads are kept across lookups, rather than closed
+            # after every lookup like `close_old_connections` does without `CONN_MAX_AGE`.
+            # Only connections which broke are dropped, so the next lookup reconnects.
+            for connection in connections.all(initialized_only=True):
+                if not connection.errors_occurred:
+                    continue
+                if connection.is_usable():
+                    connection.errors_occurred = False
+                else:
+                    connection.close()
+
+    def _run(self, lookup: _Lookup, results: Mapping[str, Any]) -> Any:
+        with (
+            sentry_sdk.start_span(op="serializer.attrs_loader", name=f"{self.name}.{lookup.name}"),
+            self._count_queries(lookup.name),
+        ):
+            if lookup.is_batch:
+                keys = self._keys[lookup.name]
+                return lookup.func(keys) if keys else {}
+            return lookup.func(**{required: results[required] for required in lookup.requires})
+
+    @contextlib.contextmanager
+    def _count_queries(self, name: str) -> Generator[None]:
+        count = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.query_counts[name] = count
+
+
+def _in_transaction() -> bool:
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
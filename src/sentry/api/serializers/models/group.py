@@ -13,8 +13,9 @@ from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.db.models import Min, prefetch_related_objects
 
-from sentry import features, tagstore
+from sentry import features, options, tagstore
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.loader import AttrsLoader
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.app import env
@@ -187,65 +188,109 @@ class GroupSerializerBase(Serializer, ABC):
 
         return result
 
-    def get_attrs(
-        self, item_list: Sequence[Group], user: User | RpcUser | AnonymousUser, **kwargs: Any
-    ) -> dict[Group, dict[str, Any]]:
-        GroupMeta.objects.populate_cache(item_list)
-
-        # Note that organization is necessary here for use in `_get_permalink` to avoid
-        # making unnecessary queries.
-        prefetch_related_objects(item_list, "project__organization")
+    def _get_attrs_loader(
+        self,
+        item_list: Sequence[Group],
+        user: User | RpcUser | AnonymousUser,
+        organization_id: int,
+    ) -> AttrsLoader:
+        """
+        Registers the lookups of `get_attrs`. Lookups which don't depend on each other run
+        concurrently if `api.serializers.group.concurrent-attrs` is enabled.
+        """
+        loader = AttrsLoader(
+            "group", concurrent=options.get("api.serializers.group.concurrent-attrs")
+        )
 
-        if user.is_authenticated and item_list:
-            bookmarks = set(
-                GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", flat=True
-                )
+        if user.is_authenticated:
+            loader.add(
+                "bookmarks",
+                lambda: set(
+                    GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
+                        "group_id", flat=True
+                    )
+                ),
             )
-            seen_groups = dict(
-                GroupSeen.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", "last_seen"
-                )
+            loader.add(
+                "seen_groups",
+                lambda: dict(
+                    GroupSeen.objects.filter(user_id=user.id, group__in=item_list).values_list(
+                        "group_id", "last_seen"
+                    )
+                ),
             )
-            subscriptions = self._get_subscriptions(item_list, user)
+            loader.add("subscriptions", lambda: self._get_subscriptions(item_list, user))
         else:
-            bookmarks = set()
-            seen_groups = {}
-            subscriptions = defaultdict(lambda: (False, False, None))
+            loader.add("bookmarks", set)
+            loader.add("seen_groups", dict)
+            loader.add("subscriptions", lambda: defaultdict(lambda: (False, False, None)))
 
-        resolved_assignees = self._serialize_assignees(item_list)
+        loader.add("assignees", lambda: self._serialize_assignees(item_list))
 
-        ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
+        # The actors of resolutions and snoozes are serialized together
+        def get_actors(user_ids: set[int]) -> Mapping[int, Any]:
+            serialized_users = user_service.serialize_many(
+                filter={"user_ids": list(user_ids), "is_active": True},
+                as_user=serialize_generic_user(user),
+            )
+            return {int(u["id"]): u for u in serialized_users}
 
-        release_resolutions, commit_resolutions = self._resolve_resolutions(item_list, user)
+        loader.add_batch("actors", get_actors)
 
-        user_ids = {
-            user_id
-            for user_id in itertools.chain(
-                (r[-1] for r in release_resolutions.values()),
-                (r.actor_id for r in ignore_items.values()),
+        def get_ignore_items() -> Mapping[int, GroupSnooze]:
+            ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
+            loader.request(
+                "actors", (i.actor_id for i in ignore_items.values() if i.actor_id is not None)
             )
-            if user_id is not None
-        }
-        if user_ids:
-            serialized_users = user_service.serialize_many(
-                filter={"user_ids": user_ids, "is_active": True},
-                as_user=serialize_generic_user(user),
+            return ignore_items
+
+        loader.add("ignore_items", get_ignore_items, batches=("actors",))
+
+        def get_resolutions() -> tuple[Mapping[int, Sequence[Any]], Mapping[int, Any]]:
+            release_resolutions, commit_resolutions = self._resolve_resolutions(item_list, user)
+            loader.request(
+                "actors", (r[-1] for r in release_resolutions.values() if r[-1] is not None)
             )
-            actors = {id: u for id, u in zip(user_ids, serialized_users)}
-        else:
-            actors = {}
+            return release_resolutions, commit_resolutions
 
-        share_ids = dict(
-            GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
-        )
+        loader.add("resolutions", get_resolutions, batches=("actors",))
 
-        seen_stats = self._get_seen_stats(item_list, user)
+        loader.add(
+            "share_ids",
+            lambda: dict(
+                GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
+            ),
+        )
+        loader.add("seen_stats", lambda: self._get_seen_stats(item_list, user))
+        loader.add(
+            "snuba_stats",
+            lambda seen_stats: self._get_group_snuba_stats(item_list, seen_stats),
+            requires=("seen_stats",),
+        )
+        loader.add(
+            "integration_annotations",
+            lambda: self._resolve_integration_annotations(organization_id, item_list),
+        )
+        loader.add(
+            "external_issue_annotations",
+            lambda: self._resolve_external_issue_annotations(item_list),
+        )
+        return loader
 
-        organization_id_list = list({item.project.organization_id for item in item_list})
+    def get_attrs(
+        self, item_list: Sequence[Group], user: User | RpcUser | AnonymousUser, **kwargs: Any
+    ) -> dict[Group, dict[str, Any]]:
         # if no groups, then we can't proceed but this seems to be a valid use case
         if not item_list:
             return {}
+
+        GroupMeta.objects.populate_cache(item_list)
+
+        # Note that organization is necessary here for use in `_get_permalink` to avoid
+        # making unnecessary queries.
+        prefetch_related_objects(item_list, "project__organization")
+
+        organization_id_list = list({item.project.organization_id for item in item_list})
         if len(organization_id_list) > 1:
             # this should never happen but if it does we should know about it
             logger.warning(
@@ -257,19 +302,29 @@ class GroupSerializerBase(Serializer, ABC):
         # should only have 1 org at this point
         organization_id = organization_id_list[0]
 
+        # Depends on the current request, so it can't run on the loader's threads
         authorized = self._is_authorized(user, organization_id)
 
+        loader = self._get_attrs_loader(item_list, user, organization_id)
+        attrs = loader.load()
+
+        bookmarks = attrs["bookmarks"]
+        seen_groups = attrs["seen_groups"]
+        subscriptions = attrs["subscriptions"]
+        resolved_assignees = attrs["assignees"]
+        ignore_items = attrs["ignore_items"]
+        release_resolutions, commit_resolutions = attrs["resolutions"]
+        actors = attrs["actors"]
+        share_ids = attrs["share_ids"]
+        seen_stats = attrs["seen_stats"]
+        snuba_stats = attrs["snuba_stats"]
+
         annotations_by_group_id: MutableMapping[int, list[Any]] = defaultdict(list)
         for annotations_by_group in itertools.chain.from_iterable(
-            [
-                self._resolve_integration_annotations(organization_id, item_list),
-                [self._resolve_external_issue_annotations(item_list)],
-            ]
+            [attrs["integration_annotations"], [attrs["external_issue_annotations"]]]
         ):
             merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
 
-        snuba_stats = self._get_group_snuba_stats(item_list, seen_stats)
-
         result = {}
         for item in item_list:
             active_date = item.active_at or item.first_seen
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import atexit
+import dataclasses
 import logging
+import os
 import pickle
-from collections.abc import Callable
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from enum import Enum
@@ -221,16 +226,60 @@ class PendingBuffer:
         return rv
 
 
+@dataclass
+class CoalescedIncr:
+    model: type[models.Model]
+    filters: dict[str, BufferField]
+    columns: dict[str, int] = dataclasses.field(default_factory=dict)
+    extra: dict[str, Any] = dataclasses.field(default_factory=dict)
+    signal_only: bool = False
+
+
 class RedisBuffer(Buffer):
+    """
+    Buffers increments in Redis hashes (one per model and filters) until
+    `process_pending` schedules them to be written to the database.
+
+    Two opt-in modes reduce the number of round trips under high volume:
+
+    - ``coalesce_window``: `incr` merges increments in process memory for up
+      to this many seconds (or ``coalesce_max_keys`` distinct keys), then
+      writes them with one pipeline per Redis host.
+    - ``batched_process``: `process` reads, deletes and locks all keys of a
+      batch with one pipeline per Redis host instead of three round trips per
+      key. Combine this with a large ``incr_batch_size`` so that
+      `process_pending` schedules thousands of keys per task.
+    """
+
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, incr_batch_size: int = 2, **options: object):
+    def __init__(
+        self,
+        incr_batch_size: int = 2,
+        coalesce_window: float = 0,
+        coalesce_max_keys: int = 1000,
+        batched_process: bool = False,
+        **options: object,
+    ):
         self.is_redis_cluster, self.cluster, options = get_dynamic_cluster_from_options(
             "SENTRY_BUFFER_OPTIONS", options
         )
         self.incr_batch_size = incr_batch_size
         assert self.incr_batch_size > 0
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_keys = coalesce_max_keys
+        self.batched_process = batched_process
+
+        self._coalesce_lock = threading.Lock()
+        self._coalesced: dict[str, CoalescedIncr] = {}
+        self._coalesce_timer: threading.Timer | None = None
+        if self.coalesce_window > 0:
+            # Increments still held in memory when the process exits would be
+            # lost, and a forked child must not write its parent's increments
+            # a second time.
+            atexit.register(self.flush_coalesced)
+            os.register_at_fork(after_in_child=self._reset_coalesced)
 
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
@@ -463,45 +512,144 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
             - Perform a set on signal_only (only if True)
         - Add hashmap key to pending flushes
+
+        With a ``coalesce_window`` the increment is merged into the ones held
+        in memory and written by `flush_coalesced`.
         """
         key = self._make_key(model, filters)
+        _validate_json_roundtrip(filters, model)
+        if extra:
+            # Group tries to serialize 'score', so we'd need some kind of processing
+            # hook here
+            # e.g. "update score if last_seen or times_seen is changed"
+            _validate_json_roundtrip(extra, model)
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+        if self.coalesce_window > 0:
+            self._coalesce_incr(key, model, columns, filters, extra, signal_only)
+            return
+
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
         pipe = self.get_redis_connection(key)
-        pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
-        _validate_json_roundtrip(filters, model)
+        self._add_incr_commands(
+            pipe, key, CoalescedIncr(model, filters, columns, extra or {}, signal_only is True)
+        )
+        pipe.zadd(self.pending_key, {key: time()})
+        pipe.execute()
+        metrics.incr("buffer.incr.writes", tags={"mode": "single"})
+
+    def _add_incr_commands(self, pipe: Pipeline, key: str, item: CoalescedIncr) -> None:
+        pipe.hsetnx(key, "m", f"{item.model.__module__}.{item.model.__name__}")
 
         if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-            pipe.hsetnx(key, "f", json.dumps(self._dump_values(filters)))
+            pipe.hsetnx(key, "f", json.dumps(self._dump_values(item.filters)))
         else:
-            pipe.hsetnx(key, "f", pickle.dumps(filters))
+            pipe.hsetnx(key, "f", pickle.dumps(item.filters))
 
-        for column, amount in columns.items():
+        for column, amount in item.columns.items():
             pipe.hincrby(key, "i+" + column, amount)
 
-        if extra:
-            # Group tries to serialize 'score', so we'd need some kind of processing
-            # hook here
-            # e.g. "update score if last_seen or times_seen is changed"
-            _validate_json_roundtrip(extra, model)
-            for column, value in extra.items():
-                if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-                    pipe.hset(key, "e+" + column, json.dumps(self._dump_value(value)))
-                else:
-                    pipe.hset(key, "e+" + column, pickle.dumps(value))
+        for column, value in item.extra.items():
+            if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                pipe.hset(key, "e+" + column, json.dumps(self._dump_value(value)))
+            else:
+                pipe.hset(key, "e+" + column, pickle.dumps(value))
 
-        if signal_only is True:
+        if item.signal_only:
             pipe.hset(key, "s", "1")
 
         pipe.expire(key, self.key_expire)
-        pipe.zadd(self.pending_key, {key: time()})
-        pipe.execute()
 
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
-        )
+    def _coalesce_incr(
+        self,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, BufferField],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+    ) -> None:
+        with self._coalesce_lock:
+            item = self._coalesced.get(key)
+            if item is None:
+                item = self._coalesced[key] = CoalescedIncr(model, filters)
+            for column, amount in columns.items():
+                item.columns[column] = item.columns.get(column, 0) + amount
+            if extra:
+                item.extra.update(extra)
+            if signal_only is True:
+                item.signal_only = True
+
+            flush_now = len(self._coalesced) >= self.coalesce_max_keys
+            if not flush_now and self._coalesce_timer is None:
+                self._coalesce_timer = threading.Timer(self.coalesce_window, self.flush_coalesced)
+                self._coalesce_timer.daemon = True
+                self._coalesce_timer.start()
+
+        metrics.incr("buffer.incr.coalesced")
+        if flush_now:
+            self.flush_coalesced()
+
+    def _reset_coalesced(self) -> None:
+        self._coalesce_lock = threading.Lock()
+        self._coalesced = {}
+        self._coalesce_timer = None
+
+    def flush_coalesced(self) -> None:
+        """
+        Write all increments held in memory, with one pipeline per Redis host.
+        """
+        with self._coalesce_lock:
+            items, self._coalesced = self._coalesced, {}
+            if self._coalesce_timer is not None:
+                self._coalesce_timer.cancel()
+                self._coalesce_timer = None
+
+        if not items:
+            return
+
+        with metrics.timer("buffer.incr.flush"):
+            now = time()
+            for pipe, keys in self._get_pipelines_by_host(items):
+                for key in keys:
+                    self._add_incr_commands(pipe, key, items[key])
+                pipe.zadd(self.pending_key, {key: now for key in keys})
+                pipe.execute()
+                metrics.distribution("buffer.incr.flush.keys", len(keys))
+
+        metrics.incr("buffer.incr.writes", amount=len(items), tags={"mode": "coalesced"})
+
+    def _get_pipelines_by_host(
+        self, keys: Iterable[str], transaction: bool = True
+    ) -> list[tuple[Pipeline, list[str]]]:
+        """
+        Groups keys by the Redis host they live on and returns a pipeline for
+        each group. The pending set of a host must be written through the
+        pipeline of that host.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            # The cluster pipeline routes every command to its node.
+            return [(self.cluster.pipeline(transaction=transaction), list(keys))]
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            router = self.cluster.get_router()
+            keys_by_host: dict[int, list[str]] = defaultdict(list)
+            for key in keys:
+                keys_by_host[router.get_host_for_key(key)].append(key)
+            return [
+                (
+                    self.cluster.get_local_client(host_id).pipeline(transaction=transaction),
+                    host_keys,
+                )
+                for host_id, host_keys in keys_by_host.items()
+            ]
+        else:
+            raise AssertionError("unreachable")
 
     def process_pending(self) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
@@ -609,8 +757,14 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
-            for key in batch_keys:
-                self._process_single_incr(key)
+            mode = "batched" if self.batched_process else "single"
+            with metrics.timer("buffer.process", tags={"mode": mode}):
+                if self.batched_process:
+                    self._process_incr_batch(batch_keys)
+                else:
+                    for key in batch_keys:
+                        self._process_single_incr(key)
+            metrics.incr("buffer.process.keys", amount=len(batch_keys), tags={"mode": mode})
 
     def _base_process(
         self,
@@ -636,40 +790,101 @@ class RedisBuffer(Buffer):
             pipe.zrem(self.pending_key, key)
             pipe.delete(key)
             values = pipe.execute()[0]
+            self._process_values(key, values)
+        finally:
+            client.delete(lock_key)
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
-                return
+    def _process_incr_batch(self, keys: list[str]) -> None:
+        """
+        Processes many keys with a constant number of round trips per Redis
+        host: one to lock all keys, one to read and delete them and one to
+        release the locks.
+        """
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys:
+                pipe.set(lock_key, "1", nx=True, ex=10)
+            acquired = pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.map() as conn:
+                promises = [conn.set(lock_key, "1", nx=True, ex=10) for lock_key in lock_keys]
+            acquired = [promise.value for promise in promises]
+        else:
+            raise AssertionError("unreachable")
 
-            model = import_string(force_str(values.pop("m")))
+        locked = [key for key, is_acquired in zip(keys, acquired) if is_acquired]
+        if len(locked) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(locked),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
 
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._base_process(model, incr_values, filters, extra_values, signal_only)
+        try:
+            values_by_key: dict[str, Any] = {}
+            for pipe, host_keys in self._get_pipelines_by_host(locked, transaction=False):
+                for key in host_keys:
+                    pipe.hgetall(key)
+                    pipe.zrem(self.pending_key, key)
+                    pipe.delete(key)
+                results = pipe.execute()
+                for index, key in enumerate(host_keys):
+                    values_by_key[key] = results[index * 3]
+
+            for key, values in values_by_key.items():
+                # The values have been deleted from Redis already, so keep
+                # going if one of them cannot be written.
+                try:
+                    self._process_values(key, values)
+                except Exception:
+                    logger.exception("buffer.process.error", extra={"redis_key": key})
         finally:
-            client.delete(lock_key)
+            unlock_keys = [self._make_lock_key(key) for key in locked]
+            if unlock_keys:
+                if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                    pipe = self.cluster.pipeline(transaction=False)
+                    for lock_key in unlock_keys:
+                        pipe.delete(lock_key)
+                    pipe.execute()
+                else:
+                    with self.cluster.map() as conn:
+                        for lock_key in unlock_keys:
+                            conn.delete(lock_key)
+
+    def _process_values(self, key: str, values: dict[Any, Any]) -> None:
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        self._base_process(model, incr_values, filters, extra_values, signal_only)
@@ -775,6 +775,7 @@ CELERY_IMPORTS = (
     "sentry.integrations.opsgenie.tasks",
     "sentry.sentry_apps.tasks",
     "sentry.snuba.tasks",
+    "sentry.tagstore.snuba.tasks",
     "sentry.replays.tasks",
     "sentry.monitors.tasks.clock_pulse",
     "sentry.monitors.tasks.detect_broken_monitor_envs",
@@ -1450,6 +1451,7 @@ TASKWORKER_IMPORTS: tuple[str, ...] = (
     "sentry.sentry_apps.tasks.sentry_apps",
     "sentry.sentry_apps.tasks.service_hooks",
     "sentry.snuba.tasks",
+    "sentry.tagstore.snuba.tasks",
     "sentry.tasks.assemble",
     "sentry.tasks.auth.auth",
     "sentry.tasks.auth.check_auth",
@@ -1919,6 +1921,8 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
+# Directory holding trained zstd dictionaries for nodestore compression
+SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR: str | None = None
 
 # Node storage backend used for ArtifactBundle indexing (aka FlatFileIndex aka BundleIndex)
 SENTRY_INDEXSTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -2338,6 +2342,9 @@ SENTRY_OPTIONS: dict[str, Any] = {}
 SENTRY_DEFAULT_OPTIONS: dict[str, Any] = {}
 # Raise an error in dev on failed lookups
 SENTRY_OPTIONS_COMPLAIN_ON_ERRORS = True
+# The Redis cluster option changes are published on, so that processes using
+# an options snapshot pick them up right away. See sentry/options/snapshot.py
+SENTRY_OPTIONS_SNAPSHOT_REDIS_CLUSTER: str | None = None
 
 # Delay (in ms) to induce on API responses
 #
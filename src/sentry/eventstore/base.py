@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from copy import deepcopy
 from datetime import datetime
 from typing import Literal, overload
@@ -129,6 +129,7 @@ class EventStorage(Service):
         "get_events",
         "get_events_snql",
         "get_unfetched_events",
+        "iter_events",
         "get_adjacent_event_ids",
         "get_adjacent_event_ids_snql",
         "bind_nodes",
@@ -225,6 +226,32 @@ class EventStorage(Service):
         """
         raise NotImplementedError
 
+    def iter_events(
+        self,
+        filter,
+        orderby=None,
+        limit=None,
+        batch_size=100,
+        referrer="eventstore.iter_events",
+        dataset=Dataset.Events,
+        tenant_ids=None,
+    ) -> Iterator[Event]:
+        """
+        Same as get_events, but queries events page by page and yields them as their node
+        data is loaded, instead of materializing all of them.
+
+        Used for iterating over large numbers of events with their data, e.g. all events of
+        a group.
+
+        Arguments:
+        snuba_filter (Filter): Filter
+        orderby (Sequence[str]): List of fields to order by - default ['-time', '-event_id']
+        limit (int): Maximum number of events - default None
+        batch_size (int): Number of events per page - default 100
+        referrer (string): Referrer - default "eventstore.iter_events"
+        """
+        raise NotImplementedError
+
     @overload
     def get_event_by_id(
         self,
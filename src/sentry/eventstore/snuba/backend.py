@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import atexit
+import contextvars
 import logging
 import random
-from collections.abc import Mapping, Sequence
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import copy, deepcopy
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal, overload
@@ -24,6 +28,7 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.eventstore.base import EventStorage
 from sentry.eventstore.models import Event, GroupEvent
 from sentry.models.group import Group
@@ -46,6 +51,10 @@ NODESTORE_LIMIT = 100
 
 logger = logging.getLogger(__name__)
 
+_hydration_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="eventstore-hydration")
+
+atexit.register(_hydration_pool.shutdown, False)
+
 
 def get_before_event_condition(event):
     return [
@@ -210,6 +219,71 @@ class SnubaEventStorage(EventStorage):
             tenant_ids=tenant_ids,
         )
 
+    def iter_events(
+        self,
+        filter,
+        orderby=None,
+        limit=None,
+        batch_size=DEFAULT_LIMIT,
+        referrer="eventstore.iter_events",
+        dataset=Dataset.Events,
+        tenant_ids=None,
+    ) -> Iterator[Event]:
+        """
+        Get events from Snuba page by page, with node data loaded. With
+        `eventstore.iter-events.pipelined`, node data of a page is fetched on a thread pool
+        while the next page is queried from Snuba. At most two pages are held at a time.
+        Otherwise each page is yielded as soon as its node data is loaded.
+        """
+        pipelined = options.get("eventstore.iter-events.pipelined")
+        pending: deque[tuple[list[Event], Future[None]]] = deque()
+        offset = 0
+        try:
+            while limit is None or offset < limit:
+                page_size = batch_size if limit is None else min(batch_size, limit - offset)
+                with sentry_sdk.start_span(op="eventstore.snuba.iter_events"):
+                    events = self.__get_events(
+                        filter,
+                        orderby=orderby,
+                        limit=page_size,
+                        offset=offset,
+                        referrer=referrer,
+                        should_bind_nodes=False,
+                        dataset=dataset,
+                        tenant_ids=tenant_ids,
+                    )
+                offset += len(events)
+
+                if not pipelined:
+                    self.bind_nodes(events)
+                    yield from events
+                    if len(events) < page_size:
+                        break
+                    continue
+
+                # The copied context keeps scopes like `use_local_cache` of the caller
+                context = contextvars.copy_context()
+                hydrated = _hydration_pool.submit(context.run, self.bind_nodes, events)
+                pending.append((events, hydrated))
+
+                # Hand out the previous page while this one is being hydrated
+                if len(pending) > 1:
+                    yield from self.__wait_for_page(pending.popleft())
+                if len(events) < page_size:
+                    break
+
+            while pending:
+                yield from self.__wait_for_page(pending.popleft())
+        finally:
+            # The consumer stopped early, there's no point in hydrating the rest
+            for _, future in pending:
+                future.cancel()
+
+    def __wait_for_page(self, page: tuple[list[Event], Future[None]]) -> list[Event]:
+        events, future = page
+        future.result()
+        return events
+
     def __get_events(
         self,
         filter,
@@ -6,7 +6,9 @@ __all__ = ["FeatureManager"]
 
 import abc
 from collections import defaultdict
-from collections.abc import Iterable, Sequence
+from collections.abc import Generator, Iterable, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any
 
 import sentry_sdk
@@ -19,7 +21,7 @@ from sentry.utils import metrics
 from sentry.utils.flag import record_feature_flag
 from sentry.utils.types import Dict
 
-from .base import Feature, FeatureHandlerStrategy
+from .base import Feature, FeatureHandlerStrategy, OrganizationFeature, ProjectFeature
 from .exceptions import FeatureNotRegistered
 
 if TYPE_CHECKING:
@@ -138,6 +140,45 @@ class RegisteredFeatureManager:
 
 FLAGPOLE_OPTION_PREFIX = "feature"
 
+# (feature name, entity type, entity id, actor, skip_entity)
+EvaluationKey = tuple[str, str, int, Any, bool]
+
+
+class FeatureEvaluationCache:
+    """
+    Results of feature checks within an evaluation scope, see
+    `FeatureManager.evaluation_scope`.
+    """
+
+    def __init__(self, manager: FeatureManager, name: str) -> None:
+        self.manager = manager
+        self.name = name
+        self.results: dict[EvaluationKey, bool] = {}
+        # (entity type, entity id, actor) of entities whose flags have been prefetched
+        self.prefetched: set[tuple[str, int, Any]] = set()
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+
+    def record_metrics(self) -> None:
+        tags = {"scope": self.name}
+        metrics.incr("features.evaluation_cache.hit", amount=self.hits, tags=tags)
+        metrics.incr("features.evaluation_cache.miss", amount=self.misses, tags=tags)
+        metrics.incr("features.evaluation_cache.prefetch", amount=self.prefetches, tags=tags)
+
+
+_evaluation_cache: ContextVar[FeatureEvaluationCache | None] = ContextVar(
+    "feature_evaluation_cache", default=None
+)
+
+
+def _get_actor_key(actor: User | RpcUser | AnonymousUser | None) -> Any:
+    if actor is None:
+        return None
+    actor_id = getattr(actor, "id", None)
+    # Anonymous users have no ID
+    return ("user", actor_id) if actor_id is not None else ("anonymous",)
+
 
 # TODO: Change RegisteredFeatureManager back to object once it can be removed
 class FeatureManager(RegisteredFeatureManager):
@@ -240,6 +281,95 @@ class FeatureManager(RegisteredFeatureManager):
         """
         self._entity_handler = handler
 
+    @contextmanager
+    def evaluation_scope(self, name: str) -> Generator[None]:
+        """
+        Memoize the results of ``has`` for the duration of the block, typically
+        a request or a task. `name` is used to tag metrics.
+
+        Organization and project features are cached per feature, entity and
+        actor. The first time a feature of an entity is checked, all features
+        of its type which are only decided by the entity handler are
+        prefetched with ``batch_has``. Changes to flags are not visible until
+        the next scope. Nested scopes share the outermost scope's cache.
+
+        >>> with features.evaluation_scope("post_process"):
+        ...     features.has('organizations:feature', organization)
+        """
+        if _evaluation_cache.get() is not None or not options.get(
+            "features.evaluation-cache.enabled"
+        ):
+            yield
+            return
+
+        cache = FeatureEvaluationCache(self, name)
+        token = _evaluation_cache.set(cache)
+        try:
+            yield
+        finally:
+            _evaluation_cache.reset(token)
+            cache.record_metrics()
+
+    def _get_evaluation_key(
+        self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any], skip_entity: bool | None
+    ) -> EvaluationKey | None:
+        """
+        The key a feature check is cached under, or `None` if it can't be cached.
+        """
+        if len(args) != 1 or set(kwargs) - {"actor"}:
+            return None
+        entity_id = getattr(args[0], "id", None)
+        if entity_id is None:
+            return None
+
+        cls = self._feature_registry.get(name)
+        if cls is None:
+            return None
+        elif issubclass(cls, OrganizationFeature):
+            entity_type = "organization"
+        elif issubclass(cls, ProjectFeature):
+            entity_type = "project"
+        else:
+            return None
+
+        actor_key = _get_actor_key(kwargs.get("actor"))
+        return (name, entity_type, entity_id, actor_key, bool(skip_entity))
+
+    def _prefetch(
+        self,
+        cache: FeatureEvaluationCache,
+        key: EvaluationKey,
+        entity: Any,
+        actor: User | RpcUser | AnonymousUser | None,
+    ) -> None:
+        """
+        Evaluate all features of the entity which are decided by the entity handler with a single
+        ``batch_has`` call, and store the results in the cache.
+        """
+        _, entity_type, entity_id, actor_key, skip_entity = key
+        if skip_entity or self._entity_handler is None:
+            return
+        if (entity_type, entity_id, actor_key) in cache.prefetched:
+            return
+        cache.prefetched.add((entity_type, entity_id, actor_key))
+
+        # Registered handlers take precedence over the entity handler, so
+        # features which have them are evaluated one by one.
+        feature_type = OrganizationFeature if entity_type == "organization" else ProjectFeature
+        names = [name for name in self.all(feature_type) if not self._handler_registry.get(name)]
+        if not names:
+            return
+
+        if entity_type == "organization":
+            results = self.batch_has(names, actor=actor, organization=entity)
+        else:
+            results = self.batch_has(names, actor=actor, projects=[entity])
+
+        for name, rv in ((results or {}).get(f"{entity_type}:{entity_id}") or {}).items():
+            if rv is not None:
+                cache.results[(name, entity_type, entity_id, actor_key, False)] = rv
+                cache.prefetches += 1
+
     def has(self, name: str, *args: Any, skip_entity: bool | None = False, **kwargs: Any) -> bool:
         """
         Determine if a feature is enabled. If a handler returns None, then the next
@@ -270,7 +400,32 @@ class FeatureManager(RegisteredFeatureManager):
 
         >>> FeatureManager.has('organizations:feature', organization, actor=request.user)
 
+        Within an `evaluation_scope`, results are memoized.
         """
+        cache = _evaluation_cache.get()
+        if cache is None or cache.manager is not self:
+            return self._evaluate(name, *args, skip_entity=skip_entity, **kwargs)
+
+        key = self._get_evaluation_key(name, args, kwargs, skip_entity)
+        if key is None:
+            return self._evaluate(name, *args, skip_entity=skip_entity, **kwargs)
+
+        if key not in cache.results:
+            self._prefetch(cache, key, args[0], kwargs.get("actor"))
+
+        rv = cache.results.get(key)
+        if rv is not None:
+            cache.hits += 1
+            record_feature_flag(name, rv)
+            return rv
+
+        cache.misses += 1
+        rv = cache.results[key] = self._evaluate(name, *args, skip_entity=skip_entity, **kwargs)
+        return rv
+
+    def _evaluate(
+        self, name: str, *args: Any, skip_entity: bool | None = False, **kwargs: Any
+    ) -> bool:
         sample_rate = 0.01
         try:
             with metrics.timer("features.has", tags={"feature": name}, sample_rate=sample_rate):
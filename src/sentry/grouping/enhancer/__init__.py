@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import logging
 import os
+import threading
 import zlib
 from collections import Counter
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from functools import cached_property
 from random import random
 from typing import Any, Literal
@@ -13,6 +15,7 @@ from typing import Any, Literal
 import msgpack
 import sentry_sdk
 import zstandard
+from cachetools import LRUCache
 from sentry_ophio.enhancers import AssembleResult as RustStacktraceResult
 from sentry_ophio.enhancers import Cache as RustCache
 from sentry_ophio.enhancers import Component as RustFrame
@@ -36,6 +39,15 @@ logger = logging.getLogger(__name__)
 # So this leaves quite a bit of headroom for custom enhancement rules as well.
 RUST_CACHE = RustCache(1_000)
 
+# Parsed enhancements are never modified, so every event using the same grouping config (which
+# usually means every event of the same project) can share one instance, instead of parsing the
+# config and merging the Rust enhancements with the bases again.
+ENHANCEMENTS_CACHE_SIZE = 1_000
+_enhancements_cache: LRUCache[tuple[Any, ...], Enhancements] = LRUCache(
+    maxsize=ENHANCEMENTS_CACHE_SIZE
+)
+_enhancements_cache_lock = threading.Lock()
+
 # TODO: Move 3 to the end when we're ready for it to be the default
 VERSIONS = [
     3,  # Enhancements with this version run the split enhancements experiment
@@ -115,6 +127,29 @@ EMPTY_RUST_ENHANCEMENTS = get_rust_enhancements("config_string", "")
 RustExceptionData = dict[str, bytes | None]
 
 
+def _get_cached_enhancements(
+    key: tuple[Any, ...], source: str, build: Callable[[], Enhancements]
+) -> Enhancements:
+    with _enhancements_cache_lock:
+        enhancements = _enhancements_cache.get(key)
+    if enhancements is not None:
+        metrics.incr("grouping.enhancements.cache", tags={"result": "hit", "source": source})
+        return enhancements
+
+    metrics.incr("grouping.enhancements.cache", tags={"result": "miss", "source": source})
+    enhancements = build()
+    with _enhancements_cache_lock:
+        _enhancements_cache[key] = enhancements
+        size = len(_enhancements_cache)
+    metrics.gauge("grouping.enhancements.cache_size", size)
+    return enhancements
+
+
+def clear_enhancements_cache() -> None:
+    with _enhancements_cache_lock:
+        _enhancements_cache.clear()
+
+
 def make_rust_exception_data(
     exception_data: dict[str, Any] | None,
 ) -> RustExceptionData:
@@ -733,14 +768,24 @@ class Enhancements:
 
     @classmethod
     def from_base64_string(cls, base64_string: str | bytes) -> Enhancements:
-        """Convert a base64 string into an `Enhancements` object"""
+        """
+        Convert a base64 string into an `Enhancements` object. The result is cached per process,
+        so callers must not modify it.
+        """
+        bytes_str = (
+            base64_string.encode("ascii", "ignore")
+            if isinstance(base64_string, str)
+            else base64_string
+        )
+        return _get_cached_enhancements(
+            ("base64_string", hashlib.sha1(bytes_str).digest()),
+            "base64_string",
+            lambda: cls._from_base64_bytes(bytes_str),
+        )
 
+    @classmethod
+    def _from_base64_bytes(cls, bytes_str: bytes) -> Enhancements:
         with metrics.timer("grouping.enhancements.creation") as metrics_timer_tags:
-            bytes_str = (
-                base64_string.encode("ascii", "ignore")
-                if isinstance(base64_string, str)
-                else base64_string
-            )
             padded_bytes = bytes_str + b"=" * (4 - (len(bytes_str) % 4))
             try:
                 compressed_pickle = base64.urlsafe_b64decode(padded_bytes)
@@ -772,20 +817,36 @@ class Enhancements:
         id: str | None = None,
         version: int | None = None,
     ) -> Enhancements:
-        """Create an `Enhancements` object from a text blob containing stacktrace rules"""
+        """
+        Create an `Enhancements` object from a text blob containing stacktrace rules. The result
+        is cached per process, so callers must not modify it.
+        """
 
-        with metrics.timer("grouping.enhancements.creation") as metrics_timer_tags:
-            metrics_timer_tags.update({"split": version == 3, "source": "rules_text"})
-
-            rust_enhancements = get_rust_enhancements("config_string", rules_text)
-            rules = parse_enhancements(rules_text)
-            return Enhancements(
-                rules,
-                rust_enhancements=rust_enhancements,
-                version=version,
-                bases=bases,
-                id=id,
-            )
+        def build() -> Enhancements:
+            with metrics.timer("grouping.enhancements.creation") as metrics_timer_tags:
+                metrics_timer_tags.update({"split": version == 3, "source": "rules_text"})
+
+                rust_enhancements = get_rust_enhancements("config_string", rules_text)
+                rules = parse_enhancements(rules_text)
+                return Enhancements(
+                    rules,
+                    rust_enhancements=rust_enhancements,
+                    version=version,
+                    bases=bases,
+                    id=id,
+                )
+
+        return _get_cached_enhancements(
+            (
+                "rules_text",
+                hashlib.sha1(rules_text.encode("utf-8")).digest(),
+                tuple(bases or ()),
+                id,
+                version,
+            ),
+            "rules_text",
+            build,
+        )
 
 
 def _load_configs() -> dict[str, Enhancements]:
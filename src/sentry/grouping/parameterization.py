@@ -24,6 +24,9 @@ class ParameterizationRegex:
     raw_pattern: str  # regex pattern w/o matching group name
     lookbehind: str | None = None  # positive lookbehind prefix if needed
     lookahead: str | None = None  # positive lookahead postfix if needed
+    # Regex which has to match somewhere in the content for the pattern to possibly match it. Used
+    # to leave the pattern out of the combined regex for content it can't match.
+    prefilter: str | None = None
     counter: int = 0
 
     # These need to be used with `(?x)`, to tell the regex compiler to ignore comments
@@ -52,8 +55,13 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
     ParameterizationRegex(
         name="email",
         raw_pattern=r"""[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*""",
+        prefilter="@",
+    ),
+    ParameterizationRegex(
+        name="url",
+        raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*""",
+        prefilter="://",
     ),
-    ParameterizationRegex(name="url", raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*"""),
     ParameterizationRegex(
         name="hostname",
         raw_pattern=r"""
@@ -66,6 +74,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             )
             \b
         """,
+        prefilter=r"\.",
     ),
     ParameterizationRegex(
         name="ip",
@@ -93,13 +102,19 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
                 (25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\b
             )
         """,
+        prefilter="[.:]",
     ),
     ParameterizationRegex(
         name="uuid",
         raw_pattern=r"""\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b""",
+        prefilter="[0-9a-fA-F]{8}-",
+    ),
+    ParameterizationRegex(
+        name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b""", prefilter="[0-9a-fA-F]{40}"
+    ),
+    ParameterizationRegex(
+        name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b""", prefilter="[0-9a-fA-F]{32}"
     ),
-    ParameterizationRegex(name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b"""),
-    ParameterizationRegex(name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b"""),
     ParameterizationRegex(
         name="date",
         raw_pattern=r"""
@@ -152,11 +167,17 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             ) |
             (datetime.datetime\(.*?\))
         """,
+        # All formats but the last one contain digits
+        prefilter=r"\d|datetime.datetime\(",
     ),
-    ParameterizationRegex(name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b"""),
-    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b"""),
-    ParameterizationRegex(name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b"""),
-    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b"""),
+    ParameterizationRegex(
+        name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b""", prefilter=r"\d"
+    ),
+    ParameterizationRegex(name="hex", raw_pattern=r"""\b0[xX][0-9a-fA-F]+\b""", prefilter="0[xX]"),
+    ParameterizationRegex(
+        name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b""", prefilter=r"\d\.\d"
+    ),
+    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b""", prefilter=r"\d"),
     ParameterizationRegex(
         name="quoted_str",
         raw_pattern=r"""# Using `=`lookbehind which guarantees we'll only match the value half of key-value pairs,
@@ -164,6 +185,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             '([^']+)' | "([^"]+)"
         """,
         lookbehind="=",
+        prefilter="=['\"]",
     ),
     ParameterizationRegex(
         name="bool",
@@ -175,12 +197,18 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             false
         """,
         lookbehind="=",
+        prefilter="=[TtFf]",
     ),
 ]
 
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
 
+_PREFILTERS = {
+    r.name: re.compile(r.prefilter) if r.prefilter else None
+    for r in DEFAULT_PARAMETERIZATION_REGEXES
+}
+
 
 @dataclasses.dataclass
 class ParameterizationCallable:
@@ -223,8 +251,9 @@ class _UniqueId:
         return tiktoken.get_encoding("cl100k_base")
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def num_tokens_from_string(token_str: str) -> int:
-        """Returns the number of tokens in a text string."""
+        """Returns the number of tokens in a text string (cached, as ids tend to repeat)."""
         num_tokens = len(_UniqueId.tiktoken_encoding().encode(token_str))
         return num_tokens
 
@@ -281,13 +310,16 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
-        self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._regex_pattern_keys = tuple(regex_pattern_keys)
+        # Fail early on unknown pattern keys
+        self._parameterization_regex = self._make_regex_from_patterns(self._regex_pattern_keys)
         self._experiments = experiments
 
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
 
     @staticmethod
-    def _make_regex_from_patterns(pattern_keys: Sequence[str]) -> re.Pattern[str]:
+    @lru_cache(maxsize=64)
+    def _make_regex_from_patterns(pattern_keys: tuple[str, ...]) -> re.Pattern[str]:
         """
         Takes list of pattern keys and returns a compiled regex pattern that matches any of them.
 
@@ -314,17 +346,28 @@ class Parameterizer:
         @returns: The content with all matches replaced with placeholders.
         """
 
-        def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
+        # Leave out the patterns which can't match anywhere in the content. They would never be the
+        # matching alternative, so the result is the same as with the full regex.
+        pattern_keys = tuple(
+            key
+            for key in self._regex_pattern_keys
+            if (prefilter := _PREFILTERS[key]) is None or prefilter.search(content)
+        )
+        if not pattern_keys:
+            return content
 
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        def _handle_regex_match(match: re.Match[str]) -> str:
+            # Every pattern is wrapped in a named group which encloses any other group in it, so the
+            # last matched group is the pattern which matched. For example, given a match of the
+            # `hex` group on '0x40000015', this returns '<hex>' as a replacement for the original
+            # value in the string.
+            key = match.lastgroup
+            if key is None:
+                return ""
+            self.matches_counter[key] += 1
+            return f"<{key}>"
+
+        return self._make_regex_from_patterns(pattern_keys).sub(_handle_regex_match, content)
 
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
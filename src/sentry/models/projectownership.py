@@ -18,6 +18,7 @@ from sentry.models.activity import Activity
 from sentry.models.group import Group
 from sentry.models.groupowner import OwnerRuleType
 from sentry.ownership.grammar import Matcher, Rule, load_schema, resolve_actors
+from sentry.ownership.index import get_rule_index
 from sentry.types.activity import ActivityType
 from sentry.types.actor import Actor
 from sentry.utils import metrics
@@ -377,6 +378,15 @@ class ProjectOwnership(Model):
             tags={"ownership_type": ownership_type},
         )
 
+        if options.get("ownership.rule-index.enabled"):
+            index = get_rule_index(ownership.schema)
+            metrics.distribution(
+                key="projectownership.matching_ownership_rules.rules",
+                value=len(index),
+                tags={"ownership_type": ownership_type},
+            )
+            return index.get_matching_rules(data, munged_data)
+
         rules = load_schema(ownership.schema)
         metrics.distribution(
             key="projectownership.matching_ownership_rules.rules",
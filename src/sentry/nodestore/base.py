@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import struct
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from threading import local
@@ -10,6 +11,8 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore import compression
+from sentry.nodestore.local_cache import get_caller, local_cache
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +31,69 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Blobs written in the envelope format start with this magic, followed by a
+# version byte. Legacy blobs are either JSON (starting with `{`) or pickle,
+# neither of which can start with a null byte.
+ENVELOPE_MAGIC = b"\x00nse"
+ENVELOPE_VERSION = 1
+
+# magic, version, number of entries
+_envelope_header = struct.Struct("!4sBH")
+# subkey length, followed by the subkey itself and `_envelope_range`
+_envelope_subkey_len = struct.Struct("!B")
+# offset and length of the payload, relative to the end of the header
+_envelope_range = struct.Struct("!II")
+
+
+def _encode_envelope(payloads: list[tuple[bytes, bytes]]) -> bytes:
+    """
+    Encode a list of ``(subkey, payload)`` pairs into the envelope format.
+    The default subkey is represented by an empty bytestring.
+
+    The header contains an offset table so that a single subkey can be sliced
+    out of the blob without looking at any of the other payloads.
+    """
+    header = [_envelope_header.pack(ENVELOPE_MAGIC, ENVELOPE_VERSION, len(payloads))]
+    offset = 0
+    for subkey, payload in payloads:
+        header.append(_envelope_subkey_len.pack(len(subkey)))
+        header.append(subkey)
+        header.append(_envelope_range.pack(offset, len(payload)))
+        offset += len(payload)
+
+    return b"".join(header + [payload for _, payload in payloads])
+
+
+def _decode_envelope(value: bytes, subkey: bytes) -> bytes | None:
+    """
+    Return the raw payload stored for `subkey` in an envelope-encoded blob, or
+    `None` if the subkey is not present.
+    """
+    _, version, count = _envelope_header.unpack_from(value)
+    if version != ENVELOPE_VERSION:
+        raise ValueError(f"Unsupported nodestore envelope version: {version}")
+
+    pos = _envelope_header.size
+    found: tuple[int, int] | None = None
+    for _ in range(count):
+        (subkey_len,) = _envelope_subkey_len.unpack_from(value, pos)
+        pos += _envelope_subkey_len.size
+        entry_subkey = value[pos : pos + subkey_len]
+        pos += subkey_len
+        if found is None and entry_subkey == subkey:
+            found = _envelope_range.unpack_from(value, pos)
+        pos += _envelope_range.size
+
+    if found is None:
+        return None
+
+    offset, length = found
+    return value[pos + offset : pos + offset + length]
+
+
+def is_envelope(value: bytes) -> bool:
+    return value.startswith(ENVELOPE_MAGIC)
+
 
 class NodeStorage(local, Service):
     """
@@ -100,6 +166,12 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if is_envelope(value):
+            payload = _decode_envelope(value, subkey.encode("ascii") if subkey else b"")
+            if payload is None:
+                return None
+            return json_loads(payload)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -125,7 +197,12 @@ class NodeStorage(local, Service):
         >>> nodestore._get_bytes('key1')
         b'{"message": "hello world"}'
         """
-        return self._get_bytes(id)
+        return self._decompress(self._get_bytes(id))
+
+    def _decompress(self, value: bytes | None) -> bytes | None:
+        if value is None:
+            return None
+        return compression.decode(value)
 
     def _get_bytes(self, id: str) -> bytes | None:
         raise NotImplementedError
@@ -147,11 +224,12 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
+            bytes_data = self._decompress(self._get_bytes(id))
             rv = self._decode(bytes_data, subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
+                self._set_local_cache_items({id: bytes_data})
 
             span.set_tag("result", "from_service")
             if bytes_data:
@@ -194,12 +272,14 @@ class NodeStorage(local, Service):
                 uncached_ids = id_list
 
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
-                items = {
-                    id: self._decode(value, subkey=subkey)
+                blobs = {
+                    id: self._decompress(value)
                     for id, value in self._get_bytes_multi(uncached_ids).items()
                 }
+                items = {id: self._decode(value, subkey=subkey) for id, value in blobs.items()}
             if subkey is None:
                 self._set_cache_items(items)
+                self._set_local_cache_items(blobs)
                 items.update(cache_items)
 
             span.set_tag("result", "from_service")
@@ -215,7 +295,18 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        If `nodestore.write-envelope` is enabled, the data is written in the
+        envelope format instead, which carries an offset table for the
+        subkeys (see `_encode_envelope`).
         """
+        if options.get("nodestore.write-envelope"):
+            payloads = [(b"", json_dumps(data.pop(None)).encode("utf8"))]
+            for key, value in data.items():
+                if key is not None:
+                    payloads.append((key.encode("ascii"), json_dumps(value).encode("utf8")))
+            return _encode_envelope(payloads)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -224,11 +315,34 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
-    def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
+    def set_bytes(
+        self,
+        item_id: str,
+        data: bytes,
+        ttl: timedelta | None = None,
+        platform: str | None = None,
+    ) -> None:
         """
+        Write raw bytes for `item_id`. If `nodestore.compression` names a codec,
+        the bytes are compressed with it first, using the zstd dictionary
+        configured for `platform` in `nodestore.compression.zstd-dictionaries`.
+
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
         metrics.distribution("nodestore.set_bytes", len(data))
+        codec = options.get("nodestore.compression")
+        if codec:
+            dictionary_id = 0
+            if codec == "zstd" and platform is not None:
+                dictionary_id = options.get("nodestore.compression.zstd-dictionaries").get(
+                    platform, 0
+                )
+            data = compression.encode(data, codec, dictionary_id)
+            metrics.distribution(
+                "nodestore.set_bytes.compressed",
+                len(data),
+                tags={"codec": codec, "dictionary": bool(dictionary_id)},
+            )
         return self._set_bytes(item_id, data, ttl)
 
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
@@ -261,8 +375,10 @@ class NodeStorage(local, Service):
         {'foo': 'bam'}
         """
         cache_item = data.get(None)
+        platform = cache_item.get("platform") if cache_item else None
         bytes_data = self._encode(data)
-        self.set_bytes(item_id, bytes_data, ttl=ttl)
+        self.set_bytes(item_id, bytes_data, ttl=ttl, platform=platform)
+        local_cache.delete_many([item_id])
         # set cache only after encoding and write to nodestore has succeeded
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
@@ -274,15 +390,36 @@ class NodeStorage(local, Service):
         raise NotImplementedError
 
     def _get_cache_item(self, item_id: str) -> Any | None:
+        if get_caller() is not None:
+            return self._get_cache_items([item_id]).get(item_id)
         if self.cache:
             return self.cache.get(item_id)
         return None
 
     @sentry_sdk.tracing.trace
     def _get_cache_items(self, id_list: list[str]) -> dict[str, Any]:
-        if self.cache:
-            return self.cache.get_many(id_list)
-        return {}
+        caller = get_caller()
+        if caller is None:
+            if self.cache:
+                return self.cache.get_many(id_list)
+            return {}
+
+        items = {
+            id: self._decode(value, subkey=None)
+            for id, value in local_cache.get_many(id_list, caller).items()
+        }
+        uncached_ids = [id for id in id_list if id not in items]
+        if self.cache and uncached_ids:
+            cache_items = self.cache.get_many(uncached_ids)
+            self._set_local_cache_items(
+                {id: json_dumps(value).encode("utf8") for id, value in cache_items.items()}
+            )
+            items.update(cache_items)
+        return items
+
+    def _set_local_cache_items(self, items: Mapping[str, bytes | None]) -> None:
+        if get_caller() is not None:
+            local_cache.set_many({id: value for id, value in items.items() if value})
 
     def _set_cache_item(self, item_id: str, data: Any) -> None:
         if self.cache and data:
@@ -294,10 +431,12 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        local_cache.delete_many([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        local_cache.delete_many(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
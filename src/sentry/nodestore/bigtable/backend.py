@@ -7,6 +7,7 @@ from typing import Any
 import sentry_sdk
 
 from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.compression import is_encoded
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
 
@@ -21,7 +22,8 @@ class BigtableNodeStorage(NodeStorage):
     :param default_ttl: How many days keys should be stored (and considered
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
-        string "zstd" to use zstd.
+        string "zstd" to use zstd. Blobs already compressed by a
+        ``nodestore.compression`` codec are stored as-is.
 
     >>> from datetime import timedelta
     >>> BigtableNodeStorage(
@@ -74,7 +76,8 @@ class BigtableNodeStorage(NodeStorage):
         return rv
 
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
-        self.store.set(id, data, ttl)
+        # Blobs written through a nodestore codec are already compressed
+        self.store.set(id, data, ttl, compress=not is_encoded(data))
 
     def delete(self, id: str) -> None:
         if self.skip_deletes:
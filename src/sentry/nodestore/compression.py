@@ -0,0 +1,121 @@
+"""
+Codec layer applied by `NodeStorage.set_bytes`/`get_bytes` on top of whatever
+the backend does with the bytes it is handed.
+
+Blobs written through a codec start with a small header which records the
+codec and the zstd dictionary (if any) the blob was written with, so that
+readers never have to guess. Blobs without the header are returned as-is,
+which keeps everything written before this layer existed readable.
+
+Dictionaries are trained with `sentry nodestore train-dictionary` and stored
+as ``<dictionary_id>.zdict`` files in
+``settings.SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR``.
+"""
+
+from __future__ import annotations
+
+import enum
+import functools
+import os
+import struct
+import zlib
+from collections.abc import Sequence
+
+import zstandard
+from django.conf import settings
+
+CODEC_MAGIC = b"\x00nsc"
+
+# magic, codec, dictionary id (0 means no dictionary)
+_codec_header = struct.Struct("!4sBI")
+
+ZSTD_LEVEL = 3
+
+
+class NodeCodec(enum.IntEnum):
+    ZLIB = 1
+    ZSTD = 2
+
+
+CODECS_BY_NAME = {
+    "zlib": NodeCodec.ZLIB,
+    "zstd": NodeCodec.ZSTD,
+}
+
+
+class UnknownDictionary(Exception):
+    pass
+
+
+def dictionary_path(dictionary_id: int) -> str:
+    directory = settings.SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR
+    if not directory:
+        raise UnknownDictionary("SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR is not configured")
+    return os.path.join(directory, f"{dictionary_id}.zdict")
+
+
+@functools.lru_cache(maxsize=64)
+def get_dictionary(dictionary_id: int) -> zstandard.ZstdCompressionDict:
+    try:
+        with open(dictionary_path(dictionary_id), "rb") as f:
+            return zstandard.ZstdCompressionDict(f.read())
+    except FileNotFoundError:
+        raise UnknownDictionary(f"Unknown nodestore compression dictionary: {dictionary_id}")
+
+
+def train_dictionary(samples: Sequence[bytes], size: int) -> zstandard.ZstdCompressionDict:
+    return zstandard.train_dictionary(size, list(samples), level=ZSTD_LEVEL)
+
+
+def write_dictionary(dictionary: zstandard.ZstdCompressionDict) -> int:
+    """
+    Persist a trained dictionary and return the id blobs should reference it by.
+    """
+    dictionary_id = dictionary.dict_id()
+    with open(dictionary_path(dictionary_id), "wb") as f:
+        f.write(dictionary.as_bytes())
+    return dictionary_id
+
+
+def is_encoded(value: bytes) -> bool:
+    return value.startswith(CODEC_MAGIC)
+
+
+def encode(value: bytes, codec: str, dictionary_id: int = 0) -> bytes:
+    """
+    Compress `value` with the codec named `codec` and prefix it with the
+    codec header. `dictionary_id` is only meaningful for zstd.
+    """
+    node_codec = CODECS_BY_NAME[codec]
+    if node_codec == NodeCodec.ZLIB:
+        dictionary_id = 0
+        payload = zlib.compress(value)
+    elif dictionary_id:
+        payload = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL, dict_data=get_dictionary(dictionary_id)
+        ).compress(value)
+    else:
+        payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(value)
+
+    return _codec_header.pack(CODEC_MAGIC, node_codec, dictionary_id) + payload
+
+
+def decode(value: bytes) -> bytes:
+    """
+    Reverse `encode`. Values without a codec header are returned unchanged.
+    """
+    if not is_encoded(value):
+        return value
+
+    _, codec, dictionary_id = _codec_header.unpack_from(value)
+    payload = value[_codec_header.size :]
+    if codec == NodeCodec.ZLIB:
+        return zlib.decompress(payload)
+    elif codec == NodeCodec.ZSTD:
+        if dictionary_id:
+            decompressor = zstandard.ZstdDecompressor(dict_data=get_dictionary(dictionary_id))
+        else:
+            decompressor = zstandard.ZstdDecompressor()
+        return decompressor.decompress(payload)
+
+    raise ValueError(f"Unknown nodestore codec: {codec}")
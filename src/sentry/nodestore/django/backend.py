@@ -1,22 +1,42 @@
 from __future__ import annotations
 
+import base64
 import logging
 import math
 import pickle
+import zlib
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
-from sentry.nodestore.base import NodeStorage
-from sentry.utils.strings import compress, decompress
+from sentry.nodestore.base import NodeStorage, is_envelope
+from sentry.nodestore.compression import is_encoded
+from sentry.nodestore.local_cache import local_cache
+from sentry.utils.strings import compress
 
 from .models import Node
 
 logger = logging.getLogger("sentry")
 
 
+def _encode_data(value: bytes) -> str:
+    # Blobs written through a nodestore codec are already compressed, so they're only
+    # base64-encoded to fit the text column
+    if is_encoded(value):
+        return base64.b64encode(value).decode("utf-8")
+    return compress(value)
+
+
+def _decode_data(data: str) -> bytes:
+    value = base64.b64decode(data)
+    # zlib streams never start with the codec header
+    if is_encoded(value):
+        return value
+    return zlib.decompress(value)
+
+
 class DjangoNodeStorage(NodeStorage):
     def delete(self, id: str) -> None:
         Node.objects.filter(id=id).delete()
@@ -27,7 +47,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or is_envelope(value):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -41,19 +61,21 @@ class DjangoNodeStorage(NodeStorage):
     def _get_bytes(self, id: str) -> bytes | None:
         try:
             data = Node.objects.get(id=id).data
-            return decompress(data)
+            return _decode_data(data)
         except Node.DoesNotExist:
             return None
 
     def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return {n.id: _decode_data(n.data) for n in Node.objects.filter(id__in=id_list)}
 
     def delete_multi(self, id_list: list[str]) -> None:
         Node.objects.filter(id__in=id_list).delete()
         self._delete_cache_items(id_list)
 
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
-        create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
+        create_or_update(
+            Node, id=id, values={"data": _encode_data(data), "timestamp": timezone.now()}
+        )
 
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
@@ -62,6 +84,7 @@ class DjangoNodeStorage(NodeStorage):
         days = math.floor(total_seconds / 86400)
 
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
+        local_cache.clear()
         if self.cache:
             self.cache.clear()
 
@@ -0,0 +1,133 @@
+"""
+Bounded in-process LRU tier in front of the nodestore cache.
+
+Code paths that read the same nodes repeatedly within one worker process
+(post-processing, delayed rule processing) can opt in with
+`use_local_cache`. Reads within such a scope are served from process memory
+before falling back to the `nodedata` cache and the backend:
+
+>>> with use_local_cache("post_process"):
+...     nodestore.backend.get_multi(node_ids)
+
+Entries hold the raw bytes of the default subkey rather than decoded objects,
+so callers never share (and mutate) the same dict, and the size of the tier
+is accounted in bytes. The tier is bounded by
+`nodestore.local-cache.max-bytes` (0 disables it) and entries expire after
+`nodestore.local-cache.ttl` seconds. Writes and deletes through
+`NodeStorage` invalidate entries of the current process.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sentry import options
+from sentry.utils import metrics
+
+_caller: ContextVar[str | None] = ContextVar("nodestore_local_cache_caller", default=None)
+
+
+@contextmanager
+def use_local_cache(caller: str) -> Generator[None]:
+    """
+    Serve nodestore reads from the in-process cache for the duration of the
+    block. `caller` is used to tag hit/miss metrics.
+    """
+    token = _caller.set(caller)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def get_caller() -> str | None:
+    """
+    The caller of the innermost `use_local_cache` scope, or `None` if the
+    local cache is not in use.
+    """
+    if options.get("nodestore.local-cache.max-bytes") <= 0:
+        return None
+    return _caller.get()
+
+
+class LocalNodeCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # id -> (value, expires_at)
+        self._items: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_many(self, id_list: Iterable[str], caller: str) -> dict[str, bytes]:
+        rv = {}
+        misses = 0
+        now = time.monotonic()
+        with self._lock:
+            for id in id_list:
+                item = self._items.get(id)
+                if item is None:
+                    misses += 1
+                elif item[1] < now:
+                    self._remove(id)
+                    misses += 1
+                else:
+                    self._items.move_to_end(id)
+                    rv[id] = item[0]
+
+        if rv:
+            metrics.incr(
+                "nodestore.local_cache", amount=len(rv), tags={"caller": caller, "result": "hit"}
+            )
+        if misses:
+            metrics.incr(
+                "nodestore.local_cache", amount=misses, tags={"caller": caller, "result": "miss"}
+            )
+        return rv
+
+    def set_many(self, items: dict[str, bytes]) -> None:
+        max_bytes = options.get("nodestore.local-cache.max-bytes")
+        expires_at = time.monotonic() + options.get("nodestore.local-cache.ttl")
+        evicted = 0
+        with self._lock:
+            for id, value in items.items():
+                if len(value) > max_bytes:
+                    continue
+                self._remove(id)
+                self._items[id] = (value, expires_at)
+                self._size += len(value)
+
+            while self._size > max_bytes:
+                self._remove(next(iter(self._items)))
+                evicted += 1
+
+        if evicted:
+            metrics.incr("nodestore.local_cache.evicted", amount=evicted)
+
+    def delete_many(self, id_list: Iterable[str]) -> None:
+        with self._lock:
+            for id in id_list:
+                self._remove(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _remove(self, id: str) -> None:
+        item = self._items.pop(id, None)
+        if item is not None:
+            self._size -= len(item[0])
+
+
+local_cache = LocalNodeCache()
@@ -44,6 +44,8 @@ __all__ = (
     "can_update",
     "default_store",
     "delete",
+    "disable_snapshot",
+    "enable_snapshot",
     "get",
     "get_last_update_channel",
     "isset",
@@ -74,6 +76,8 @@ is_set_on_disk = default_manager.is_set_on_disk
 lookup_key = default_manager.lookup_key
 get_last_update_channel = default_manager.get_last_update_channel
 can_update = default_manager.can_update
+enable_snapshot = default_manager.enable_snapshot
+disable_snapshot = default_manager.disable_snapshot
 
 
 def load_defaults():
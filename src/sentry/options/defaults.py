@@ -757,7 +757,29 @@ register("snuba.search.chunk-growth-rate", default=1.5, flags=FLAG_AUTOMATOR_MOD
 register("snuba.search.max-chunk-size", default=2000, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Seconds for which the candidates and hits of an issue search are reused across its pages,
+# 0 disables it. See `sentry.search.snuba.search_cache`.
+register("snuba.search.state-cache-ttl", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Estimate the hits of Postgres-only issue searches from a sample instead of counting them
+register("snuba.search.estimate-hits", type=Bool, default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Referrers whose identical in-flight queries are deduplicated across workers, with results
+# shared for a short time. See `sentry.utils.snuba._apply_singleflight`.
+register(
+    "snuba.query-singleflight.referrers",
+    type=Sequence,
+    default=[],
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Bounds (in seconds) for how long singleflight results are shared. Queries ending in the past
+# are shared for `ttl-ratio` times the age of their end, within these bounds.
+register("snuba.query-singleflight.min-ttl", default=5, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-singleflight.max-ttl", default=300, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-singleflight.ttl-ratio", default=0.01, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# How long the worker running a query holds its lock, and how long other workers wait for
+# its result before querying Snuba themselves.
+register("snuba.query-singleflight.lock-duration", default=30, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-singleflight.wait-timeout", default=10.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
@@ -1135,6 +1157,8 @@ register(
 register(
     "post_process.get-autoassign-owners", type=Sequence, default=[], flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Match ownership rules through a compiled index which only tests candidate rules
+register("ownership.rule-index.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register(
     "api.organization.disable-last-deploys",
     type=Sequence,
@@ -1399,6 +1423,13 @@ register(
 )
 # Brownout duration to be stored in ISO8601 format for durations (See https://en.wikipedia.org/wiki/ISO_8601#Durations)
 register("api.deprecation.brownout-duration", default="PT1M", flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Run the independent lookups of `GroupSerializerBase.get_attrs` concurrently on a thread pool
+register(
+    "api.serializers.group.concurrent-attrs",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Option to disable misbehaving use case IDs
 register("sentry-metrics.indexer.disabled-namespaces", default=[], flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -1424,6 +1455,36 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Number of keys held in a process-local LRU in front of the indexer cache, 0 disables it
+register(
+    "sentry-metrics.indexer.local-cache.size",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Seconds keys are held in the process-local indexer cache
+register(
+    "sentry-metrics.indexer.local-cache.ttl",
+    default=300,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Keys read from the process-local indexer cache at least this many times are reloaded in the
+# background before they expire from the indexer cache, 0 disables it
+register(
+    "sentry-metrics.indexer.refresh-ahead.min-hits",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Seconds for which strings rejected by the writes limiter are rejected again without querying
+# the database, 0 disables it
+register(
+    "sentry-metrics.indexer.rate-limited-cache.window",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -1981,6 +2042,8 @@ register("flagpole.debounce_reporting_seconds", default=0, flags=FLAG_AUTOMATOR_
 # Feature flagging error capture rate.
 # When feature flagging has faults, it can become very high volume and we can overwhelm sentry.
 register("features.error.capture_rate", default=0.1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Memoize feature checks within requests and tasks, see `FeatureManager.evaluation_scope`.
+register("features.evaluation-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # Retry controls
 register("hybridcloud.regionsiloclient.retries", default=5, flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -2008,6 +2071,25 @@ register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Write nodestore blobs in the subkey-indexed envelope format. Readers understand
+# both formats, so this should only be enabled once all readers are deployed.
+register("nodestore.write-envelope", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Codec applied to nodestore blobs before they are handed to the backend, one
+# of "zlib" or "zstd". Blobs record their codec, so this can be changed freely.
+register("nodestore.compression", default="", flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Size in bytes of the in-process nodestore cache used by `use_local_cache`
+# scopes. 0 disables the local cache.
+register("nodestore.local-cache.max-bytes", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Seconds entries stay in the in-process nodestore cache.
+register("nodestore.local-cache.ttl", default=60, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Mapping of event platform to the id of a trained zstd dictionary, see
+# `sentry nodestore train-dictionary`.
+register(
+    "nodestore.compression.zstd-dictionaries",
+    type=Dict,
+    default={},
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # === Backpressure related runtime options ===
 
@@ -2640,6 +2722,33 @@ register(
     default=300,  # 5 minutes
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Add all subsegments of a trace to the span buffer with a single script call
+register(
+    "standalone-spans.buffer-batched-ingestion.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Page through segments with SSCAN when flushing the span buffer, and produce
+# them as they are read
+register(
+    "standalone-spans.buffer-streaming-flush.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Stop reading segments in a streaming flush after this many bytes of payloads
+register(
+    "standalone-spans.buffer-flush-max-bytes",
+    type=Int,
+    default=50 * 1024 * 1024,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Flush segments larger than this on their own in a streaming flush
+register(
+    "standalone-spans.buffer-max-segment-bytes",
+    type=Int,
+    default=10 * 1024 * 1024,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "standalone-spans.process-segments-consumer.enable",
     default=True,
@@ -3009,6 +3118,13 @@ register(
     default=False,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Fetch node data for `iter_events` on a thread pool while the next page is queried from Snuba
+register(
+    "eventstore.iter-events.pipelined",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Demo mode
 register(
@@ -3044,6 +3160,14 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Seconds for which cached tag keys and values are served past their time bucket while they are
+# refreshed in a task, 0 disables it. See `sentry.tagstore.snuba.cache`.
+register(
+    "tagstore.stale-while-revalidate.max-staleness",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # option used to enable/disable applying
 # stack trace rules in profiles
 register(
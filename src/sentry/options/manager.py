@@ -13,6 +13,7 @@ from sentry.utils.hashlib import md5_text
 from sentry.utils.types import Any, type_from_value
 
 if TYPE_CHECKING:
+    from sentry.options.snapshot import OptionsSnapshot
     from sentry.options.store import Key, OptionsStore
 
 # Prevent ourselves from clobbering the builtin
@@ -180,6 +181,7 @@ class OptionsManager:
     def __init__(self, store: OptionsStore):
         self.store = store
         self.registry: dict[str, Key] = {}
+        self.snapshot: OptionsSnapshot | None = None
 
     def set(self, key: str, value, coerce=True, channel: UpdateChannel = UpdateChannel.UNKNOWN):
         """
@@ -217,7 +219,9 @@ class OptionsManager:
         elif not opt.type.test(value):
             raise TypeError(f"got {_type(value)!r}, expected {opt.type!r}")
 
-        return self.store.set(opt, value, channel=channel)
+        rv = self.store.set(opt, value, channel=channel)
+        self._notify_change(key)
+        return rv
 
     def lookup_key(self, key: str):
         try:
@@ -290,6 +294,16 @@ class OptionsManager:
 
         >>> from sentry import options
         >>> options.get('option')
+
+        If a snapshot is enabled, the value is served from the snapshot.
+        """
+        if self.snapshot is not None:
+            return self.snapshot.get(key)
+        return self.fetch(key, silent=silent)
+
+    def fetch(self, key: str, silent=False):
+        """
+        Get the current value of an option, bypassing the snapshot.
         """
         # TODO(mattrobenolt): Perform validation on key returned for type Justin Case
         # values change. This case is unlikely, but good to cover our bases.
@@ -350,7 +364,33 @@ class OptionsManager:
         # Enforce immutability on key
         assert not (opt.flags & FLAG_IMMUTABLE), "%r cannot be changed at runtime" % key
 
-        return self.store.delete(opt)
+        rv = self.store.delete(opt)
+        self._notify_change(key)
+        return rv
+
+    def _notify_change(self, key: str) -> None:
+        from sentry.options.snapshot import publish_change
+
+        if self.snapshot is not None:
+            self.snapshot.invalidate(key)
+        publish_change(key)
+
+    def enable_snapshot(self, interval: float) -> OptionsSnapshot:
+        """
+        Serve `get` from a process-local snapshot which is refreshed every
+        `interval` seconds, see `sentry.options.snapshot`.
+        """
+        from sentry.options.snapshot import OptionsSnapshot
+
+        if self.snapshot is None:
+            self.snapshot = OptionsSnapshot(self, interval)
+            self.snapshot.start()
+        return self.snapshot
+
+    def disable_snapshot(self) -> None:
+        if self.snapshot is not None:
+            self.snapshot.stop()
+            self.snapshot = None
 
     def register(
         self,
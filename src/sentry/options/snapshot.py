@@ -0,0 +1,164 @@
+"""
+Process-local snapshot of option values.
+
+Every `options.get` goes through the options store, which checks the
+in-process cache (and its expiry) and falls back to the network cache and the
+database. Consumers look up the same handful of options for every message, so
+they can instead enable a snapshot with `options.enable_snapshot`:
+
+>>> from sentry import options
+>>> options.enable_snapshot(interval=10)
+
+Afterwards `options.get` is a lookup in an immutable mapping of the values of
+all options which have been read so far. A background thread replaces the
+mapping with a fresh one every `interval` seconds, and the version of the
+mapping is bumped on every refresh. If `SENTRY_OPTIONS_SNAPSHOT_REDIS_CLUSTER`
+is configured, changes made through `options.set` and `options.delete` are
+published on a Redis channel, and snapshots subscribed to it refresh right
+away.
+
+The age of the snapshot is reported as `options.snapshot.age` every time it is
+refreshed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+
+from sentry.utils import metrics, redis
+from sentry.utils.flag import record_option
+
+if TYPE_CHECKING:
+    from sentry.options.manager import OptionsManager
+
+logger = logging.getLogger(__name__)
+
+CHANGES_CHANNEL = "sentry-options-changes"
+
+
+def publish_change(key: str) -> None:
+    """
+    Notify subscribed snapshots that the value of the option has changed.
+    """
+    cluster = settings.SENTRY_OPTIONS_SNAPSHOT_REDIS_CLUSTER
+    if cluster is None:
+        return
+    try:
+        redis.redis_clusters.get(cluster).publish(CHANGES_CHANNEL, key)
+    except Exception:
+        logger.warning("options.snapshot.publish-failed", extra={"key": key}, exc_info=True)
+
+
+class OptionsSnapshot:
+    def __init__(self, manager: OptionsManager, interval: float) -> None:
+        self.manager = manager
+        self.interval = interval
+        self.version = 0
+        self.refreshed_at = time.monotonic()
+        self._values: Mapping[str, Any] = MappingProxyType({})
+        self._lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._threads: list[threading.Thread] | None = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    @property
+    def values(self) -> Mapping[str, Any]:
+        return self._values
+
+    def get(self, key: str) -> Any:
+        # Threads don't survive a fork, start them again in the child.
+        if self._threads is None:
+            self.start()
+
+        try:
+            value = self._values[key]
+        except KeyError:
+            value = self._add(key)
+        record_option(key, value)
+        return value
+
+    def _add(self, key: str) -> Any:
+        value = self.manager.fetch(key)
+        with self._lock:
+            self._values = MappingProxyType({**self._values, key: value})
+        return value
+
+    def refresh(self) -> None:
+        """
+        Replace the snapshot with the current values of all options in it.
+        """
+        values = {key: self.manager.fetch(key, silent=True) for key in self._values}
+        with self._lock:
+            # Keep options that were added while refreshing
+            for key, value in self._values.items():
+                values.setdefault(key, value)
+            self._values = MappingProxyType(values)
+            self.version += 1
+            self.refreshed_at = time.monotonic()
+
+    def invalidate(self, key: str) -> None:
+        """
+        Called when the value of an option has changed elsewhere. Refreshes the snapshot from
+        the network cache rather than the store's local cache.
+        """
+        if key in self._values:
+            self.manager.store.delete_local_cache(self.manager.lookup_key(key))
+            self._refresh_requested.set()
+
+    def start(self) -> None:
+        self._stopped.clear()
+        threads = [threading.Thread(target=self._run_refresh, daemon=True)]
+        if settings.SENTRY_OPTIONS_SNAPSHOT_REDIS_CLUSTER is not None:
+            threads.append(threading.Thread(target=self._run_subscriber, daemon=True))
+        for thread in threads:
+            thread.start()
+        self._threads = threads
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._refresh_requested.set()
+        self._threads = None
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = None
+
+    def _run_refresh(self) -> None:
+        while not self._stopped.is_set():
+            self._refresh_requested.wait(self.interval)
+            self._refresh_requested.clear()
+            if self._stopped.is_set():
+                return
+
+            metrics.gauge("options.snapshot.age", time.monotonic() - self.refreshed_at)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("options.snapshot.refresh-failed")
+
+    def _run_subscriber(self) -> None:
+        cluster = settings.SENTRY_OPTIONS_SNAPSHOT_REDIS_CLUSTER
+        while not self._stopped.is_set():
+            try:
+                pubsub = redis.redis_clusters.get(cluster).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANGES_CHANNEL)
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        key = message["data"]
+                        self.invalidate(key.decode() if isinstance(key, bytes) else key)
+            except Exception:
+                logger.warning("options.snapshot.subscribe-failed", exc_info=True)
+                # Fall back to refreshing on the interval until we can reconnect
+                self._stopped.wait(self.interval)
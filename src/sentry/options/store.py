@@ -316,6 +316,13 @@ class OptionsStore:
             logger.warning(CACHE_UPDATE_ERR, key.name, extra={"key": key.name}, exc_info=True)
             return False
 
+    def delete_local_cache(self, key):
+        """
+        Remove a key from the local in-process cache, so that the next lookup
+        goes to the network cache.
+        """
+        self._local_cache.pop(key.cache_key, None)
+
     def clean_local_cache(self):
         """
         Iterate over our local cache items, and
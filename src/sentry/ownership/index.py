@@ -0,0 +1,171 @@
+"""
+Compiled index over the rules of an ownership schema.
+
+Testing every rule against every frame of an event is O(rules × frames), and
+every test is a call into the native glob matchers. For large CODEOWNERS
+files this dominates owner assignment. `OwnershipRuleIndex` narrows the rules
+down to candidates which can possibly match an event, and only tests those:
+
+- `path` and `codeowners` rules are bucketed by a literal path segment of
+  their pattern (``src/components/*.tsx`` can only match a path which has a
+  ``components`` segment). Rules without one, and rules whose pattern is
+  escaped, are always tested.
+- `url` rules are only tested if the event has a request URL, and `module`
+  rules if one of its frames has a module.
+- `tags.*` rules are always tested, and rules of unknown type are dropped
+  since they never match.
+
+Candidates are tested with `Rule.test` in the order of the schema, so the
+result is identical to testing every rule. Indexes are cached per process,
+keyed by a hash of the schema.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import orjson
+from cachetools import LRUCache
+
+from sentry.ownership.grammar import CODEOWNERS, MODULE, PATH, URL, Rule, load_schema
+from sentry.utils import metrics
+from sentry.utils.event_frames import find_stack_frames
+from sentry.utils.safe import get_path
+
+# Characters with a special meaning in glob or CODEOWNERS patterns. Segments containing them are
+# not literal.
+_WILDCARD_CHARS = frozenset("*?[]{}!")
+_PATH_SEPARATORS = re.compile(r"[/\\]")
+
+INDEX_CACHE_SIZE = 100
+_index_cache: LRUCache[bytes, OwnershipRuleIndex] = LRUCache(maxsize=INDEX_CACHE_SIZE)
+_index_cache_lock = threading.Lock()
+
+
+def _get_literal_segment(pattern: str) -> str | None:
+    """
+    Returns the literal path segment of the pattern which a path has to contain for the pattern to
+    match it, or `None` if there is none. The longest segment is picked, as it's likely the most
+    selective one.
+    """
+    # Escapes change the meaning of what follows them, don't try to make sense of those
+    if "\\" in pattern:
+        return None
+
+    best = None
+    for segment in pattern.split("/"):
+        if (
+            not segment
+            or segment in (".", "..")
+            or not segment.isascii()
+            or not _WILDCARD_CHARS.isdisjoint(segment)
+        ):
+            continue
+        if best is None or len(segment) >= len(best):
+            best = segment
+    return best.lower() if best is not None else None
+
+
+class OwnershipRuleIndex:
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = list(rules)
+        # segment -> indexes of path and codeowners rules with that literal segment
+        self._rules_by_segment: dict[str, list[int]] = defaultdict(list)
+        self._path_rules: list[int] = []
+        self._unindexed_path_rules: list[int] = []
+        self._url_rules: list[int] = []
+        self._module_rules: list[int] = []
+        self._tag_rules: list[int] = []
+
+        for i, rule in enumerate(self.rules):
+            matcher_type = rule.matcher.type
+            if matcher_type in (PATH, CODEOWNERS):
+                self._path_rules.append(i)
+                segment = _get_literal_segment(rule.matcher.pattern)
+                if segment is None:
+                    self._unindexed_path_rules.append(i)
+                else:
+                    self._rules_by_segment[segment].append(i)
+            elif matcher_type == URL:
+                self._url_rules.append(i)
+            elif matcher_type == MODULE:
+                self._module_rules.append(i)
+            elif matcher_type.startswith("tags."):
+                self._tag_rules.append(i)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _get_path_candidates(
+        self, munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]]
+    ) -> list[int]:
+        frames, keys = munged_data
+        if not frames or not self._path_rules:
+            return []
+
+        segments = set()
+        for frame in frames:
+            for key in keys:
+                value = frame.get(key)
+                if not value:
+                    continue
+                if not isinstance(value, str):
+                    # Can't tell what the matchers make of it, so test all of them
+                    return list(self._path_rules)
+                segments.update(_PATH_SEPARATORS.split(value.casefold()))
+
+        candidates = list(self._unindexed_path_rules)
+        for segment in segments:
+            candidates.extend(self._rules_by_segment.get(segment, ()))
+        return candidates
+
+    def get_candidates(
+        self,
+        data: Mapping[str, Any],
+        munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]],
+    ) -> list[Rule]:
+        """
+        The rules which could match the event, in the order of the schema.
+        """
+        candidates = self._get_path_candidates(munged_data)
+        candidates.extend(self._tag_rules)
+        if self._url_rules and get_path(data, "request", "url"):
+            candidates.extend(self._url_rules)
+        if self._module_rules and any(frame.get("module") for frame in find_stack_frames(data)):
+            candidates.extend(self._module_rules)
+
+        candidates.sort()
+        return [self.rules[i] for i in candidates]
+
+    def get_matching_rules(
+        self,
+        data: Mapping[str, Any],
+        munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]],
+    ) -> list[Rule]:
+        return [
+            rule for rule in self.get_candidates(data, munged_data) if rule.test(data, munged_data)
+        ]
+
+
+def get_rule_index(schema: Mapping[str, Any]) -> OwnershipRuleIndex:
+    """
+    Returns the (cached) index over the rules of the given ownership schema.
+    """
+    key = hashlib.sha1(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)).digest()
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+    if index is not None:
+        metrics.incr("ownership.rule_index.cache", tags={"result": "hit"})
+        return index
+
+    metrics.incr("ownership.rule_index.cache", tags={"result": "miss"})
+    with metrics.timer("ownership.rule_index.build"):
+        index = OwnershipRuleIndex(load_schema(schema))
+    with _index_cache_lock:
+        _index_cache[key] = index
+    return index
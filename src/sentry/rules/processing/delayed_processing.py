@@ -19,6 +19,7 @@ from sentry.models.grouprulestatus import GroupRuleStatus
 from sentry.models.project import Project
 from sentry.models.rule import Rule
 from sentry.models.rulesnooze import RuleSnooze
+from sentry.nodestore.local_cache import use_local_cache
 from sentry.rules import history, rules
 from sentry.rules.conditions.event_frequency import (
     COMPARISON_INTERVALS,
@@ -202,9 +203,10 @@ def bulk_fetch_events(event_ids: list[str], project_id: int) -> dict[str, Event]
     fetch_retry_policy = ConditionalRetryPolicy(should_retry_fetch, exponential_delay(1.00))
 
     bulk_data = {}
-    for node_id_chunk in chunked(node_ids, EVENT_LIMIT):
-        bulk_results = fetch_retry_policy(lambda: nodestore.backend.get_multi(node_id_chunk))
-        bulk_data.update(bulk_results)
+    with use_local_cache("delayed_processing"):
+        for node_id_chunk in chunked(node_ids, EVENT_LIMIT):
+            bulk_results = fetch_retry_policy(lambda: nodestore.backend.get_multi(node_id_chunk))
+            bulk_data.update(bulk_results)
 
     return {
         node_id_to_event_id[node_id]: Event(
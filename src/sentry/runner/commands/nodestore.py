@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+@click.group()
+def nodestore() -> None:
+    "Tools for managing the node storage."
+
+
+@nodestore.command("train-dictionary")
+@click.option("--platform", required=True, help="Event platform to sample nodes for.")
+@click.option(
+    "--project",
+    "project_ids",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Project to sample events from. Can be given multiple times.",
+)
+@click.option("--samples", default=2000, show_default=True, help="Number of nodes to sample.")
+@click.option("--days", default=7, show_default=True, help="Sample events from the last N days.")
+@click.option(
+    "--size",
+    default=110 * 1024,
+    show_default=True,
+    help="Maximum size of the dictionary in bytes.",
+)
+@click.option(
+    "--enable",
+    is_flag=True,
+    default=False,
+    help="Write new blobs for this platform with the trained dictionary.",
+)
+@configuration
+def train_dictionary(
+    platform: str,
+    project_ids: tuple[int, ...],
+    samples: int,
+    days: int,
+    size: int,
+    enable: bool,
+) -> None:
+    """
+    Train a zstd dictionary from sampled nodes of the given platform.
+
+    The dictionary is written to SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR,
+    which has to be shared by all processes reading from nodestore before the
+    dictionary is enabled.
+    """
+    import zlib
+
+    from django.utils import timezone
+
+    from sentry import eventstore, nodestore, options
+    from sentry.eventstore.models import Event
+    from sentry.nodestore import compression
+
+    end = timezone.now()
+    events = eventstore.backend.get_events(
+        filter=eventstore.Filter(
+            project_ids=list(project_ids),
+            conditions=[["platform", "=", platform]],
+            start=end - timedelta(days=days),
+            end=end,
+        ),
+        limit=samples,
+        referrer="runner.nodestore.train_dictionary",
+    )
+
+    node_ids = [Event.generate_node_id(event.project_id, event.event_id) for event in events]
+    nodes = [node for node in map(nodestore.backend.get_bytes, node_ids) if node]
+    if not nodes:
+        raise click.ClickException(f"No nodes found for platform {platform!r}")
+
+    click.echo(f"Training dictionary on {len(nodes)} nodes...")
+    dictionary = compression.train_dictionary(nodes, size)
+    dictionary_id = compression.write_dictionary(dictionary)
+
+    raw_size = sum(len(node) for node in nodes)
+    zlib_size = sum(len(zlib.compress(node)) for node in nodes)
+    zstd_size = sum(len(compression.encode(node, "zstd", dictionary_id)) for node in nodes)
+    click.echo(f"Wrote dictionary {dictionary_id} to {compression.dictionary_path(dictionary_id)}")
+    click.echo(f"  raw:  {raw_size:,} bytes")
+    click.echo(f"  zlib: {zlib_size:,} bytes ({zlib_size / raw_size:.2%})")
+    click.echo(f"  zstd: {zstd_size:,} bytes ({zstd_size / raw_size:.2%})")
+
+    if enable:
+        dictionaries = dict(options.get("nodestore.compression.zstd-dictionaries"))
+        dictionaries[platform] = dictionary_id
+        options.set("nodestore.compression.zstd-dictionaries", dictionaries)
+        click.echo(f"Enabled dictionary {dictionary_id} for platform {platform!r}")
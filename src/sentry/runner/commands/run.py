@@ -313,6 +313,18 @@ def taskworker_scheduler(redis_cluster: str, **options: Any) -> None:
     help="The name of the processing pool being used",
     default="unknown",
 )
+@click.option(
+    "--process-type",
+    help="How child processes are started. With forkserver, Django and all task modules are imported once, and children are forked from that process.",
+    default="spawn",
+    type=click.Choice(["spawn", "fork", "forkserver"]),
+)
+@click.option(
+    "--fetch-batch-size",
+    help="The number of tasks to lease from a broker at once. Status updates are sent in batches of the same size.",
+    default=taskworker_constants.DEFAULT_FETCH_BATCH_SIZE,
+    type=int,
+)
 @log_options()
 @configuration
 def taskworker(**options: Any) -> None:
@@ -336,6 +348,8 @@ def run_taskworker(
     result_queue_maxsize: int,
     rebalance_after: int,
     processing_pool_name: str,
+    fetch_batch_size: int,
+    process_type: str,
     **options: Any,
 ) -> None:
     """
@@ -354,6 +368,8 @@ def run_taskworker(
             result_queue_maxsize=result_queue_maxsize,
             rebalance_after=rebalance_after,
             processing_pool_name=processing_pool_name,
+            fetch_batch_size=fetch_batch_size,
+            process_type=process_type,
             **options,
         )
         exitcode = worker.start()
@@ -566,12 +582,19 @@ def cron(**options: Any) -> None:
     default=None,
     help="Quantized rebalancing means that during deploys, rebalancing is triggered across all pods within a consumer group at the same time. The value is used by the pods to align their group join/leave activity to some multiple of the delay",
 )
+@click.option(
+    "--options-snapshot-interval",
+    type=float,
+    default=None,
+    help="Serve option lookups from a process-local snapshot that is refreshed every N seconds.",
+)
 @configuration
 def basic_consumer(
     consumer_name: str,
     consumer_args: tuple[str, ...],
     topic: str | None,
     quantized_rebalance_delay_secs: int | None,
+    options_snapshot_interval: float | None,
     **options: Any,
 ) -> None:
     """
@@ -603,6 +626,11 @@ def basic_consumer(
     add_global_tags(kafka_topic=topic, consumer_group=options["group_id"])
     initialize_arroyo_main()
 
+    if options_snapshot_interval:
+        from sentry.options import enable_snapshot
+
+        enable_snapshot(options_snapshot_interval)
+
     processor = get_stream_processor(consumer_name, consumer_args, topic=topic, **options)
 
     # for backwards compat: should eventually be removed
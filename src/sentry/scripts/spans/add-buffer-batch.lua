@@ -0,0 +1,96 @@
+--[[
+
+Add all subsegments of one trace to the span buffer at once.
+
+This does the same as adding the payloads of every subsegment to its set and
+then calling `add-buffer.lua` for each of its spans, but in a single call.
+
+KEYS:
+- "project_id:trace_id" -- just for redis-cluster routing, all keys that the script uses are sharded like this/have this hashtag.
+
+ARGS:
+- set_timeout -- int
+- then, for every subsegment:
+  - parent_span_id -- str
+  - the number of spans in the subsegment -- int
+  - then, for every span: is_root_span -- bool, span_id -- str, payload -- str
+
+Returns one `{redirect_depth, span_key, set_key, has_root_span}` entry per
+span, in the order they were passed.
+
+]]--
+
+-- Bounds the number of arguments passed to a single SADD, since ``unpack``
+-- is limited by the size of the Lua C stack.
+local SADD_BATCH_SIZE = 1000
+
+local project_and_trace = KEYS[1]
+local set_timeout = tonumber(ARGV[1])
+
+local main_redirect_key = string.format("span-buf:sr:{%s}", project_and_trace)
+
+local function add_span(is_root_span, span_id, parent_span_id)
+    local span_key = string.format("span-buf:s:{%s}:%s", project_and_trace, span_id)
+
+    local set_span_id = parent_span_id
+    local redirect_depth = 0
+
+    for i = 0, 10000 do  -- theoretically this limit means that segment trees of depth 10k may not be joined together correctly.
+        local new_set_span = redis.call("hget", main_redirect_key, set_span_id)
+        redirect_depth = i
+        if not new_set_span or new_set_span == set_span_id then
+            break
+        end
+
+        set_span_id = new_set_span
+    end
+
+    redis.call("hset", main_redirect_key, span_id, set_span_id)
+    redis.call("expire", main_redirect_key, set_timeout)
+
+    local set_key = string.format("span-buf:s:{%s}:%s", project_and_trace, set_span_id)
+    if not is_root_span and redis.call("scard", span_key) > 0 then
+        redis.call("sunionstore", set_key, set_key, span_key)
+        redis.call("unlink", span_key)
+    end
+
+    local parent_key = string.format("span-buf:s:{%s}:%s", project_and_trace, parent_span_id)
+    if set_span_id ~= parent_span_id and redis.call("scard", parent_key) > 0 then
+        redis.call("sunionstore", set_key, set_key, parent_key)
+        redis.call("unlink", parent_key)
+    end
+    redis.call("expire", set_key, set_timeout)
+
+    local has_root_span_key = string.format("span-buf:hrs:%s", set_key)
+    local has_root_span = redis.call("get", has_root_span_key) == "1" or is_root_span
+    if has_root_span then
+        redis.call("setex", has_root_span_key, set_timeout, "1")
+    end
+
+    return {redirect_depth, span_key, set_key, has_root_span}
+end
+
+local results = {}
+local cursor = 2
+while cursor <= #ARGV do
+    local parent_span_id = ARGV[cursor]
+    local count = tonumber(ARGV[cursor + 1])
+    local spans_start = cursor + 2
+    cursor = spans_start + count * 3
+
+    local parent_key = string.format("span-buf:s:{%s}:%s", project_and_trace, parent_span_id)
+    for offset = 0, count - 1, SADD_BATCH_SIZE do
+        local payloads = {}
+        for i = 1, math.min(SADD_BATCH_SIZE, count - offset) do
+            payloads[i] = ARGV[spans_start + (offset + i - 1) * 3 + 2]
+        end
+        redis.call("sadd", parent_key, unpack(payloads))
+    end
+
+    for i = 0, count - 1 do
+        local span = spans_start + i * 3
+        results[#results + 1] = add_span(ARGV[span] == "true", ARGV[span + 1], parent_span_id)
+    end
+end
+
+return results
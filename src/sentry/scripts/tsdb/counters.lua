@@ -0,0 +1,57 @@
+--[[
+
+Batched Counter Reads
+=====================
+
+Reads many counter hash fields at once and scatter-adds their values into a
+compact result array, so that callers can fetch (and optionally sum) a large
+number of series buckets with a single command per host.
+
+All ``KEYS`` must live on the same host. ``ARGV`` is laid out as follows:
+
+- the size of the result array,
+- then, for every key in ``KEYS`` (in the same order): the number of fields
+  to read from that hash, followed by that many ``(field, slot)`` pairs.
+
+Slots are 1-based indexes into the result array. Several fields may map onto
+the same slot, in which case their values are summed. Missing fields count as
+zero.
+
+Returns the result array.
+
+]]--
+
+-- Bounds the number of arguments passed to a single HMGET, since ``unpack``
+-- is limited by the size of the Lua C stack.
+local HMGET_BATCH_SIZE = 1000
+
+local size = tonumber(ARGV[1])
+local result = {}
+for i = 1, size do
+    result[i] = 0
+end
+
+local cursor = 2
+for _, key in ipairs(KEYS) do
+    local count = tonumber(ARGV[cursor])
+    cursor = cursor + 1
+
+    for offset = 0, count - 1, HMGET_BATCH_SIZE do
+        local fields = {}
+        local slots = {}
+        for i = 1, math.min(HMGET_BATCH_SIZE, count - offset) do
+            fields[i] = ARGV[cursor]
+            slots[i] = tonumber(ARGV[cursor + 1])
+            cursor = cursor + 2
+        end
+
+        local values = redis.call('HMGET', key, unpack(fields))
+        for i, value in ipairs(values) do
+            if value then
+                result[slots[i]] = result[slots[i]] + tonumber(value)
+            end
+        end
+    end
+end
+
+return result
@@ -64,6 +64,7 @@ from sentry.models.team import Team
 from sentry.search.events.builder.discover import UnresolvedQuery
 from sentry.search.events.filter import convert_search_filter_to_snuba_query, format_search_filter
 from sentry.search.events.types import SnubaParams
+from sentry.search.snuba.search_cache import SearchStateCache
 from sentry.snuba.dataset import Dataset
 from sentry.users.models.user import User
 from sentry.users.services.user.model import RpcUser
@@ -827,6 +828,13 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             # is invalid.
             return self.empty_result
 
+        search_cache = None
+        search_cache_ttl = options.get("snuba.search.state-cache-ttl")
+        if search_cache_ttl > 0:
+            search_cache = SearchStateCache.for_search(
+                group_queryset, projects, environments, search_filters, start, end, search_cache_ttl
+            )
+
         # If the requested sort is `date` (`last_seen`) and there
         # are no other Snuba-based search predicates, we can simply
         # return the results from Postgres.
@@ -867,8 +875,38 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
 
             paginator = DateTimePaginator(group_queryset, "-last_seen", **paginator_options)
 
-            # When it's a simple django-only search, we count_hits like normal
-            results = paginator.get_result(limit, cursor, count_hits=count_hits, max_hits=max_hits)
+            if count_hits and options.get("snuba.search.estimate-hits"):
+                # Estimate hits from a sample instead of counting all matching groups
+                results = paginator.get_result(limit, cursor, count_hits=False)
+                hits = search_cache.get_hits() if search_cache is not None else None
+                if hits is None:
+                    hits = self.calculate_hits(
+                        [],
+                        True,
+                        self.sort_strategies[sort_by],
+                        projects,
+                        retention_window_start,
+                        group_queryset,
+                        environments,
+                        sort_by,
+                        limit,
+                        cursor,
+                        count_hits,
+                        paginator_options,
+                        search_filters,
+                        start,
+                        end,
+                        actor,
+                    )
+                    if search_cache is not None and hits is not None:
+                        search_cache.set_hits(hits)
+                results.hits = hits if max_hits is None or hits is None else min(hits, max_hits)
+                results.max_hits = max_hits
+            else:
+                # When it's a simple django-only search, we count_hits like normal
+                results = paginator.get_result(
+                    limit, cursor, count_hits=count_hits, max_hits=max_hits
+                )
             metrics.timing(
                 "snuba.search.query",
                 (timezone.now() - now).total_seconds(),
@@ -881,55 +919,71 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         # clause.
         max_candidates = options.get("snuba.search.max-pre-snuba-candidates")
 
-        with sentry_sdk.start_span(op="snuba_group_query") as span:
-            group_ids = list(
-                group_queryset.using_replica().values_list("id", flat=True)[: max_candidates + 1]
-            )
-            span.set_data("Max Candidates", max_candidates)
-            span.set_data("Result Size", len(group_ids))
-        metrics.distribution("snuba.search.num_candidates", len(group_ids))
-        too_many_candidates = False
-        if not group_ids:
+        cached_candidates = search_cache.get_candidates() if search_cache is not None else None
+        if cached_candidates is not None:
+            group_ids, too_many_candidates = cached_candidates
+        else:
+            with sentry_sdk.start_span(op="snuba_group_query") as span:
+                group_ids = list(
+                    group_queryset.using_replica().values_list("id", flat=True)[
+                        : max_candidates + 1
+                    ]
+                )
+                span.set_data("Max Candidates", max_candidates)
+                span.set_data("Result Size", len(group_ids))
+            metrics.distribution("snuba.search.num_candidates", len(group_ids))
+            too_many_candidates = False
+            if len(group_ids) > max_candidates:
+                # If the pre-filter query didn't include anything to significantly
+                # filter down the number of results (from 'first_release', 'status',
+                # 'bookmarked_by', 'assigned_to', 'unassigned', or 'subscribed_by')
+                # then it might have surpassed the `max_candidates`. In this case,
+                # we *don't* want to pass candidates down to Snuba, and instead we
+                # want Snuba to do all the filtering/sorting it can and *then* apply
+                # this queryset to the results from Snuba, which we call
+                # post-filtering.
+                metrics.incr("snuba.search.too_many_candidates", skip_internal=False)
+                too_many_candidates = True
+                group_ids = []
+            if search_cache is not None:
+                search_cache.set_candidates(group_ids, too_many_candidates)
+
+        if not group_ids and not too_many_candidates:
             # no matches could possibly be found from this point on
             metrics.incr("snuba.search.no_candidates", skip_internal=False)
             return self.empty_result
-        elif len(group_ids) > max_candidates:
-            # If the pre-filter query didn't include anything to significantly
-            # filter down the number of results (from 'first_release', 'status',
-            # 'bookmarked_by', 'assigned_to', 'unassigned', or 'subscribed_by')
-            # then it might have surpassed the `max_candidates`. In this case,
-            # we *don't* want to pass candidates down to Snuba, and instead we
-            # want Snuba to do all the filtering/sorting it can and *then* apply
-            # this queryset to the results from Snuba, which we call
-            # post-filtering.
-            metrics.incr("snuba.search.too_many_candidates", skip_internal=False)
-            too_many_candidates = True
-            group_ids = []
 
         sort_field = self.sort_strategies[sort_by]
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
         max_chunk_size = options.get("snuba.search.max-chunk-size")
         chunk_limit = limit
+        if search_cache is not None and cursor is not None and too_many_candidates:
+            # Start out with the chunk size that was needed to fill the previous page
+            previous_chunk_limit = search_cache.get_chunk_limit(sort_by, cursor)
+            if previous_chunk_limit is not None:
+                chunk_limit = max(limit, int(previous_chunk_limit / chunk_growth))
         offset = 0
         num_chunks = 0
-        hits = self.calculate_hits(
-            group_ids,
-            too_many_candidates,
-            sort_field,
-            projects,
-            retention_window_start,
-            group_queryset,
-            environments,
-            sort_by,
-            limit,
-            cursor,
-            count_hits,
-            paginator_options,
-            search_filters,
-            start,
-            end,
-            actor,
-        )
+        hits = search_cache.get_hits() if search_cache is not None and count_hits else None
+        if hits is None:
+            hits = self.calculate_hits(
+                group_ids,
+                too_many_candidates,
+                sort_field,
+                projects,
+                retention_window_start,
+                group_queryset,
+                environments,
+                sort_by,
+                limit,
+                cursor,
+                count_hits,
+                paginator_options,
+                search_filters,
+                start,
+                end,
+                actor,
+            )
         if count_hits and hits == 0:
             return self.empty_result
 
@@ -1044,6 +1098,12 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
 
         metrics.distribution("snuba.search.num_chunks", num_chunks)
 
+        if search_cache is not None:
+            if count_hits and hits is not None:
+                search_cache.set_hits(hits)
+            if too_many_candidates and paginator_results.next.has_results:
+                search_cache.set_chunk_limit(sort_by, paginator_results.next, chunk_limit)
+
         groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
 
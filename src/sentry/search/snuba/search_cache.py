@@ -0,0 +1,113 @@
+"""
+Short-lived state of an issue search, shared across the pages of its results.
+
+Every page of an issue search in `PostgresSnubaQueryExecutor` selects the
+candidate groups from Postgres, estimates the number of hits and then queries
+Snuba in growing chunks until it has enough results. When paging through the
+results of the same search, all of that is repeated for every page.
+
+`SearchStateCache` keeps the candidate group IDs and the hits of a search,
+keyed by the Postgres queryset, the Snuba-side search parameters and the time
+window of the search rounded to the cache TTL. For searches that post-filter
+Snuba results in Postgres, it also remembers the chunk size that was needed
+to fill a page, keyed by the cursor of the next page, so the next page starts
+out with chunks of that size instead of growing them again.
+
+Results can be stale for up to the TTL of the cache, which is configured with
+`snuba.search.state-cache-ttl`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from django.core.exceptions import EmptyResultSet
+
+from sentry.api.event_search import SearchFilter
+from sentry.db.models.manager.base_query_set import BaseQuerySet
+from sentry.models.environment import Environment
+from sentry.models.project import Project
+from sentry.utils import json, metrics
+from sentry.utils.cache import cache
+from sentry.utils.cursors import Cursor
+
+CACHE_KEY_PREFIX = "search:state"
+
+
+class SearchStateCache:
+    def __init__(self, key: str, ttl: int) -> None:
+        self.key = key
+        self.ttl = ttl
+
+    @classmethod
+    def for_search(
+        cls,
+        group_queryset: BaseQuerySet,
+        projects: Sequence[Project],
+        environments: Sequence[Environment] | None,
+        search_filters: Sequence[SearchFilter] | None,
+        start: datetime,
+        end: datetime,
+        ttl: int,
+    ) -> SearchStateCache | None:
+        """
+        Returns the cache for the given search, or `None` if it can't be cached.
+        """
+        try:
+            sql = str(group_queryset.query)
+        except EmptyResultSet:
+            return None
+
+        key = json.dumps(
+            [
+                sql,
+                sorted(project.id for project in projects),
+                sorted(environment.id for environment in environments or ()),
+                [repr(search_filter) for search_filter in search_filters or ()],
+                int(start.timestamp()) // ttl,
+                int(end.timestamp()) // ttl,
+            ]
+        )
+        return cls(hashlib.md5(key.encode("utf-8")).hexdigest(), ttl)
+
+    def _get(self, name: str) -> Any:
+        value = cache.get(f"{CACHE_KEY_PREFIX}:{self.key}:{name}")
+        metrics.incr(
+            "snuba.search.state_cache",
+            tags={"name": name.split(":")[0], "result": "miss" if value is None else "hit"},
+        )
+        return value
+
+    def _set(self, name: str, value: Any) -> None:
+        cache.set(f"{CACHE_KEY_PREFIX}:{self.key}:{name}", value, self.ttl)
+
+    def get_candidates(self) -> tuple[list[int], bool] | None:
+        """
+        Returns the candidate group IDs, and whether there were too many of them to pass them
+        to Snuba.
+        """
+        value = self._get("candidates")
+        if value is None:
+            return None
+        return value["group_ids"], value["too_many"]
+
+    def set_candidates(self, group_ids: Sequence[int], too_many_candidates: bool) -> None:
+        self._set("candidates", {"group_ids": list(group_ids), "too_many": too_many_candidates})
+
+    def get_hits(self) -> int | None:
+        return self._get("hits")
+
+    def set_hits(self, hits: int) -> None:
+        self._set("hits", hits)
+
+    def get_chunk_limit(self, sort_by: str, cursor: Cursor) -> int | None:
+        """
+        Returns the chunk size that was used to fill the page before the cursor.
+        """
+        return self._get(f"chunk_limit:{sort_by}:{cursor}")
+
+    def set_chunk_limit(self, sort_by: str, cursor: Cursor, chunk_limit: int) -> None:
+        self._set(f"chunk_limit:{sort_by}:{cursor}", chunk_limit)
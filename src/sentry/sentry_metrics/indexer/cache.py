@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+import os
 import random
+from collections import defaultdict
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from django.conf import settings
@@ -19,6 +22,7 @@ from sentry.sentry_metrics.indexer.base import (
     metric_path_key_compatible_resolve,
     metric_path_key_compatible_rev_resolve,
 )
+from sentry.sentry_metrics.indexer.tiers import LocalIndexerCache, RateLimitedStrings
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.utils import metrics
 from sentry.utils.hashlib import md5_text
@@ -33,6 +37,8 @@ _INDEXER_CACHE_RESOLVE_CACHE_REPLENISHMENT_METRIC = (
 _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-write"
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
+_INDEXER_CACHE_TIER_METRIC = "sentry_metrics.indexer.memcache.tier"
+_INDEXER_CACHE_REFRESH_AHEAD_METRIC = "sentry_metrics.indexer.memcache.refresh-ahead"
 
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
@@ -44,12 +50,30 @@ NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
 
+LOCAL_CACHE_SIZE_OPTION = "sentry-metrics.indexer.local-cache.size"
+LOCAL_CACHE_TTL_OPTION = "sentry-metrics.indexer.local-cache.ttl"
+REFRESH_AHEAD_MIN_HITS_OPTION = "sentry-metrics.indexer.refresh-ahead.min-hits"
+RATE_LIMITED_WINDOW_OPTION = "sentry-metrics.indexer.rate-limited-cache.window"
+
+# Namespaced cache entries are only valid for this long after they were written
+_CACHE_ENTRY_MAX_AGE = timedelta(hours=3)
+# Hot keys are refreshed once this fraction of their lifetime in the shared cache has passed
+REFRESH_AHEAD_FRACTION = 0.75
+
+
+def _record_tier_metrics(tier: str, hits: int, misses: int) -> None:
+    metrics.incr(_INDEXER_CACHE_TIER_METRIC, tags={"tier": tier, "cache_hit": "true"}, amount=hits)
+    metrics.incr(
+        _INDEXER_CACHE_TIER_METRIC, tags={"tier": tier, "cache_hit": "false"}, amount=misses
+    )
+
 
 class StringIndexerCache:
     def __init__(self, cache_name: str, partition_key: str):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        self._local: LocalIndexerCache | None = None
 
     @property
     def randomized_ttl(self) -> int:
@@ -117,7 +141,39 @@ class StringIndexerCache:
         return formatted
 
     def _is_valid_timestamp(self, timestamp: str) -> bool:
-        return int(timestamp) >= int((datetime.utcnow() - timedelta(hours=3)).timestamp())
+        return int(timestamp) >= int((datetime.utcnow() - _CACHE_ENTRY_MAX_AGE).timestamp())
+
+    def _get_local_cache(self) -> LocalIndexerCache | None:
+        """
+        The process-local tier in front of the shared cache, if it's enabled.
+        """
+        size = options.get(LOCAL_CACHE_SIZE_OPTION)
+        if size <= 0:
+            self._local = None
+            return None
+
+        ttl = options.get(LOCAL_CACHE_TTL_OPTION)
+        if self._local is None or self._local.size != size or self._local.ttl != ttl:
+            self._local = LocalIndexerCache(size, ttl)
+        return self._local
+
+    def _get_refresh_written_before(self) -> int:
+        """
+        Hot keys which were written to the shared cache before this timestamp are refreshed
+        ahead of their expiry.
+        """
+        lifetime = min(
+            settings.SENTRY_METRICS_INDEXER_CACHE_TTL, _CACHE_ENTRY_MAX_AGE.total_seconds()
+        )
+        return int(datetime.utcnow().timestamp() - lifetime * REFRESH_AHEAD_FRACTION)
+
+    def take_refresh_candidates(self, namespace: str) -> set[str]:
+        """
+        Returns the keys which are read often and should be refreshed before they expire.
+        """
+        if self._local is None:
+            return set()
+        return self._local.take_refresh_candidates(namespace)
 
     def _validate_result(self, result: str | None) -> int | None:
         if result is None:
@@ -140,6 +196,9 @@ class StringIndexerCache:
         return self.cache.get(self._make_cache_key(key), version=self.version)
 
     def set(self, namespace: str, key: str, value: int) -> None:
+        local = self._get_local_cache()
+        if local is not None:
+            local.set_many(namespace, {key: value}, {key: int(datetime.utcnow().timestamp())})
         self.cache.set(
             key=self._make_cache_key(key),
             value=value,
@@ -156,26 +215,72 @@ class StringIndexerCache:
             )
 
     def get_many(self, namespace: str, keys: Iterable[str]) -> MutableMapping[str, int | None]:
+        local = self._get_local_cache()
+        if local is None:
+            return self._get_many_shared(namespace, keys)[0]
+
+        keys = list(keys)
+        local_results = local.get_many(
+            namespace,
+            keys,
+            written_before=self._get_refresh_written_before(),
+            refresh_min_hits=options.get(REFRESH_AHEAD_MIN_HITS_OPTION),
+        )
+        _record_tier_metrics("local", len(local_results), len(keys) - len(local_results))
+
+        shared_keys = [key for key in keys if key not in local_results]
+        if not shared_keys:
+            return dict(local_results)
+
+        shared_results, written_at = self._get_many_shared(namespace, shared_keys)
+        shared_hits = {k: v for k, v in shared_results.items() if v is not None}
+        _record_tier_metrics("shared", len(shared_hits), len(shared_keys) - len(shared_hits))
+        local.set_many(namespace, shared_hits, written_at)
+
+        results: MutableMapping[str, int | None] = dict(local_results)
+        results.update(shared_results)
+        return results
+
+    def _get_many_shared(
+        self, namespace: str, keys: Iterable[str]
+    ) -> tuple[MutableMapping[str, int | None], Mapping[str, int]]:
+        """
+        Fetch keys from the shared cache. Returns the results, and the time the keys were
+        written where it is known.
+        """
         if options.get(NAMESPACED_READ_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_READ_METRIC)
             cache_keys = {self._make_namespaced_cache_key(namespace, key): key for key in keys}
+            raw_results = self.cache.get_many(cache_keys.keys(), version=self.version)
             namespaced_results: MutableMapping[str, int | None] = {
-                k: self._validate_result(v)
-                for k, v in self.cache.get_many(cache_keys.keys(), version=self.version).items()
+                k: self._validate_result(v) for k, v in raw_results.items()
+            }
+            written_at = {
+                cache_keys[k]: int(raw_results[k].split(":")[1])
+                for k, v in namespaced_results.items()
+                if v is not None
             }
-            return self._format_namespaced_results(
-                namespace,
-                keys,
-                namespaced_results,
+            return (
+                self._format_namespaced_results(
+                    namespace,
+                    keys,
+                    namespaced_results,
+                ),
+                written_at,
             )
         else:
             cache_keys = {self._make_cache_key(key): key for key in keys}
             results: Mapping[str, int | None] = self.cache.get_many(
                 cache_keys.keys(), version=self.version
             )
-            return self._format_results(keys, results)
+            return self._format_results(keys, results), {}
 
     def set_many(self, namespace: str, key_values: Mapping[str, int]) -> None:
+        local = self._get_local_cache()
+        if local is not None:
+            local.set_many(
+                namespace, key_values, dict.fromkeys(key_values, int(datetime.utcnow().timestamp()))
+            )
         cache_key_values = {self._make_cache_key(k): v for k, v in key_values.items()}
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
@@ -190,12 +295,16 @@ class StringIndexerCache:
             )
 
     def delete(self, namespace: str, key: str) -> None:
+        if self._local is not None:
+            self._local.delete_many(namespace, [key])
         self.cache.delete(self._make_cache_key(key), version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
             self.cache.delete(self._make_namespaced_cache_key(namespace, key), version=self.version)
 
     def delete_many(self, namespace: str, keys: Sequence[str]) -> None:
+        if self._local is not None:
+            self._local.delete_many(namespace, keys)
         self.cache.delete_many([self._make_cache_key(key) for key in keys], version=self.version)
         if options.get(NAMESPACED_WRITE_FEAT_FLAG):
             metrics.incr(_INDEXER_CACHE_DOUBLE_WRITE_METRIC)
@@ -209,6 +318,91 @@ class CachingIndexer(StringIndexer):
     def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
         self.cache = cache
         self.indexer = indexer
+        self._rate_limited: RateLimitedStrings | None = None
+        self._refresh_executor: ThreadPoolExecutor | None = None
+        self._refresh_executor_pid: int | None = None
+
+    def _get_rate_limited_strings(self) -> RateLimitedStrings | None:
+        """
+        Strings which were recently rate limited, if negative caching is enabled.
+        """
+        window = options.get(RATE_LIMITED_WINDOW_OPTION)
+        if window <= 0:
+            self._rate_limited = None
+            return None
+        if self._rate_limited is None or self._rate_limited.window != window:
+            self._rate_limited = RateLimitedStrings(window)
+        return self._rate_limited
+
+    def _filter_rate_limited(
+        self,
+        rate_limited: RateLimitedStrings,
+        keys: UseCaseKeyCollection,
+        results: UseCaseKeyResults,
+    ) -> UseCaseKeyCollection:
+        """
+        Adds recently rate limited keys to the results as rate limited again, and returns the
+        remaining keys.
+        """
+        remaining: MutableMapping[UseCaseID, MutableMapping[OrgId, set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        hits = 0
+        for use_case_id, org_id, string in keys.as_tuples():
+            fetch_type_ext = rate_limited.get(f"{use_case_id.value}:{org_id}:{string}")
+            if fetch_type_ext is None:
+                remaining[use_case_id][org_id].add(string)
+                continue
+            hits += 1
+            results.add_use_case_key_result(
+                UseCaseKeyResult(use_case_id, org_id, string, None),
+                FetchType.RATE_LIMITED,
+                fetch_type_ext,
+            )
+        _record_tier_metrics("rate_limited", hits, keys.size - hits)
+        return UseCaseKeyCollection(remaining)
+
+    def _record_rate_limited(
+        self, rate_limited: RateLimitedStrings, results: UseCaseKeyResults
+    ) -> None:
+        for use_case_id, org_metadata in results.get_fetch_metadata().items():
+            for org_id, string_metadata in org_metadata.items():
+                for string, metadata in string_metadata.items():
+                    if metadata.fetch_type == FetchType.RATE_LIMITED:
+                        rate_limited.add(
+                            f"{use_case_id.value}:{org_id}:{string}", metadata.fetch_type_ext
+                        )
+
+    def _schedule_refresh(self) -> None:
+        """
+        Reload hot keys from the indexer in the background before they expire from the cache.
+        """
+        keys = self.cache.take_refresh_candidates(BULK_RECORD_CACHE_NAMESPACE)
+        if not keys:
+            return
+        # The executor's thread doesn't survive a fork
+        if self._refresh_executor is None or self._refresh_executor_pid != os.getpid():
+            self._refresh_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="indexer-refresh-ahead"
+            )
+            self._refresh_executor_pid = os.getpid()
+        self._refresh_executor.submit(self._refresh, keys)
+
+    def _refresh(self, keys: Collection[str]) -> None:
+        strings: MutableMapping[UseCaseID, MutableMapping[OrgId, set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        for key in keys:
+            use_case_id, org_id, string = key.split(":", 2)
+            strings[UseCaseID(use_case_id)][int(org_id)].add(string)
+
+        try:
+            results = self.indexer.bulk_record(strings)
+            self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, results.get_mapped_strings_to_ints())
+        except Exception:
+            logger.exception("sentry_metrics.indexer.refresh_ahead_failed")
+            return
+        metrics.incr(_INDEXER_CACHE_REFRESH_AHEAD_METRIC, amount=len(keys))
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -244,8 +438,16 @@ class CachingIndexer(StringIndexer):
             FetchType.CACHE_HIT,
         )
 
+        self._schedule_refresh()
+
         db_record_keys = cache_key_results.get_unmapped_use_case_keys(cache_keys)
 
+        rate_limited = self._get_rate_limited_strings()
+        if rate_limited is not None and db_record_keys.size > 0:
+            db_record_keys = self._filter_rate_limited(
+                rate_limited, db_record_keys, cache_key_results
+            )
+
         if db_record_keys.size == 0:
             return cache_key_results
 
@@ -259,6 +461,8 @@ class CachingIndexer(StringIndexer):
         self.cache.set_many(
             BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
         )
+        if rate_limited is not None:
+            self._record_rate_limited(rate_limited, db_record_key_results)
 
         return cache_key_results.merge(db_record_key_results)
 
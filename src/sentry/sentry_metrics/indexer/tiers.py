@@ -0,0 +1,185 @@
+"""
+Process-local tiers in front of the shared indexer cache.
+
+`LocalIndexerCache` is a small LRU of recently used keys, which also keeps
+track of how often every key is read and when it was last written to the
+shared cache. Keys which are read often and whose shared cache entry is about
+to expire are handed out as refresh candidates, so that they can be loaded
+from the database in the background instead of all at once after they expired.
+
+`RateLimitedStrings` remembers strings which the writes limiter rejected
+recently in a pair of rotating bloom filters, so that they can be rejected
+again without a database round trip. Bloom filters can have false positives,
+so a string which was never rate limited can occasionally be treated as if it
+was until the filter rotates.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import math
+import threading
+import time
+from collections.abc import Iterable, Mapping
+
+from cachetools import LRUCache
+
+from sentry.sentry_metrics.indexer.base import FetchTypeExt
+
+
+@dataclasses.dataclass
+class LocalCacheEntry:
+    value: int
+    expires_at: float
+    # Unix timestamp of the last write to the shared cache, if known
+    written_at: int | None
+    hits: int = 0
+    refreshing: bool = False
+
+
+class LocalIndexerCache:
+    def __init__(self, size: int, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: LRUCache[str, LocalCacheEntry] = LRUCache(maxsize=size)
+        self._refresh_candidates: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return int(self._entries.maxsize)
+
+    def get_many(
+        self,
+        namespace: str,
+        keys: Iterable[str],
+        written_before: int | None = None,
+        refresh_min_hits: int = 0,
+    ) -> dict[str, int]:
+        """
+        Returns the values of all keys which are cached and not expired. Keys which have been
+        read at least `refresh_min_hits` times and were written to the shared cache before
+        `written_before` are added to the refresh candidates.
+        """
+        now = time.monotonic()
+        results = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(f"{namespace}:{key}")
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    del self._entries[f"{namespace}:{key}"]
+                    continue
+                entry.hits += 1
+                results[key] = entry.value
+                if (
+                    written_before is not None
+                    and refresh_min_hits > 0
+                    and not entry.refreshing
+                    and entry.hits >= refresh_min_hits
+                    and entry.written_at is not None
+                    and entry.written_at <= written_before
+                ):
+                    entry.refreshing = True
+                    self._refresh_candidates.setdefault(namespace, set()).add(key)
+        return results
+
+    def set_many(
+        self, namespace: str, key_values: Mapping[str, int], written_at: Mapping[str, int]
+    ) -> None:
+        """
+        Cache the given values. `written_at` has the time the keys were last written to the
+        shared cache, for those where it is known.
+        """
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in key_values.items():
+                self._entries[f"{namespace}:{key}"] = LocalCacheEntry(
+                    value=value, expires_at=expires_at, written_at=written_at.get(key)
+                )
+
+    def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(f"{namespace}:{key}", None)
+
+    def take_refresh_candidates(self, namespace: str) -> set[str]:
+        with self._lock:
+            return self._refresh_candidates.pop(namespace, set())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._refresh_candidates.clear()
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.num_bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.num_hashes = max(round(self.num_bits / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+
+class RateLimitedStrings:
+    """
+    Strings which were rate limited in the last one or two `window`s, separately for global
+    and per-org quotas.
+    """
+
+    def __init__(self, window: float, capacity: int = 100_000, error_rate: float = 0.001) -> None:
+        self.window = window
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._rotated_at = time.monotonic()
+        self._current = self._new_generation()
+        self._previous = self._new_generation()
+
+    def _new_generation(self) -> dict[bool, BloomFilter]:
+        return {
+            is_global: BloomFilter(self.capacity, self.error_rate) for is_global in (True, False)
+        }
+
+    def _maybe_rotate(self) -> None:
+        now = time.monotonic()
+        if now - self._rotated_at < self.window:
+            return
+        if now - self._rotated_at >= 2 * self.window:
+            self._previous = self._new_generation()
+        else:
+            self._previous = self._current
+        self._current = self._new_generation()
+        self._rotated_at = now
+
+    def add(self, key: str, fetch_type_ext: FetchTypeExt | None) -> None:
+        is_global = bool(fetch_type_ext and fetch_type_ext.is_global)
+        with self._lock:
+            self._maybe_rotate()
+            self._current[is_global].add(key)
+
+    def get(self, key: str) -> FetchTypeExt | None:
+        """
+        Returns how the string was rate limited, or `None` if it wasn't.
+        """
+        with self._lock:
+            self._maybe_rotate()
+            for is_global in (True, False):
+                if key in self._current[is_global] or key in self._previous[is_global]:
+                    return FetchTypeExt(is_global=is_global)
+        return None
@@ -45,7 +45,9 @@ the sets.
 
 This happens in two steps: Get the to-be-flushed segments in `flush_segments`,
 then the consumer produces them, then they are deleted from Redis
-(`done_flush_segments`)
+(`done_flush_segments`). With streaming flushes, `iter_flush_segments` replaces
+the first step and pages through the segments' sets instead of loading them all
+at once, so that the consumer can produce segments as they are read.
 
 On top of this, the global queue is sharded by partition, meaning that each
 consumer reads and writes to shards that correspond to its own assigned
@@ -64,7 +66,7 @@ Glossary for types of keys:
 from __future__ import annotations
 
 import itertools
-from collections.abc import MutableMapping, Sequence
+from collections.abc import Iterable, Iterator, MutableMapping, Sequence
 from typing import Any, NamedTuple
 
 import rapidjson
@@ -74,6 +76,11 @@ from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry.utils import metrics, redis
 
+# How many segments `SpansBuffer.iter_flush_segments` reads at once, and the
+# COUNT hint passed to SSCAN when reading them.
+FLUSH_SCAN_SEGMENTS = 100
+SSCAN_COUNT = 1000
+
 # SegmentKey is an internal identifier used by the redis buffer that is also
 # directly used as raw redis key. the format is
 # "span-buf:s:{project_id:trace_id}:span_id", and the type is bytes because our
@@ -103,6 +110,7 @@ def get_redis_client() -> RedisCluster[bytes] | StrictRedis[bytes]:
 
 
 add_buffer_script = redis.load_redis_script("spans/add-buffer.lua")
+add_buffer_batch_script = redis.load_redis_script("spans/add-buffer-batch.lua")
 
 
 # NamedTuples are faster to construct than dataclasses
@@ -133,6 +141,16 @@ class FlushedSegment(NamedTuple):
     queue_key: QueueKey
     spans: list[OutputSpan]
 
+    def without_payloads(self) -> FlushedSegment:
+        """
+        Returns a copy that only keeps what `done_flush_segments` needs: the
+        queue key and the span IDs.
+        """
+        return FlushedSegment(
+            queue_key=self.queue_key,
+            spans=[OutputSpan(payload={"span_id": span.payload["span_id"]}) for span in self.spans],
+        )
+
 
 class SpansBuffer:
     def __init__(
@@ -141,12 +159,23 @@ class SpansBuffer:
         span_buffer_timeout_secs: int = 60,
         span_buffer_root_timeout_secs: int = 10,
         redis_ttl: int = 3600,
+        batched_ingestion: bool = False,
     ):
         self.assigned_shards = list(assigned_shards)
         self.span_buffer_timeout_secs = span_buffer_timeout_secs
         self.span_buffer_root_timeout_secs = span_buffer_root_timeout_secs
         self.redis_ttl = redis_ttl
+        # If set, all subsegments of a trace are added with a single call to
+        # `add-buffer-batch.lua` instead of a SADD per subsegment and a call to
+        # `add-buffer.lua` per span.
+        self.batched_ingestion = batched_ingestion
         self.add_buffer_sha: str | None = None
+        self.add_buffer_batch_sha: str | None = None
+        # Shard of `assigned_shards` whose queue is read first by the next flush
+        self._first_shard = 0
+        # Per queue, a segment too large to be read along with others, which
+        # the next streaming flush reads on its own
+        self._oversized_segments: dict[QueueKey, SegmentKey] = {}
 
     @cached_property
     def client(self) -> RedisCluster[bytes] | StrictRedis[bytes]:
@@ -161,6 +190,7 @@ class SpansBuffer:
                 self.span_buffer_timeout_secs,
                 self.span_buffer_root_timeout_secs,
                 self.redis_ttl,
+                self.batched_ingestion,
             ),
         )
 
@@ -180,40 +210,24 @@ class SpansBuffer:
         with metrics.timer("spans.buffer.process_spans.push_payloads"):
             trees = self._group_by_parent(spans)
 
-            with self.client.pipeline(transaction=False) as p:
-                for (project_and_trace, parent_span_id), subsegment in trees.items():
-                    set_key = f"span-buf:s:{{{project_and_trace}}}:{parent_span_id}"
-                    p.sadd(set_key, *[span.payload for span in subsegment])
+            if not self.batched_ingestion:
+                with self.client.pipeline(transaction=False) as p:
+                    for (project_and_trace, parent_span_id), subsegment in trees.items():
+                        set_key = f"span-buf:s:{{{project_and_trace}}}:{parent_span_id}"
+                        p.sadd(set_key, *[span.payload for span in subsegment])
 
-                p.execute()
+                    p.execute()
 
         with metrics.timer("spans.buffer.process_spans.insert_spans"):
-            # Workaround to make `evalsha` work in pipelines. We load ensure the
-            # script is loaded just before calling it below. This calls `SCRIPT
-            # EXISTS` once per batch.
-            add_buffer_sha = self._ensure_script()
-
-            with self.client.pipeline(transaction=False) as p:
-                for (project_and_trace, parent_span_id), subsegment in trees.items():
-                    for span in subsegment:
-                        p.execute_command(
-                            "EVALSHA",
-                            add_buffer_sha,
-                            1,
-                            project_and_trace,
-                            "true" if span.is_segment_span else "false",
-                            span.span_id,
-                            parent_span_id,
-                            self.redis_ttl,
-                        )
+            if self.batched_ingestion:
+                ordered_spans, results = self._insert_spans_batched(trees)
+            else:
+                ordered_spans, results = self._insert_spans(trees)
 
-                        is_root_span_count += int(span.is_segment_span)
-                        shard = self.assigned_shards[
-                            int(span.trace_id, 16) % len(self.assigned_shards)
-                        ]
-                        queue_keys.append(self._get_queue_key(shard))
-
-                results = p.execute()
+            for span in ordered_spans:
+                is_root_span_count += int(span.is_segment_span)
+                shard = self.assigned_shards[int(span.trace_id, 16) % len(self.assigned_shards)]
+                queue_keys.append(self._get_queue_key(shard))
 
         with metrics.timer("spans.buffer.process_spans.update_queue"):
             queue_deletes: dict[bytes, set[bytes]] = {}
@@ -265,6 +279,71 @@ class SpansBuffer:
         metrics.gauge("spans.buffer.min_redirect_depth", min_redirect_depth)
         metrics.gauge("spans.buffer.max_redirect_depth", max_redirect_depth)
 
+    def _insert_spans(
+        self, trees: dict[tuple[str, str], list[Span]]
+    ) -> tuple[list[Span], list[Any]]:
+        # Workaround to make `evalsha` work in pipelines. We load ensure the
+        # script is loaded just before calling it below. This calls `SCRIPT
+        # EXISTS` once per batch.
+        add_buffer_sha = self._ensure_script()
+
+        ordered_spans = []
+        with self.client.pipeline(transaction=False) as p:
+            for (project_and_trace, parent_span_id), subsegment in trees.items():
+                for span in subsegment:
+                    p.execute_command(
+                        "EVALSHA",
+                        add_buffer_sha,
+                        1,
+                        project_and_trace,
+                        "true" if span.is_segment_span else "false",
+                        span.span_id,
+                        parent_span_id,
+                        self.redis_ttl,
+                    )
+                    ordered_spans.append(span)
+
+            results = p.execute()
+
+        return ordered_spans, results
+
+    def _insert_spans_batched(
+        self, trees: dict[tuple[str, str], list[Span]]
+    ) -> tuple[list[Span], list[Any]]:
+        """
+        Like `_insert_spans`, but with one script call per trace, which also
+        adds the payloads. The returned results are in the same format, one
+        per span.
+
+        The queue is updated separately, as its keys live on other hash slots
+        than the ones of the trace.
+        """
+        add_buffer_batch_sha = self._ensure_batch_script()
+
+        trace_args: dict[str, list[Any]] = {}
+        trace_spans: dict[str, list[Span]] = {}
+        for (project_and_trace, parent_span_id), subsegment in trees.items():
+            args = trace_args.setdefault(project_and_trace, [self.redis_ttl])
+            args.append(parent_span_id)
+            args.append(len(subsegment))
+            for span in subsegment:
+                args.append("true" if span.is_segment_span else "false")
+                args.append(span.span_id)
+                args.append(span.payload)
+            trace_spans.setdefault(project_and_trace, []).extend(subsegment)
+
+        with self.client.pipeline(transaction=False) as p:
+            for project_and_trace, args in trace_args.items():
+                p.execute_command("EVALSHA", add_buffer_batch_sha, 1, project_and_trace, *args)
+
+            trace_results = p.execute()
+
+        metrics.distribution("spans.buffer.process_spans.num_script_calls", len(trace_results))
+
+        ordered_spans = list(itertools.chain.from_iterable(trace_spans.values()))
+        results = list(itertools.chain.from_iterable(trace_results))
+        return ordered_spans, results
+
     def _ensure_script(self):
         if self.add_buffer_sha is not None:
             if self.client.script_exists(self.add_buffer_sha)[0]:
@@ -273,6 +352,14 @@ class SpansBuffer:
         self.add_buffer_sha = self.client.script_load(add_buffer_script.script)
         return self.add_buffer_sha
 
+    def _ensure_batch_script(self):
+        if self.add_buffer_batch_sha is not None:
+            if self.client.script_exists(self.add_buffer_batch_sha)[0]:
+                return self.add_buffer_batch_sha
+
+        self.add_buffer_batch_sha = self.client.script_load(add_buffer_batch_script.script)
+        return self.add_buffer_batch_sha
+
     def _get_queue_key(self, shard: int) -> bytes:
         return f"span-buf:q:{shard}".encode("ascii")
 
@@ -306,14 +393,22 @@ class SpansBuffer:
 
         return trees
 
-    def flush_segments(self, now: int, max_segments: int = 0) -> dict[SegmentKey, FlushedSegment]:
+    def _load_segment_keys(
+        self, now: int, max_segments: int = 0
+    ) -> list[tuple[QueueKey, SegmentKey]]:
         cutoff = now
 
         queue_keys = []
 
+        # Start with a different shard on every flush, so that limits on how much
+        # is flushed at once don't always favour the first shard
+        first_shard = self._first_shard % len(self.assigned_shards) if self.assigned_shards else 0
+        shards = self.assigned_shards[first_shard:] + self.assigned_shards[:first_shard]
+        self._first_shard = first_shard + 1
+
         with metrics.timer("spans.buffer.flush_segments.load_segment_ids"):
             with self.client.pipeline(transaction=False) as p:
-                for shard in self.assigned_shards:
+                for shard in shards:
                     key = self._get_queue_key(shard)
                     p.zrangebyscore(
                         key, 0, cutoff, start=0 if max_segments else None, num=max_segments or None
@@ -326,67 +421,85 @@ class SpansBuffer:
         segment_keys: list[tuple[QueueKey, SegmentKey]] = []
         queue_sizes = []
 
-        with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
-            with self.client.pipeline(transaction=False) as p:
-                # ZRANGEBYSCORE output
-                for queue_key, segment_span_ids in zip(queue_keys, result):
-                    # process return value of zrevrangebyscore
-                    for segment_key in segment_span_ids:
-                        segment_keys.append((queue_key, segment_key))
-                        p.smembers(segment_key)
+        # ZRANGEBYSCORE output
+        for queue_key, segment_span_ids in zip(queue_keys, result):
+            # process return value of zrevrangebyscore
+            for segment_key in segment_span_ids:
+                segment_keys.append((queue_key, segment_key))
 
-                    # ZCARD output
-                    queue_sizes.append(next(result))
-
-                segments = p.execute()
+            # ZCARD output
+            queue_sizes.append(next(result))
 
-        for shard_i, queue_size in zip(self.assigned_shards, queue_sizes):
+        for shard_i, queue_size in zip(shards, queue_sizes):
             metrics.timing(
                 "spans.buffer.flush_segments.queue_size",
                 queue_size,
                 tags={"shard_i": shard_i},
             )
 
+        return segment_keys
+
+    def _build_flushed_segment(
+        self, queue_key: QueueKey, segment_key: SegmentKey, segment: Iterable[bytes]
+    ) -> tuple[FlushedSegment, bool]:
+        segment_span_id = _segment_key_to_span_id(segment_key).decode("ascii")
+
+        output_spans = []
+        has_root_span = False
+        segment_bytes = 0
+        for payload in segment:
+            segment_bytes += len(payload)
+            val = rapidjson.loads(payload)
+            old_segment_id = val.get("segment_id")
+            outcome = "same" if old_segment_id == segment_span_id else "different"
+
+            is_segment = val["is_segment"] = segment_span_id == val["span_id"]
+            if is_segment:
+                has_root_span = True
+
+            val_data = val.setdefault("data", {})
+            if isinstance(val_data, dict):
+                val_data["__sentry_internal_span_buffer_outcome"] = outcome
+
+                if old_segment_id:
+                    val_data["__sentry_internal_old_segment_id"] = old_segment_id
+
+            val["segment_id"] = segment_span_id
+
+            metrics.incr(
+                "spans.buffer.flush_segments.is_same_segment",
+                tags={
+                    "outcome": outcome,
+                    "is_segment_span": is_segment,
+                    "old_segment_is_null": "true" if old_segment_id is None else "false",
+                },
+            )
+
+            output_spans.append(OutputSpan(payload=val))
+
+        metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", len(output_spans))
+        metrics.timing("spans.buffer.flush_segments.segment_bytes", segment_bytes)
+        return FlushedSegment(queue_key=queue_key, spans=output_spans), has_root_span
+
+    def flush_segments(self, now: int, max_segments: int = 0) -> dict[SegmentKey, FlushedSegment]:
+        segment_keys = self._load_segment_keys(now, max_segments)
+
+        with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
+            with self.client.pipeline(transaction=False) as p:
+                for _, segment_key in segment_keys:
+                    p.smembers(segment_key)
+
+                segments = p.execute()
+
         return_segments = {}
 
         num_has_root_spans = 0
 
         for (queue_key, segment_key), segment in zip(segment_keys, segments):
-            segment_span_id = _segment_key_to_span_id(segment_key).decode("ascii")
-
-            output_spans = []
-            has_root_span = False
-            metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", len(segment))
-            for payload in segment:
-                val = rapidjson.loads(payload)
-                old_segment_id = val.get("segment_id")
-                outcome = "same" if old_segment_id == segment_span_id else "different"
-
-                is_segment = val["is_segment"] = segment_span_id == val["span_id"]
-                if is_segment:
-                    has_root_span = True
-
-                val_data = val.setdefault("data", {})
-                if isinstance(val_data, dict):
-                    val_data["__sentry_internal_span_buffer_outcome"] = outcome
-
-                    if old_segment_id:
-                        val_data["__sentry_internal_old_segment_id"] = old_segment_id
-
-                val["segment_id"] = segment_span_id
-
-                metrics.incr(
-                    "spans.buffer.flush_segments.is_same_segment",
-                    tags={
-                        "outcome": outcome,
-                        "is_segment_span": is_segment,
-                        "old_segment_is_null": "true" if old_segment_id is None else "false",
-                    },
-                )
-
-                output_spans.append(OutputSpan(payload=val))
-
-            return_segments[segment_key] = FlushedSegment(queue_key=queue_key, spans=output_spans)
+            flushed_segment, has_root_span = self._build_flushed_segment(
+                queue_key, segment_key, segment
+            )
+            return_segments[segment_key] = flushed_segment
             num_has_root_spans += int(has_root_span)
 
         metrics.timing("spans.buffer.flush_segments.num_segments", len(return_segments))
@@ -394,6 +507,110 @@ class SpansBuffer:
 
         return return_segments
 
+    def iter_flush_segments(
+        self, now: int, max_segments: int = 0, max_bytes: int = 0, max_segment_bytes: int = 0
+    ) -> Iterator[tuple[SegmentKey, FlushedSegment]]:
+        """
+        Like `flush_segments`, but yields segments one by one as they are
+        loaded, so that the caller can produce them while the next ones are
+        being read.
+
+        Segments are read with SSCAN, `FLUSH_SCAN_SEGMENTS` at a time. No more
+        segments are read once `max_bytes` of payloads have been yielded, the
+        remaining ones stay in the queue for the next flush. Segments larger
+        than `max_segment_bytes` are skipped and stay in the queue, and the
+        next flush reads them on their own before any other segment, one per
+        queue. Both limits are disabled if 0.
+        """
+        segment_keys = self._load_segment_keys(now, max_segments)
+
+        due = set(segment_keys)
+        oversized = [item for item in self._oversized_segments.items() if item in due]
+        oversized_keys = {segment_key for _, segment_key in oversized}
+        self._oversized_segments.clear()
+
+        # Oversized segments are read in full, all others up to `max_segment_bytes`
+        batches: list[tuple[Sequence[tuple[QueueKey, SegmentKey]], int]] = [
+            ([item], 0) for item in oversized
+        ]
+        batches.extend(
+            (batch, max_segment_bytes)
+            for batch in itertools.batched(
+                [item for item in segment_keys if item[1] not in oversized_keys],
+                FLUSH_SCAN_SEGMENTS,
+            )
+        )
+
+        flushed_bytes = 0
+        num_segments = 0
+        num_has_root_spans = 0
+
+        for batch, batch_max_segment_bytes in batches:
+            if max_bytes and flushed_bytes >= max_bytes:
+                metrics.incr("spans.buffer.flush_segments.max_bytes_exceeded")
+                break
+
+            with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
+                payloads, sizes = self._scan_segments(
+                    [segment_key for _, segment_key in batch], batch_max_segment_bytes
+                )
+
+            for queue_key, segment_key in batch:
+                size = sizes[segment_key]
+                if batch_max_segment_bytes and size > batch_max_segment_bytes:
+                    metrics.incr("spans.buffer.flush_segments.segment_size_exceeded")
+                    self._oversized_segments.setdefault(queue_key, segment_key)
+                    continue
+
+                flushed_segment, has_root_span = self._build_flushed_segment(
+                    queue_key, segment_key, payloads.pop(segment_key)
+                )
+                flushed_bytes += size
+                num_segments += 1
+                num_has_root_spans += int(has_root_span)
+                yield segment_key, flushed_segment
+
+        metrics.timing("spans.buffer.flush_segments.num_segments", num_segments)
+        metrics.timing("spans.buffer.flush_segments.has_root_span", num_has_root_spans)
+        metrics.timing("spans.buffer.flush_segments.flushed_bytes", flushed_bytes)
+
+    def _scan_segments(
+        self, segment_keys: Sequence[SegmentKey], max_segment_bytes: int
+    ) -> tuple[dict[SegmentKey, set[bytes]], dict[SegmentKey, int]]:
+        """
+        Reads the payloads of the given segments with SSCAN, one page of every
+        segment per pipeline. Segments are no longer read once they exceed
+        `max_segment_bytes`.
+        """
+        payloads: dict[SegmentKey, set[bytes]] = {key: set() for key in segment_keys}
+        sizes = dict.fromkeys(segment_keys, 0)
+        cursors = dict.fromkeys(segment_keys, 0)
+
+        while cursors:
+            with self.client.pipeline(transaction=False) as p:
+                for segment_key, cursor in cursors.items():
+                    p.sscan(segment_key, cursor, count=SSCAN_COUNT)
+
+                results = p.execute()
+
+            next_cursors = {}
+            for (segment_key, _), (cursor, values) in zip(cursors.items(), results):
+                segment_payloads = payloads[segment_key]
+                for payload in values:
+                    # SSCAN may return an element more than once
+                    if payload not in segment_payloads:
+                        segment_payloads.add(payload)
+                        sizes[segment_key] += len(payload)
+
+                if max_segment_bytes and sizes[segment_key] > max_segment_bytes:
+                    segment_payloads.clear()
+                elif cursor != 0:
+                    next_cursors[segment_key] = cursor
+
+            cursors = next_cursors
+
+        return payloads, sizes
+
     def done_flush_segments(self, segment_keys: dict[SegmentKey, FlushedSegment]):
         metrics.timing("spans.buffer.done_flush_segments.num_segments", len(segment_keys))
         with metrics.timer("spans.buffer.done_flush_segments"):
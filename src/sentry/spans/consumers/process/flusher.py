@@ -9,8 +9,9 @@ from arroyo.backends.kafka import KafkaPayload, KafkaProducer, build_kafka_confi
 from arroyo.processing.strategies.abstract import ProcessingStrategy
 from arroyo.types import FilteredPayload, Message
 
+from sentry import options
 from sentry.conf.types.kafka_definition import Topic
-from sentry.spans.buffer import SpansBuffer
+from sentry.spans.buffer import FlushedSegment, SpansBuffer
 from sentry.utils import metrics
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
 
@@ -98,30 +99,48 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
                 def produce(payload: KafkaPayload) -> None:
                     producer_futures.append(producer.produce(topic, payload))
 
-            while not stopped.value:
-                now = int(time.time()) + current_drift.value
-                flushed_segments = buffer.flush_segments(max_segments=max_flush_segments, now=now)
+            def produce_segment(flushed_segment: FlushedSegment) -> None:
+                if not flushed_segment.spans:
+                    # This is a bug, most likely the input topic is not
+                    # partitioned by trace_id so multiple consumers are writing
+                    # over each other. The consequence is duplicated segments,
+                    # worst-case.
+                    metrics.incr("sentry.spans.buffer.empty_segments")
+                    return
 
-                if not flushed_segments:
-                    time.sleep(1)
-                    continue
+                spans = [span.payload for span in flushed_segment.spans]
+
+                kafka_payload = KafkaPayload(
+                    None, rapidjson.dumps({"spans": spans}).encode("utf8"), []
+                )
 
-                for _, flushed_segment in flushed_segments.items():
-                    if not flushed_segment.spans:
-                        # This is a bug, most likely the input topic is not
-                        # partitioned by trace_id so multiple consumers are writing
-                        # over each other. The consequence is duplicated segments,
-                        # worst-case.
-                        metrics.incr("sentry.spans.buffer.empty_segments")
-                        continue
+                produce(kafka_payload)
 
-                    spans = [span.payload for span in flushed_segment.spans]
+            while not stopped.value:
+                now = int(time.time()) + current_drift.value
 
-                    kafka_payload = KafkaPayload(
-                        None, rapidjson.dumps({"spans": spans}).encode("utf8"), []
+                if options.get("standalone-spans.buffer-streaming-flush.enable"):
+                    flushed_segments = {}
+                    for segment_key, flushed_segment in buffer.iter_flush_segments(
+                        now=now,
+                        max_segments=max_flush_segments,
+                        max_bytes=options.get("standalone-spans.buffer-flush-max-bytes"),
+                        max_segment_bytes=options.get("standalone-spans.buffer-max-segment-bytes"),
+                    ):
+                        produce_segment(flushed_segment)
+                        # Payloads are no longer needed once produced, don't hold on to them
+                        # until the end of the flush
+                        flushed_segments[segment_key] = flushed_segment.without_payloads()
+                else:
+                    flushed_segments = buffer.flush_segments(
+                        max_segments=max_flush_segments, now=now
                     )
+                    for flushed_segment in flushed_segments.values():
+                        produce_segment(flushed_segment)
 
-                    produce(kafka_payload)
+                if not flushed_segments:
+                    time.sleep(1)
+                    continue
 
                 for future in producer_futures:
                     future.result()
@@ -41,6 +41,7 @@ from sentry.snuba.dataset import Dataset
 from sentry.snuba.referrer import Referrer
 from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT, TagKeyStatus, TagStorage
 from sentry.tagstore.exceptions import GroupTagKeyNotFound, TagKeyNotFound
+from sentry.tagstore.snuba.cache import StaleWhileRevalidateCache
 from sentry.tagstore.types import GroupTagKey, GroupTagValue, TagKey, TagValue
 from sentry.utils import metrics, snuba
 from sentry.utils.hashlib import md5_text
@@ -314,26 +315,39 @@ class SnubaTagStorage(TagStorage):
 
         should_cache = use_cache and group is None
         result = None
+        max_staleness = options.get("tagstore.stale-while-revalidate.max-staleness")
 
         cache_key = None
+        swr_cache = None
         if should_cache:
             filtering_strings = [f"{key}={value}" for key, value in filters.items()]
             filtering_strings.append(f"dataset={dataset.name}")
             cache_key = "tagstore.__get_tag_keys:{}".format(
                 md5_text(*filtering_strings).hexdigest()
             )
-            key_hash = hash(cache_key)
+            # Stable across processes, so that they all use the same time buckets
+            key_hash = int(md5_text(cache_key).hexdigest(), 16)
 
             # Needs to happen before creating the cache suffix otherwise rounding will cause different durations
             duration = (end - start).total_seconds()
             # Cause there's rounding to create this cache suffix, we want to update the query end so results match
             end = snuba.quantize_time(end, key_hash)
+            if max_staleness > 0:
+                swr_cache = StaleWhileRevalidateCache(
+                    "tag_keys",
+                    f"{cache_key}:{duration}:{sorted(kwargs.items())}",
+                    end,
+                    max_staleness,
+                )
             cache_key += f":{duration}@{end.isoformat()}"
 
             with sentry_sdk.start_span(
                 op="cache.get", name="sentry.tagstore.cache.__get_tag_keys_for_projects"
             ) as span:
-                result = cache.get(cache_key, None)
+                if swr_cache is not None:
+                    result, is_stale = swr_cache.get()
+                else:
+                    result = cache.get(cache_key, None)
 
                 span.set_data("cache.key", [cache_key])
 
@@ -345,25 +359,32 @@ class SnubaTagStorage(TagStorage):
                     span.set_data("cache.hit", False)
                     metrics.incr("testing.tagstore.cache_tag_key.miss")
 
+        query = {
+            "dataset": dataset,
+            "start": start,
+            "end": end,
+            "groupby": [self.key_column],
+            "conditions": [],
+            "filter_keys": filters,
+            "aggregations": aggregations,
+            "limit": limit,
+            "orderby": "-count",
+            "referrer": "tagstore.__get_tag_keys",
+            **kwargs,
+        }
+        if swr_cache is not None and result is not None and is_stale:
+            swr_cache.refresh(query)
+
         if result is None:
-            result = snuba.query(
-                dataset=dataset,
-                start=start,
-                end=end,
-                groupby=[self.key_column],
-                conditions=[],
-                filter_keys=filters,
-                aggregations=aggregations,
-                limit=limit,
-                orderby="-count",
-                referrer="tagstore.__get_tag_keys",
-                **kwargs,
-            )
+            result = snuba.query(**query)
             if should_cache:
                 with sentry_sdk.start_span(
                     op="cache.put", name="sentry.tagstore.cache.__get_tag_keys_for_projects"
                 ) as span:
-                    cache.set(cache_key, result, 300)
+                    if swr_cache is not None:
+                        swr_cache.set(result)
+                    else:
+                        cache.set(cache_key, result, 300)
                     span.set_data("cache.key", [cache_key])
                     span.set_data("cache.item_size", len(str(result)))
                     metrics.incr("testing.tagstore.cache_tag_key.len", amount=len(result))
@@ -1122,6 +1143,60 @@ class SnubaTagStorage(TagStorage):
     def get_snuba_column_name(self, key: str, dataset: Dataset):
         return snuba.get_snuba_column_name(key, dataset=dataset)
 
+    def _get_cached_tag_values(
+        self, snuba_query: dict[str, Any], column: str, value_query: str | None
+    ) -> dict[Any, Any] | None:
+        """
+        Returns the values of a tag from the stale-while-revalidate cache. The unfiltered list of
+        values is cached, and searches are answered from it if it is complete. Returns `None` if
+        the values have to be queried from Snuba instead.
+        """
+        max_staleness = options.get("tagstore.stale-while-revalidate.max-staleness")
+        start, end = snuba_query["start"], snuba_query["end"]
+        if max_staleness <= 0 or start is None or end is None:
+            return None
+        # LIKE wildcards and escapes can't be matched against cached values
+        if value_query and any(char in value_query for char in "%_\\"):
+            return None
+
+        conditions = [[column, "!=", ""]]
+        if snuba_query["dataset"] == Dataset.Events:
+            conditions.append(DEFAULT_TYPE_CONDITION)
+        filter_keys = {key: sorted(value) for key, value in snuba_query["filter_keys"].items()}
+        key = md5_text(
+            snuba_query["dataset"].name,
+            column,
+            snuba_query["orderby"],
+            *(f"{key}={value}" for key, value in filter_keys.items()),
+        ).hexdigest()
+        duration = (end - start).total_seconds()
+        end = snuba.quantize_time(end, int(key, 16))
+
+        unfiltered_query = {
+            **snuba_query,
+            "filter_keys": filter_keys,
+            "conditions": conditions,
+            "end": end,
+        }
+        swr_cache = StaleWhileRevalidateCache("tag_values", f"{key}:{duration}", end, max_staleness)
+        values, is_stale = swr_cache.get()
+        if values is None:
+            # Only fetch the unfiltered list of values when it's requested, as the first step of
+            # a search.
+            if value_query:
+                return None
+            values = snuba.query(**unfiltered_query)
+            swr_cache.set(values)
+        elif is_stale:
+            swr_cache.refresh(unfiltered_query)
+
+        if not value_query:
+            return values
+        if len(values) >= snuba_query["limit"]:
+            # The list was truncated, values matching the search might be missing from it
+            return None
+        return {value: data for value, data in values.items() if value_query in str(value)}
+
     def get_tag_value_paginator_for_projects(
         self,
         projects,
@@ -1222,6 +1297,9 @@ class SnubaTagStorage(TagStorage):
 
         conditions = []
         project_slugs = {}
+        # The column whose values are cached, if searches can be answered from them
+        cached_column = None
+        value_query = query
         # transaction status needs a special case so that the user interacts with the names and not codes
         transaction_status = snuba_key == "transaction_status"
         if include_transactions and transaction_status:
@@ -1269,6 +1347,9 @@ class SnubaTagStorage(TagStorage):
             elif snuba_name in BLACKLISTED_COLUMNS:
                 snuba_name = self.format_string.format(key)
 
+            if not is_user_alias and dataset != Dataset.Replays:
+                cached_column = snuba_name
+
             if query:
                 query = query.replace("\\", "\\\\")
                 conditions.append([snuba_name, "LIKE", f"%{query}%"])
@@ -1302,27 +1383,32 @@ class SnubaTagStorage(TagStorage):
             }
 
         else:
-            results = snuba.query(
-                dataset=dataset,
-                start=start,
-                end=end,
-                groupby=[snuba_key],
-                filter_keys=filters,
-                aggregations=[
+            snuba_query = {
+                "dataset": dataset,
+                "start": start,
+                "end": end,
+                "groupby": [snuba_key],
+                "filter_keys": filters,
+                "aggregations": [
                     ["count()", "", "times_seen"],
                     ["min", "timestamp", "first_seen"],
                     ["max", "timestamp", "last_seen"],
                 ],
-                conditions=conditions,
-                orderby=order_by,
+                "conditions": conditions,
+                "orderby": order_by,
                 # TODO: This means they can't actually paginate all TagValues.
-                limit=1000,
+                "limit": 1000,
                 # 1 mill chosen arbitrarily, based it on a query that was timing out, and took 8s once this was set
-                sample=1_000_000,
-                arrayjoin=snuba.get_arrayjoin(snuba_key),
-                referrer="tagstore.get_tag_value_paginator_for_projects",
-                tenant_ids=tenant_ids,
-            )
+                "sample": 1_000_000,
+                "arrayjoin": snuba.get_arrayjoin(snuba_key),
+                "referrer": "tagstore.get_tag_value_paginator_for_projects",
+                "tenant_ids": tenant_ids,
+            }
+            results = None
+            if cached_column is not None:
+                results = self._get_cached_tag_values(snuba_query, cached_column, value_query)
+            if results is None:
+                results = snuba.query(**snuba_query)
 
         if include_transactions:
             # With transaction_status we need to map the ids back to their names
@@ -0,0 +1,112 @@
+"""
+Stale-while-revalidate cache for tag keys and values.
+
+Tag keys and values are requested on every keystroke of the search bar, and
+the plain query cache of `SnubaTagStorage` misses every time the time bucket
+of a query rolls over. With `tagstore.stale-while-revalidate.max-staleness`
+set, results are kept for that many seconds beyond their time bucket. A query
+whose bucket has no result yet is answered from the result of the previous
+bucket, as long as that is no older than the max staleness, and the current
+bucket is fetched from Snuba in a task.
+
+Raw `snuba.query` results are cached, so the task only needs the arguments of
+the query to refresh them.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.core.cache import cache
+
+from sentry.snuba.dataset import Dataset
+from sentry.utils import metrics
+from sentry.utils.hashlib import md5_text
+
+CACHE_KEY_PREFIX = "tagstore.swr"
+
+# Length of the time buckets of cached queries, see `snuba.quantize_time`
+BUCKET_DURATION = 300
+
+# Upper bound for how long a single refresh may take before another one is scheduled
+REFRESH_LOCK_TIMEOUT = 60
+
+
+class StaleWhileRevalidateCache:
+    def __init__(self, name: str, key: str, end: datetime, max_staleness: int) -> None:
+        """
+        `key` identifies the query without its time bucket, `end` is the quantized end of
+        the query.
+        """
+        self.name = name
+        self.max_staleness = max_staleness
+        digest = md5_text(key).hexdigest()
+        self.key = f"{CACHE_KEY_PREFIX}:{name}:{digest}@{end.isoformat()}"
+        previous_end = end - timedelta(seconds=BUCKET_DURATION)
+        self.previous_key = f"{CACHE_KEY_PREFIX}:{name}:{digest}@{previous_end.isoformat()}"
+
+    def get(self) -> tuple[Any, bool]:
+        """
+        Returns the cached result, and whether it is from the previous time bucket and should
+        be refreshed.
+        """
+        entries = cache.get_many([self.key, self.previous_key])
+        if self.key in entries:
+            metrics.incr("tagstore.swr_cache", tags={"name": self.name, "result": "hit"})
+            return entries[self.key]["result"], False
+
+        previous = entries.get(self.previous_key)
+        if previous is not None and time.time() - previous["fetched_at"] <= self.max_staleness:
+            metrics.incr("tagstore.swr_cache", tags={"name": self.name, "result": "stale"})
+            return previous["result"], True
+
+        metrics.incr("tagstore.swr_cache", tags={"name": self.name, "result": "miss"})
+        return None, False
+
+    def set(self, result: Any) -> None:
+        set_result(self.key, result, self.max_staleness)
+
+    def refresh(self, query: Mapping[str, Any]) -> None:
+        """
+        Fetch the result of the current time bucket in a task, unless that is already
+        happening.
+        """
+        from sentry.tagstore.snuba.tasks import refresh_tagstore_cache
+
+        if not cache.add(f"{self.key}:refresh", 1, REFRESH_LOCK_TIMEOUT):
+            return
+
+        refresh_tagstore_cache.delay(
+            cache_key=self.key,
+            max_staleness=self.max_staleness,
+            query=serialize_query(query),
+        )
+
+
+def set_result(cache_key: str, result: Any, max_staleness: int) -> None:
+    cache.set(
+        cache_key,
+        {"result": result, "fetched_at": time.time()},
+        BUCKET_DURATION + max_staleness,
+    )
+
+
+def serialize_query(query: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        **query,
+        "dataset": query["dataset"].value,
+        "start": query["start"].isoformat(),
+        "end": query["end"].isoformat(),
+    }
+
+
+def deserialize_query(query: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        **query,
+        "dataset": Dataset(query["dataset"]),
+        "start": datetime.fromisoformat(query["start"]),
+        "end": datetime.fromisoformat(query["end"]),
+    }
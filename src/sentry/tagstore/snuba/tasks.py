@@ -0,0 +1,26 @@
+from typing import Any
+
+from sentry.silo.base import SiloMode
+from sentry.tagstore.snuba.cache import deserialize_query, set_result
+from sentry.tasks.base import instrumented_task
+from sentry.taskworker.config import TaskworkerConfig
+from sentry.taskworker.namespaces import issues_tasks
+from sentry.utils import snuba
+
+
+@instrumented_task(
+    name="sentry.tagstore.snuba.tasks.refresh_tagstore_cache",
+    queue="search",
+    time_limit=65,
+    soft_time_limit=60,
+    silo_mode=SiloMode.REGION,
+    taskworker_config=TaskworkerConfig(
+        namespace=issues_tasks,
+        processing_deadline_duration=65,
+    ),
+)
+def refresh_tagstore_cache(cache_key: str, max_staleness: int, query: dict[str, Any]) -> None:
+    """
+    Run the query of a stale entry of the tagstore cache, and store its result.
+    """
+    set_result(cache_key, snuba.query(**deserialize_query(query)), max_staleness)
@@ -505,9 +505,14 @@ def post_process_group(
     """
     Fires post processing hooks for a group.
     """
+    from sentry.nodestore.local_cache import use_local_cache
     from sentry.utils import snuba
 
-    with snuba.options_override({"consistent": True}):
+    with (
+        snuba.options_override({"consistent": True}),
+        use_local_cache("post_process"),
+        features.evaluation_scope("post_process"),
+    ):
         from sentry import eventstore
         from sentry.eventstore.processing import event_processing_store
         from sentry.issues.occurrence_consumer import EventLookupError
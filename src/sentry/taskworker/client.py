@@ -2,7 +2,7 @@ import hashlib
 import hmac
 import logging
 import random
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import TYPE_CHECKING, Any
 
 import grpc
@@ -133,15 +133,15 @@ class TaskworkerClient:
         domain, port = pattern.split(":")
         return [f"{domain}-{i}:{port}" for i in range(0, num_brokers)]
 
-    def _get_cur_stub(self) -> tuple[str, ConsumerServiceStub]:
-        if self._num_tasks_before_rebalance == 0:
+    def _get_cur_stub(self, num_tasks: int = 1) -> tuple[str, ConsumerServiceStub]:
+        if self._num_tasks_before_rebalance <= 0:
             self._cur_host = random.choice(self._hosts)
             self._num_tasks_before_rebalance = self._max_tasks_before_rebalance
 
         if self._cur_host not in self._host_to_stubs:
             self._host_to_stubs[self._cur_host] = self._connect_to_host(self._cur_host)
 
-        self._num_tasks_before_rebalance -= 1
+        self._num_tasks_before_rebalance -= num_tasks
         return self._cur_host, self._host_to_stubs[self._cur_host]
 
     def get_task(self, namespace: str | None = None) -> TaskActivation | None:
@@ -172,6 +172,44 @@ class TaskworkerClient:
             return response.task
         return None
 
+    def get_tasks(self, namespace: str | None = None, count: int = 1) -> list[TaskActivation]:
+        """
+        Fetch up to `count` pending tasks from one broker.
+
+        The requests are sent concurrently, so leasing a batch of tasks costs
+        about one round trip. Fewer tasks are returned if the broker runs out
+        of them. Errors are only raised if no task could be fetched.
+        """
+        request = GetTaskRequest(namespace=namespace)
+        tasks: list[TaskActivation] = []
+        error: grpc.RpcError | None = None
+        with metrics.timer("taskworker.get_tasks.rpc"):
+            host, stub = self._get_cur_stub(count)
+            futures = [stub.GetTask.future(request) for _ in range(count)]
+            for future in futures:
+                try:
+                    response = future.result()
+                except grpc.RpcError as err:
+                    metrics.incr(
+                        "taskworker.client.rpc_error",
+                        tags={"method": "GetTask", "status": err.code().name},
+                    )
+                    if err.code() != grpc.StatusCode.NOT_FOUND:
+                        error = err
+                    continue
+                if response.HasField("task"):
+                    metrics.incr(
+                        "taskworker.client.get_task",
+                        tags={"namespace": response.task.namespace},
+                    )
+                    self._task_id_to_host[response.task.id] = host
+                    tasks.append(response.task)
+
+        metrics.distribution("taskworker.client.get_tasks.batch_size", len(tasks))
+        if not tasks and error is not None:
+            raise error
+        return tasks
+
     def update_task(
         self,
         task_id: str,
@@ -208,3 +246,53 @@ class TaskworkerClient:
             self._task_id_to_host[response.task.id] = host
             return response.task
         return None
+
+    def update_tasks(
+        self,
+        updates: Sequence[tuple[str, TaskActivationStatus.ValueType, FetchNextTask | None]],
+    ) -> list[TaskActivation | grpc.RpcError | None]:
+        """
+        Update the status of several task activations, given as
+        ``(task_id, status, fetch_next_task)``. The requests are sent
+        concurrently.
+
+        For every update, the return value has the next task that should be
+        executed, `None`, or the error the request failed with.
+        """
+        pending: list[tuple[str, grpc.Future] | None] = []
+        for task_id, status, fetch_next_task in updates:
+            metrics.incr("taskworker.client.fetch_next", tags={"next": fetch_next_task is not None})
+            if task_id not in self._task_id_to_host:
+                metrics.incr("taskworker.client.task_id_not_in_client")
+                pending.append(None)
+                continue
+            host = self._task_id_to_host.pop(task_id)
+            request = SetTaskStatusRequest(
+                id=task_id,
+                status=status,
+                fetch_next_task=fetch_next_task,
+            )
+            pending.append((host, self._host_to_stubs[host].SetTaskStatus.future(request)))
+
+        results: list[TaskActivation | grpc.RpcError | None] = []
+        with metrics.timer("taskworker.update_tasks.rpc"):
+            for item in pending:
+                if item is None:
+                    results.append(None)
+                    continue
+                host, future = item
+                try:
+                    response = future.result()
+                except grpc.RpcError as err:
+                    metrics.incr(
+                        "taskworker.client.rpc_error",
+                        tags={"method": "SetTaskStatus", "status": err.code().name},
+                    )
+                    results.append(None if err.code() == grpc.StatusCode.NOT_FOUND else err)
+                    continue
+                if response.HasField("task"):
+                    self._task_id_to_host[response.task.id] = host
+                    results.append(response.task)
+                else:
+                    results.append(None)
+        return results
@@ -21,3 +21,9 @@ DEFAULT_CHILD_TASK_COUNT = 10000
 The number of tasks a worker child process will process
 before being restarted.
 """
+
+DEFAULT_FETCH_BATCH_SIZE = 1
+"""
+The number of tasks a worker leases from its broker at once. With
+the default of 1 tasks are fetched one at a time.
+"""
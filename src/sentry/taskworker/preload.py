@@ -0,0 +1,27 @@
+"""
+Template for taskworker children when using the `forkserver` process type.
+
+The forkserver imports this module once, and every child process is forked
+from it afterwards. Importing it configures Sentry and imports all task
+modules, which registers every namespace in the task registry, so children
+start with all of that in place and share those pages with the forkserver
+until they write to them. Recycling a child after `max_child_task_count`
+tasks doesn't pay for those imports again.
+"""
+
+import gc
+
+from sentry.taskworker.workerchild import child_worker_init
+
+
+def preload() -> None:
+    child_worker_init("spawn")
+
+    import sentry.taskworker.registry  # NOQA
+
+    # Keep the garbage collector from touching (and copying) the objects
+    # created so far in every child.
+    gc.freeze()
+
+
+preload()
@@ -7,7 +7,7 @@ import queue
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from multiprocessing.context import ForkContext, SpawnContext
+from multiprocessing.context import ForkContext, ForkServerContext, SpawnContext
 from multiprocessing.process import BaseProcess
 from typing import Any
 
@@ -16,12 +16,19 @@ from django.conf import settings
 from sentry_protos.taskbroker.v1.taskbroker_pb2 import FetchNextTask, TaskActivation
 
 from sentry.taskworker.client import TaskworkerClient
-from sentry.taskworker.constants import DEFAULT_REBALANCE_AFTER, DEFAULT_WORKER_QUEUE_SIZE
+from sentry.taskworker.constants import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DEFAULT_REBALANCE_AFTER,
+    DEFAULT_WORKER_QUEUE_SIZE,
+)
 from sentry.taskworker.workerchild import ProcessingResult, child_process
 from sentry.utils import metrics
 
 logger = logging.getLogger("sentry.taskworker.worker")
 
+# Imported once by the forkserver, children are forked from it.
+FORKSERVER_PRELOAD_MODULES = ["sentry.taskworker.preload"]
+
 
 class TaskWorker:
     """
@@ -31,10 +38,18 @@ class TaskWorker:
     As tasks are completed status changes will be sent back to the RPC host and new tasks
     will be fetched.
 
+    With a `fetch_batch_size` greater than 1, up to that many tasks are leased from the
+    broker at once, as long as the child tasks queue has room for them, and status updates
+    are sent in batches of that size as well.
+
+    Children are started with the `spawn` process type by default, and import Django and
+    all task modules when they start. With `forkserver`, those imports are done once in a
+    forkserver process and children are forked from it, see `sentry.taskworker.preload`.
+
     Taskworkers can be run with `sentry run taskworker`
     """
 
-    mp_context: ForkContext | SpawnContext
+    mp_context: ForkContext | SpawnContext | ForkServerContext
 
     def __init__(
         self,
@@ -48,17 +63,23 @@ class TaskWorker:
         rebalance_after: int = DEFAULT_REBALANCE_AFTER,
         processing_pool_name: str | None = None,
         process_type: str = "spawn",
+        fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
         **options: dict[str, Any],
     ) -> None:
         self.options = options
         self._max_child_task_count = max_child_task_count
         self._namespace = namespace
         self._concurrency = concurrency
+        self._fetch_batch_size = max(fetch_batch_size, 1)
+        self._child_tasks_queue_maxsize = child_tasks_queue_maxsize
         self.client = TaskworkerClient(rpc_host, num_brokers, rebalance_after)
         if process_type == "fork":
             self.mp_context = multiprocessing.get_context("fork")
         elif process_type == "spawn":
             self.mp_context = multiprocessing.get_context("spawn")
+        elif process_type == "forkserver":
+            self.mp_context = multiprocessing.get_context("forkserver")
+            self.mp_context.set_forkserver_preload(FORKSERVER_PRELOAD_MODULES)
         else:
             raise ValueError(f"Invalid process type: {process_type}")
         self._process_type = process_type
@@ -130,39 +151,72 @@ class TaskWorker:
         while True:
             try:
                 result = self._processed_tasks.get_nowait()
-                self._send_result(result, fetch=False)
             except queue.Empty:
                 break
+            if self._fetch_batch_size > 1:
+                self._send_results(self._drain_results(result), fetch=False)
+            else:
+                self._send_result(result, fetch=False)
 
         if self._spawn_children_thread:
             self._spawn_children_thread.join()
 
+    def _child_tasks_free_slots(self) -> int:
+        """
+        The number of tasks that can be added to the child tasks queue without blocking.
+        """
+        try:
+            return max(self._child_tasks_queue_maxsize - self._child_tasks.qsize(), 0)
+        except NotImplementedError:
+            # qsize() isn't available on macOS
+            return 0 if self._child_tasks.full() else 1
+
+    def _put_child_task(self, task: TaskActivation, source: str) -> None:
+        try:
+            start_time = time.monotonic()
+            self._child_tasks.put(task)
+            metrics.distribution(
+                "taskworker.worker.child_task.put.duration",
+                time.monotonic() - start_time,
+                tags={"processing_pool": self._processing_pool_name},
+            )
+        except queue.Full:
+            logger.warning(
+                f"taskworker.{source}.child_task_queue_full",
+                extra={"task_id": task.id, "processing_pool": self._processing_pool_name},
+            )
+
     def _add_task(self) -> bool:
         """
         Add a task to child tasks queue. Returns False if no new task was fetched.
         """
+        if self._fetch_batch_size > 1:
+            return self._add_tasks()
+
         if self._child_tasks.full():
             return False
 
         task = self.fetch_task()
         if task:
-            try:
-                start_time = time.monotonic()
-                self._child_tasks.put(task)
-                metrics.distribution(
-                    "taskworker.worker.child_task.put.duration",
-                    time.monotonic() - start_time,
-                    tags={"processing_pool": self._processing_pool_name},
-                )
-            except queue.Full:
-                logger.warning(
-                    "taskworker.add_task.child_task_queue_full",
-                    extra={"task_id": task.id, "processing_pool": self._processing_pool_name},
-                )
+            self._put_child_task(task, "add_task")
             return True
         else:
             return False
 
+    def _add_tasks(self) -> bool:
+        """
+        Lease as many tasks as the child tasks queue has room for, up to the fetch batch size.
+        Returns False if no new task was fetched.
+        """
+        count = min(self._fetch_batch_size, self._child_tasks_free_slots())
+        if count <= 0:
+            return False
+
+        tasks = self.fetch_tasks(count)
+        for task in tasks:
+            self._put_child_task(task, "add_task")
+        return bool(tasks)
+
     def start_result_thread(self) -> None:
         """
         Start a thread that delivers results and fetches new tasks.
@@ -181,7 +235,10 @@ class TaskWorker:
                 while not self._shutdown_event.is_set():
                     try:
                         result = self._processed_tasks.get(timeout=1.0)
-                        executor.submit(self._send_result, result)
+                        if self._fetch_batch_size > 1:
+                            executor.submit(self._send_results, self._drain_results(result))
+                        else:
+                            executor.submit(self._send_result, result)
                     except queue.Empty:
                         metrics.incr(
                             "taskworker.worker.result_thread.queue_empty",
@@ -230,6 +287,72 @@ class TaskWorker:
         self._send_update_task(result, fetch_next=None)
         return True
 
+    def _drain_results(self, first: ProcessingResult) -> list[ProcessingResult]:
+        """
+        Collect the results which are already waiting, up to the fetch batch size.
+        """
+        results = [first]
+        while len(results) < self._fetch_batch_size:
+            try:
+                results.append(self._processed_tasks.get_nowait())
+            except queue.Empty:
+                break
+        return results
+
+    def _send_results(self, results: list[ProcessingResult], fetch: bool = True) -> None:
+        """
+        Send a batch of results to the broker, and conditionally fetch as many new tasks as
+        the child tasks queue has room for along with them.
+
+        Run in a thread, see `start_result_thread`
+        """
+        now = time.monotonic()
+        for result in results:
+            task_received = self._task_receive_timing.pop(result.task_id, None)
+            if task_received is not None:
+                metrics.distribution(
+                    "taskworker.worker.complete_duration",
+                    now - task_received,
+                    tags={"processing_pool": self._processing_pool_name},
+                )
+
+        free_slots = self._child_tasks_free_slots() if fetch else 0
+        updates = []
+        for i, result in enumerate(results):
+            fetch_next = FetchNextTask(namespace=self._namespace) if i < free_slots else None
+            updates.append((result.task_id, result.status, fetch_next))
+
+        logger.debug(
+            "taskworker.workers._send_results",
+            extra={
+                "count": len(updates),
+                "next": min(free_slots, len(updates)),
+                "processing_pool": self._processing_pool_name,
+            },
+        )
+        # Use the shutdown_event as a sleep mechanism
+        self._shutdown_event.wait(self._setstatus_backoff_seconds)
+        responses = self.client.update_tasks(updates)
+
+        failed = False
+        for result, response in zip(results, responses):
+            if isinstance(response, grpc.RpcError):
+                failed = True
+                if response.code() == grpc.StatusCode.UNAVAILABLE:
+                    self._processed_tasks.put(result)
+                logger.warning(
+                    "taskworker.send_update_task.failed",
+                    extra={"task_id": result.task_id, "error": response},
+                )
+            elif response is not None:
+                self._task_receive_timing[response.id] = time.monotonic()
+                self._put_child_task(response, "send_result")
+
+        if failed:
+            self._setstatus_backoff_seconds = min(self._setstatus_backoff_seconds + 1, 10)
+        else:
+            self._setstatus_backoff_seconds = 0
+
     def _send_update_task(
         self, result: ProcessingResult, fetch_next: FetchNextTask | None
     ) -> TaskActivation | None:
@@ -282,6 +405,7 @@ class TaskWorker:
                             self._max_child_task_count,
                             self._processing_pool_name,
                             self._process_type,
+                            time.time(),
                         ),
                     )
                     process.start()
@@ -324,3 +448,39 @@ class TaskWorker:
         self._gettask_backoff_seconds = 0
         self._task_receive_timing[activation.id] = time.monotonic()
         return activation
+
+    def fetch_tasks(self, count: int) -> list[TaskActivation]:
+        """
+        Lease up to `count` tasks from the broker at once, see `fetch_task`.
+        """
+        # Use the shutdown_event as a sleep mechanism
+        self._shutdown_event.wait(self._gettask_backoff_seconds)
+        try:
+            activations = self.client.get_tasks(self._namespace, count)
+        except grpc.RpcError as e:
+            logger.info(
+                "taskworker.fetch_task.failed",
+                extra={"error": e, "processing_pool": self._processing_pool_name},
+            )
+
+            self._gettask_backoff_seconds = min(self._gettask_backoff_seconds + 1, 10)
+            return []
+
+        if not activations:
+            metrics.incr(
+                "taskworker.worker.fetch_task.not_found",
+                tags={"processing_pool": self._processing_pool_name},
+            )
+            logger.debug(
+                "taskworker.fetch_task.not_found",
+                extra={"processing_pool": self._processing_pool_name},
+            )
+
+            self._gettask_backoff_seconds = min(self._gettask_backoff_seconds + 1, 10)
+            return []
+
+        self._gettask_backoff_seconds = 0
+        now = time.monotonic()
+        for activation in activations:
+            self._task_receive_timing[activation.id] = now
+        return activations
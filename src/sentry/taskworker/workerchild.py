@@ -46,6 +46,9 @@ def child_worker_init(process_type: str) -> None:
     Configure django and load task modules for workers
     Child worker processes are spawned and don't inherit db
     connections or configuration from the parent process.
+
+    Children of the `forkserver` process type are forked from
+    `sentry.taskworker.preload`, which has done all of this already.
     """
     from django.conf import settings
 
@@ -90,6 +93,7 @@ def child_process(
     max_task_count: int | None,
     processing_pool_name: str,
     process_type: str,
+    spawned_at: float | None = None,
 ) -> None:
     """
     The entrypoint for spawned worker children.
@@ -108,7 +112,30 @@ def child_process(
     from sentry.taskworker.state import clear_current_task, current_task, set_current_task
     from sentry.taskworker.task import Task
     from sentry.utils import metrics
-    from sentry.utils.memory import track_memory_usage
+    from sentry.utils.memory import get_current_rss_usage, get_private_rss_usage, track_memory_usage
+
+    if spawned_at is not None:
+        startup_tags = {"process_type": process_type, "processing_pool": processing_pool_name}
+        metrics.distribution(
+            "taskworker.worker.child_startup.duration",
+            time.time() - spawned_at,
+            tags=startup_tags,
+        )
+        # Both in bytes and current rather than peak, so they can be compared across
+        # process types
+        rss = get_current_rss_usage()
+        if rss is not None:
+            metrics.distribution(
+                "taskworker.worker.child_startup.rss", rss, unit="byte", tags=startup_tags
+            )
+        private_rss = get_private_rss_usage()
+        if private_rss is not None:
+            metrics.distribution(
+                "taskworker.worker.child_startup.private_rss",
+                private_rss,
+                unit="byte",
+                tags=startup_tags,
+            )
 
     def _get_known_task(activation: TaskActivation) -> Task[Any, Any] | None:
         if not taskregistry.contains(activation.namespace):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.util
 import socket
 from urllib.parse import urlparse
 
@@ -52,3 +53,7 @@ def _requires_symbolicator() -> None:
 requires_snuba = pytest.mark.usefixtures("_requires_snuba")
 requires_symbolicator = pytest.mark.usefixtures("_requires_symbolicator")
 requires_kafka = pytest.mark.usefixtures("_requires_kafka")
+
+requires_pytest_benchmark = pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None, reason="requires pytest-benchmark"
+)
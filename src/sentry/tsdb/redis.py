@@ -1,3 +1,4 @@
+import array
 import binascii
 import itertools
 import logging
@@ -32,6 +33,7 @@ T = TypeVar("T")
 SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = load_redis_script("tsdb/cmsketch.lua")
+CountersScript = load_redis_script("tsdb/counters.lua")
 
 
 def _crc32(data: bytes) -> int:
@@ -94,6 +96,10 @@ class RedisTSDB(BaseTSDB):
             ...
         }
 
+    When ``enable_batched_reads`` is set, counter ranges are read with a single
+    ``counters.lua`` invocation per host, which sums buckets on the server when
+    only totals are needed, instead of one ``HGET`` per key and bucket.
+
     Distinct counters are stored using HyperLogLog, which provides a
     cardinality estimate with a standard error of 0.8%. The data layout looks
     something like this::
@@ -129,6 +135,7 @@ class RedisTSDB(BaseTSDB):
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        self.enable_batched_reads = options.pop("enable_batched_reads", False)
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -340,6 +347,16 @@ class RedisTSDB(BaseTSDB):
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+
+        if self.enable_batched_reads:
+            counts = self._get_counters_batched(
+                model, keys, series, rollup, environment_id, aggregate=False
+            )
+            return {
+                key: list(zip(series, counts[i * len(series) : (i + 1) * len(series)]))
+                for i, key in enumerate(keys)
+            }
+
         _series = [to_datetime(item) for item in series]
 
         results = []
@@ -363,6 +380,107 @@ class RedisTSDB(BaseTSDB):
             output[key] = sorted(points.items())
         return output
 
+    def get_timeseries_sums(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+        conditions: list[SnubaCondition] | None = None,
+        group_on_time: bool = True,
+    ) -> dict[TSDBKey, int]:
+        if not self.enable_batched_reads:
+            return super().get_timeseries_sums(
+                model,
+                keys,
+                start,
+                end,
+                rollup,
+                environment_id=environment_id,
+                use_cache=use_cache,
+                jitter_value=jitter_value,
+                tenant_ids=tenant_ids,
+                referrer_suffix=referrer_suffix,
+                conditions=conditions,
+                group_on_time=group_on_time,
+            )
+
+        self.validate_arguments([model], [environment_id])
+
+        rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+        sums = self._get_counters_batched(
+            model, keys, series, rollup, environment_id, aggregate=True
+        )
+        return dict(zip(keys, sums))
+
+    def _get_counters_batched(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        series: Sequence[int],
+        rollup: int,
+        environment_id: int | None,
+        aggregate: bool,
+    ) -> array.array[int]:
+        """
+        Fetch counter values for every key and timestamp in ``series`` with a
+        single ``CountersScript`` invocation per host.
+
+        If ``aggregate`` is set, the buckets are summed on the server and one
+        value per key is returned. Otherwise the result holds one value per
+        key and bucket, in row-major order (all buckets of the first key, then
+        all buckets of the second key, ...).
+        """
+        size = len(keys) if aggregate else len(keys) * len(series)
+        result = array.array("q", bytes(8 * size))
+        if not size:
+            return result
+
+        cluster, _ = self.get_cluster(environment_id)
+        router = cluster.get_router()
+
+        # host -> hash key -> [(hash field, result slot), ...]
+        reads: dict[int, dict[str, list[tuple[str | int, int]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for i, key in enumerate(keys):
+            for j, timestamp in enumerate(series):
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                slot = i if aggregate else i * len(series) + j
+                reads[router.get_host_for_key(hash_key)][hash_key].append((hash_field, slot))
+
+        # Every host only returns the slots it has values for, the script
+        # addresses them with 1-based local indexes.
+        commands: dict[str, list[tuple[Script, list[str], list[str | int]]]] = {}
+        host_slots: dict[str, list[int]] = {}
+        for fields_by_key in reads.values():
+            local_slots: dict[int, int] = {}
+            arguments: list[str | int] = [0]
+            for fields in fields_by_key.values():
+                arguments.append(len(fields))
+                for hash_field, slot in fields:
+                    arguments.append(hash_field)
+                    arguments.append(local_slots.setdefault(slot, len(local_slots) + 1))
+            arguments[0] = len(local_slots)
+
+            routing_key = next(iter(fields_by_key))
+            commands[routing_key] = [(CountersScript, list(fields_by_key), arguments)]
+            host_slots[routing_key] = list(local_slots)
+
+        for routing_key, responses in cluster.execute_commands(commands).items():
+            for slot, value in zip(host_slots[routing_key], responses[0].value):
+                result[slot] += value
+
+        return result
+
     def merge(
         self,
         model: TSDBModel,
@@ -8,6 +8,47 @@ def get_rss_usage():
     return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
 
+def _read_smaps_rollup() -> dict[str, int] | None:
+    """
+    The memory counters of this process from ``/proc/self/smaps_rollup``, in
+    bytes. Only available on Linux.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    counters = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[0].endswith(":") and parts[2] == "kB":
+            counters[parts[0][:-1]] = int(parts[1]) * 1024
+    return counters
+
+
+def get_current_rss_usage() -> int | None:
+    """
+    The current resident memory of this process, in bytes. Unlike
+    `get_rss_usage` this isn't the peak. Only available on Linux.
+    """
+    counters = _read_smaps_rollup()
+    if counters is None:
+        return None
+    return counters.get("Rss", 0)
+
+
+def get_private_rss_usage() -> int | None:
+    """
+    The resident memory of this process that isn't shared with other
+    processes, in bytes. Only available on Linux.
+    """
+    counters = _read_smaps_rollup()
+    if counters is None:
+        return None
+    return counters.get("Private_Clean", 0) + counters.get("Private_Dirty", 0)
+
+
 @contextmanager
 def track_memory_usage(metric, **kwargs):
     before = get_rss_usage()
@@ -4,9 +4,10 @@ import hashlib
 import random
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from datetime import timedelta
 from enum import Enum
-from typing import Any, ClassVar, TypedDict
+from typing import Any, ClassVar, TypedDict, TypeVar
 from urllib.parse import parse_qs, urlparse
 
 from sentry import options
@@ -15,6 +16,8 @@ from sentry.models.project import Project
 
 from .types import PerformanceProblemsMap, Span
 
+T = TypeVar("T")
+
 
 class DetectorType(Enum):
     SLOW_DB_QUERY = "slow_db_query"
@@ -50,6 +53,43 @@ DETECTOR_TYPE_ISSUE_CREATION_TO_SYSTEM_OPTION = {
 }
 
 
+class SpanIndex:
+    """
+    Values derived from the spans of an event which several detectors need, like span durations,
+    URLs and fingerprints. Every value is calculated at most once per span, and the index is shared
+    by all detectors that run on the event.
+    """
+
+    def __init__(self) -> None:
+        # id(span) -> (span, value). Keeping the span around makes sure that its id isn't reused
+        # for another span while the index is alive.
+        self._durations: dict[int, tuple[Span, timedelta]] = {}
+        self._fingerprints: dict[int, tuple[Span, str | None]] = {}
+        self._urls: dict[int, tuple[Span, str]] = {}
+        self._parameterized_urls: dict[int, tuple[Span, str]] = {}
+
+    @staticmethod
+    def _get(cache: dict[int, tuple[Span, T]], span: Span, calculate: Callable[[Span], T]) -> T:
+        cached = cache.get(id(span))
+        if cached is None or cached[0] is not span:
+            cached = cache[id(span)] = (span, calculate(span))
+        return cached[1]
+
+    def duration(self, span: Span) -> timedelta:
+        return self._get(self._durations, span, get_span_duration)
+
+    def fingerprint(self, span: Span) -> str | None:
+        return self._get(self._fingerprints, span, fingerprint_span)
+
+    def url(self, span: Span) -> str:
+        return self._get(self._urls, span, get_url_from_span)
+
+    def parameterized_url(self, span: Span) -> str:
+        return self._get(
+            self._parameterized_urls, span, lambda span: parameterize_url(self.url(span))
+        )
+
+
 class PerformanceDetector(ABC):
     """
     Classes of this type have their visit functions called as the event is walked once and will store a performance issue if one is detected.
@@ -58,9 +98,15 @@ class PerformanceDetector(ABC):
     type: ClassVar[DetectorType]
     stored_problems: PerformanceProblemsMap
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
         self.settings = settings[self.settings_key]
         self._event = event
+        self.span_index = span_index if span_index is not None else SpanIndex()
 
     def find_span_prefix(self, settings, span_op: str):
         allowed_span_ops = settings.get("allowed_span_ops", [])
@@ -74,7 +120,7 @@ class PerformanceDetector(ABC):
         if not op or not span_id:
             return None
 
-        span_duration = get_span_duration(span)
+        span_duration = self.span_index.duration(span)
         for setting in self.settings:
             op_prefix = self.find_span_prefix(setting, op)
             if op_prefix:
@@ -84,6 +130,14 @@ class PerformanceDetector(ABC):
     def event(self) -> dict[str, Any]:
         return self._event
 
+    def span_op_prefixes(self) -> tuple[str, ...] | None:
+        """
+        The prefixes of the ops of the spans this detector looks at. Spans with other ops are not
+        passed to `visit_span` when detectors are run with `run_detectors_on_data`. `None` means
+        that the detector looks at all spans.
+        """
+        return None
+
     @property
     @abstractmethod
     def settings_key(self) -> DetectorType:
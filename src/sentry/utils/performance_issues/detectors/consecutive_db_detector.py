@@ -20,9 +20,9 @@ from sentry.utils.performance_issues.detectors.utils import (
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_spans,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -63,8 +63,13 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
     type = DetectorType.CONSECUTIVE_DB_OP
     settings_key = DetectorType.CONSECUTIVE_DB_OP
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems: dict[str, PerformanceProblem] = {}
         self.consecutive_db_spans: list[Span] = []
@@ -92,7 +97,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
             "consecutive_count_threshold"
         )
         exceeds_span_duration_threshold = all(
-            get_span_duration(span).total_seconds() * 1000
+            self.span_index.duration(span).total_seconds() * 1000
             > self.settings.get("span_duration_threshold")
             for span in self.independent_db_spans
         )
@@ -219,7 +224,9 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         sum_of_dependent_span_durations = 0.0
         for span in consecutive_spans:
             if span not in independent_spans:
-                sum_of_dependent_span_durations += get_span_duration(span).total_seconds() * 1000
+                sum_of_dependent_span_durations += (
+                    self.span_index.duration(span).total_seconds() * 1000
+                )
 
         return total_duration - max(max_independent_span_duration, sum_of_dependent_span_durations)
 
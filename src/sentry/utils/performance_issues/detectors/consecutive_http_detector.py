@@ -16,11 +16,11 @@ from sentry.utils.safe import get_path
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     does_overlap_previous_span,
     fingerprint_http_spans,
     get_duration_between_spans,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -33,8 +33,13 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
     type = DetectorType.CONSECUTIVE_HTTP_OP
     settings_key = DetectorType.CONSECUTIVE_HTTP_OP
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems: dict[str, PerformanceProblem] = {}
         self.consecutive_http_spans: list[Span] = []
@@ -45,6 +50,9 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
         if lcp_value and (lcp_unit is None or lcp_unit == "millisecond"):
             self.lcp = lcp_value
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("http.client",)
+
     def visit_span(self, span: Span) -> None:
         if is_event_from_browser_javascript_sdk(self.event()):
             return
@@ -54,7 +62,7 @@ class ConsecutiveHTTPSpanDetector(PerformanceDetector):
         if not span_id or not self._is_eligible_http_span(span):
             return
 
-        span_duration = get_span_duration(span).total_seconds() * 1000
+        span_duration = self.span_index.duration(span).total_seconds() * 1000
         if span_duration < self.settings.get("span_duration_threshold"):
             return
 
@@ -13,11 +13,11 @@ from sentry.models.project import Project
 from sentry.utils.performance_issues.base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_http_spans,
     get_notification_attachment_body,
     get_span_evidence_value,
     get_url_from_span,
-    parameterize_url,
     parameterize_url_with_result,
 )
 from sentry.utils.performance_issues.detectors.utils import get_total_span_duration
@@ -41,8 +41,13 @@ class NPlusOneAPICallsExperimentalDetector(PerformanceDetector):
     type = DetectorType.EXPERIMENTAL_N_PLUS_ONE_API_CALLS
     settings_key = DetectorType.EXPERIMENTAL_N_PLUS_ONE_API_CALLS
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         # TODO: Only store the span IDs and timestamps instead of entire span objects
         self.stored_problems: PerformanceProblemsMap = {}
@@ -54,6 +59,9 @@ class NPlusOneAPICallsExperimentalDetector(PerformanceDetector):
         # See https://develop.sentry.dev/backend/issue-platform/#releasing-your-issue-type
         return True
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return tuple(self.settings.get("allowed_span_ops", []))
+
     def visit_span(self, span: Span) -> None:
         if not NPlusOneAPICallsExperimentalDetector.is_span_eligible(span):
             return
@@ -205,7 +213,7 @@ class NPlusOneAPICallsExperimentalDetector(PerformanceDetector):
             return {"query_params": [], "path_params": []}
 
         parameterized_urls = [
-            parameterize_url_with_result(get_url_from_span(span)) for span in self.spans
+            parameterize_url_with_result(self.span_index.url(span)) for span in self.spans
         ]
         path_params = [param["path_params"] for param in parameterized_urls]
         query_dict: dict[str, list[str]] = defaultdict(list)
@@ -221,19 +229,19 @@ class NPlusOneAPICallsExperimentalDetector(PerformanceDetector):
         }
 
     def _get_parameterized_url(self, span: Span) -> str:
-        return parameterize_url(get_url_from_span(span))
+        return self.span_index.parameterized_url(span)
 
     def _get_path_prefix(self, repeating_span: Span) -> str:
         if not repeating_span:
             return ""
 
-        url = get_url_from_span(repeating_span)
+        url = self.span_index.url(repeating_span)
         parsed_url = urlparse(url)
         return parsed_url.path or ""
 
     def _fingerprint(self) -> str | None:
-        first_url = get_url_from_span(self.spans[0])
-        parameterized_first_url = parameterize_url(first_url)
+        first_url = self.span_index.url(self.spans[0])
+        parameterized_first_url = self.span_index.parameterized_url(self.spans[0])
 
         # Check if we parameterized the URL at all. If not, do not attempt
         # fingerprinting. Unparameterized URLs run too high a risk of
@@ -11,6 +11,7 @@ from sentry.utils import metrics
 from sentry.utils.performance_issues.base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     get_notification_attachment_body,
     get_span_evidence_value,
     total_span_time,
@@ -58,8 +59,13 @@ class NPlusOneDBSpanExperimentalDetector(PerformanceDetector):
     type = DetectorType.EXPERIMENTAL_N_PLUS_ONE_DB_QUERIES
     settings_key = DetectorType.EXPERIMENTAL_N_PLUS_ONE_DB_QUERIES
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.potential_parents = {}
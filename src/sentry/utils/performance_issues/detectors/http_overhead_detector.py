@@ -13,6 +13,7 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     does_overlap_previous_span,
     get_notification_attachment_body,
     get_span_evidence_value,
@@ -52,12 +53,20 @@ class HTTPOverheadDetector(PerformanceDetector):
     type = DetectorType.HTTP_OVERHEAD
     settings_key = DetectorType.HTTP_OVERHEAD
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems: dict[str, PerformanceProblem] = {}
         self.location_to_indicators: dict[str, list[list[ProblemIndicator]]] = defaultdict(list)
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("http.client",)
+
     def visit_span(self, span: Span) -> None:
         span_data = span.get("data", {})
         if not self._is_span_eligible(span) or not span_data:
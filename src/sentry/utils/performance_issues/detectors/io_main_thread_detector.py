@@ -21,6 +21,7 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     get_notification_attachment_body,
     get_span_evidence_value,
     total_span_time,
@@ -41,8 +42,13 @@ class BaseIOMainThreadDetector(PerformanceDetector):
     def _fingerprint(self, span_list: list[Span]) -> str:
         raise NotImplementedError
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.mapper: ProguardMapper | None = None
@@ -210,8 +216,13 @@ class DBMainThreadDetector(BaseIOMainThreadDetector):
     settings_key = DetectorType.DB_MAIN_THREAD
     group_type = PerformanceDBMainThreadGroupType
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.mapper = None
@@ -12,6 +12,7 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_http_spans,
     get_notification_attachment_body,
     get_span_duration,
@@ -33,12 +34,20 @@ class LargeHTTPPayloadDetector(PerformanceDetector):
     type = DetectorType.LARGE_HTTP_PAYLOAD
     settings_key = DetectorType.LARGE_HTTP_PAYLOAD
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems: dict[str, PerformanceProblem] = {}
         self.consecutive_http_spans: list[Span] = []
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("http",)
+
     def visit_span(self, span: Span) -> None:
         if not LargeHTTPPayloadDetector._is_span_eligible(span):
             return
@@ -17,6 +17,7 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     get_notification_attachment_body,
     get_span_evidence_value,
     total_span_time,
@@ -268,8 +269,13 @@ class MNPlusOneDBSpanDetector(PerformanceDetector):
     type = DetectorType.M_N_PLUS_ONE_DB
     settings_key = DetectorType.M_N_PLUS_ONE_DB
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.state: MNPlusOneState = SearchingForMNPlusOne(self.settings, self.event())
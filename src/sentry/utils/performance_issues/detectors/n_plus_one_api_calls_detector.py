@@ -17,11 +17,11 @@ from sentry.models.project import Project
 from sentry.utils.performance_issues.base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_http_spans,
     get_notification_attachment_body,
     get_span_evidence_value,
     get_url_from_span,
-    parameterize_url,
 )
 from sentry.utils.performance_issues.detectors.utils import get_total_span_duration
 from sentry.utils.performance_issues.performance_problem import PerformanceProblem
@@ -44,14 +44,22 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
     type = DetectorType.N_PLUS_ONE_API_CALLS
     settings_key = DetectorType.N_PLUS_ONE_API_CALLS
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         # TODO: Only store the span IDs and timestamps instead of entire span objects
         self.stored_problems: PerformanceProblemsMap = {}
         self.spans: list[Span] = []
         self.span_hashes: dict[str, str | None] = {}
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return tuple(self.settings.get("allowed_span_ops", []))
+
     def visit_span(self, span: Span) -> None:
         if not NPlusOneAPICallsDetector.is_span_eligible(span):
             return
@@ -201,7 +209,7 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
         if not self.spans or len(self.spans) == 0:
             return []
 
-        urls = [get_url_from_span(span) for span in self.spans]
+        urls = [self.span_index.url(span) for span in self.spans]
 
         all_parameters: Mapping[str, list[str]] = defaultdict(list)
 
@@ -220,13 +228,13 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
         if not repeating_span:
             return ""
 
-        url = get_url_from_span(repeating_span)
+        url = self.span_index.url(repeating_span)
         parsed_url = urlparse(url)
         return parsed_url.path or ""
 
     def _fingerprint(self) -> str | None:
-        first_url = get_url_from_span(self.spans[0])
-        parameterized_first_url = parameterize_url(first_url)
+        first_url = self.span_index.url(self.spans[0])
+        parameterized_first_url = self.span_index.parameterized_url(self.spans[0])
 
         # Check if we parameterized the URL at all. If not, do not attempt
         # fingerprinting. Unparameterized URLs run too high a risk of
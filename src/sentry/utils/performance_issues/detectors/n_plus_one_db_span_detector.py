@@ -13,6 +13,7 @@ from sentry.utils.safe import get_path
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     get_notification_attachment_body,
     get_span_evidence_value,
     total_span_time,
@@ -59,8 +60,13 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
     type = DetectorType.N_PLUS_ONE_DB_QUERIES
     settings_key = DetectorType.N_PLUS_ONE_DB_QUERIES
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.potential_parents = {}
@@ -12,9 +12,9 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_resource_span,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -29,8 +29,13 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
 
     MAX_SIZE_BYTES = 1_000_000_000  # 1GB
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.transaction_start = timedelta(seconds=self.event().get("start_timestamp", 0))
@@ -60,6 +65,9 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
     def is_creation_allowed_for_project(self, project: Project) -> bool:
         return self.settings["detection_enabled"]
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return ("resource.link", "resource.script")
+
     def visit_span(self, span: Span) -> None:
         if not self.fcp:
             return
@@ -148,7 +156,7 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
         if encoded_body_size < minimum_size_bytes or encoded_body_size > self.MAX_SIZE_BYTES:
             return False
 
-        span_duration = get_span_duration(span)
+        span_duration = self.span_index.duration(span)
         fcp_ratio_threshold = self.settings.get("fcp_ratio_threshold")
         return span_duration / self.fcp > fcp_ratio_threshold
 
@@ -12,7 +12,7 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
-    fingerprint_span,
+    SpanIndex,
     get_notification_attachment_body,
     get_span_evidence_value,
 )
@@ -36,11 +36,26 @@ class SlowDBQueryDetector(PerformanceDetector):
     type = DetectorType.SLOW_DB_QUERY
     settings_key = DetectorType.SLOW_DB_QUERY
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
 
+    def span_op_prefixes(self) -> tuple[str, ...] | None:
+        prefixes: list[str] = []
+        for setting in self.settings:
+            allowed_span_ops = setting.get("allowed_span_ops", [])
+            # Every span matches a setting without allowed ops, see `find_span_prefix`
+            if not allowed_span_ops:
+                return None
+            prefixes.extend(allowed_span_ops)
+        return tuple(prefixes)
+
     def visit_span(self, span: Span) -> None:
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
@@ -48,7 +63,7 @@ class SlowDBQueryDetector(PerformanceDetector):
         op, span_id, op_prefix, span_duration, settings = settings_for_span
         duration_threshold = settings.get("duration_threshold")
 
-        fingerprint = fingerprint_span(span)
+        fingerprint = self.span_index.fingerprint(span)
 
         if not fingerprint:
             return
@@ -11,9 +11,9 @@ from sentry.models.project import Project
 from ..base import (
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_resource_span,
     get_notification_attachment_body,
-    get_span_duration,
     get_span_evidence_value,
 )
 from ..performance_problem import PerformanceProblem
@@ -33,12 +33,20 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
     settings_key = DetectorType.UNCOMPRESSED_ASSETS
     type = DetectorType.UNCOMPRESSED_ASSETS
 
-    def __init__(self, settings: dict[DetectorType, Any], event: dict[str, Any]) -> None:
-        super().__init__(settings, event)
+    def __init__(
+        self,
+        settings: dict[DetectorType, Any],
+        event: dict[str, Any],
+        span_index: SpanIndex | None = None,
+    ) -> None:
+        super().__init__(settings, event, span_index)
 
         self.stored_problems = {}
         self.any_compression = False
 
+    def span_op_prefixes(self) -> tuple[str, ...]:
+        return tuple(self.settings.get("allowed_span_ops", []))
+
     def visit_span(self, span: Span) -> None:
         op = span.get("op", None)
         description = span.get("description", "")
@@ -88,7 +96,7 @@ class UncompressedAssetSpanDetector(PerformanceDetector):
             return
 
         # Ignore assets under a certain duration threshold
-        if get_span_duration(span).total_seconds() * 1000 <= self.settings.get(
+        if self.span_index.duration(span).total_seconds() * 1000 <= self.settings.get(
             "duration_threshold"
         ):
             return
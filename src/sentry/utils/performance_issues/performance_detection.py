@@ -22,7 +22,7 @@ from sentry.utils.performance_issues.detectors.experiments.n_plus_one_db_span_de
 )
 from sentry.utils.safe import get_path
 
-from .base import DetectorType, PerformanceDetector
+from .base import DetectorType, PerformanceDetector, SpanIndex
 from .detectors.consecutive_db_detector import ConsecutiveDBSpanDetector
 from .detectors.consecutive_http_detector import ConsecutiveHTTPSpanDetector
 from .detectors.experiments.n_plus_one_api_calls_detector import (
@@ -359,17 +359,15 @@ def _detect_performance_problems(
         data = {**data, "spans": flatten_tree(tree, segment_id)}
 
     with sentry_sdk.start_span(op="initialize", name="PerformanceDetector"):
+        span_index = SpanIndex()
         detectors: list[PerformanceDetector] = [
-            detector_class(detection_settings, data)
+            detector_class(detection_settings, data, span_index)
             for detector_class in DETECTOR_CLASSES
             if detector_class.is_detection_allowed_for_system()
         ]
 
-    for detector in detectors:
-        with sentry_sdk.start_span(
-            op="function", name=f"run_detector_on_data.{detector.type.value}"
-        ):
-            run_detector_on_data(detector, data)
+    with sentry_sdk.start_span(op="function", name="run_detectors_on_data"):
+        run_detectors_on_data(detectors, data)
 
     with sentry_sdk.start_span(op="function", name="report_metrics_for_detectors"):
         # Metrics reporting only for detection, not created issues.
@@ -427,6 +425,38 @@ def run_detector_on_data(detector: PerformanceDetector, data: dict[str, Any]) ->
     detector.on_complete()
 
 
+def run_detectors_on_data(detectors: Sequence[PerformanceDetector], data: dict[str, Any]) -> None:
+    """
+    Runs all detectors in a single pass over the spans. This is equivalent to calling
+    `run_detector_on_data` for every detector, but every span is only passed to the detectors that
+    look at spans with its op, see `PerformanceDetector.span_op_prefixes`.
+    """
+    eligible_detectors = [detector for detector in detectors if detector.is_event_eligible(data)]
+    op_prefixes = [detector.span_op_prefixes() for detector in eligible_detectors]
+    all_span_detectors = [
+        detector for detector, prefixes in zip(eligible_detectors, op_prefixes) if prefixes is None
+    ]
+    detectors_by_op: dict[str, list[PerformanceDetector]] = {}
+
+    spans = data.get("spans", [])
+    for span in spans:
+        op = span.get("op")
+        if not isinstance(op, str):
+            span_detectors = all_span_detectors
+        elif (span_detectors := detectors_by_op.get(op)) is None:
+            span_detectors = detectors_by_op[op] = [
+                detector
+                for detector, prefixes in zip(eligible_detectors, op_prefixes)
+                if prefixes is None or op.startswith(prefixes)
+            ]
+
+        for detector in span_detectors:
+            detector.visit_span(span)
+
+    for detector in eligible_detectors:
+        detector.on_complete()
+
+
 def build_tree(spans: Sequence[dict[str, Any]]) -> tuple[dict[str, Any], str | None]:
     span_tree: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
     segment_id = None
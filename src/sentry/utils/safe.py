@@ -1,3 +1,4 @@
+import dataclasses
 import logging
 from collections.abc import Callable, Mapping, MutableMapping, Sequence
 from typing import Any, ParamSpec, TypeVar, Union
@@ -34,59 +35,154 @@ def safe_execute(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R |
         return result
 
 
+@dataclasses.dataclass
+class TrimStats:
+    """
+    What `trim` removed from a value.
+    """
+
+    # Strings cut short to fit the size budget
+    truncated_strings: int = 0
+    # Characters removed from those strings, not counting the ellipsis
+    truncated_chars: int = 0
+    # Items of dicts and lists dropped after the size budget ran out
+    dropped_items: int = 0
+    # Values deeper than the max depth, which were serialized to JSON strings
+    serialized_values: int = 0
+
+
+class _Frame:
+    """
+    A dict, list or tuple on the stack of `trim`, along with its trimmed items so far.
+    """
+
+    __slots__ = ("value", "depth", "size", "items", "results", "changed", "full", "length")
+
+    def __init__(self, value: dict | list | tuple, depth: int, size: int) -> None:
+        self.value = value
+        self.depth = depth
+        self.size = size + 2
+        if isinstance(value, dict):
+            # Items are trimmed shortest first, so that a few long values don't push out many
+            # short ones
+            keys = list(value.keys())
+            if len(keys) > 1:
+                keys.sort(key=lambda x: (len(force_str(value[x])), x))
+            self.items: list[tuple[Any, Any]] = [(k, value[k]) for k in keys]
+            self.changed = type(value) is not dict or list(value) != keys
+        else:
+            self.items = list(enumerate(value))
+            self.changed = type(value) not in (list, tuple)
+        self.results: list[tuple[Any, Any]] = []
+        self.full = False
+        # Length of the `repr` of the result, which is built up from the lengths of the items
+        # so that nested results don't have to be turned into strings again
+        self.length = 0
+
+    def add(self, item: Any, trimmed: Any, length: int, max_size: int) -> None:
+        """
+        Add the trimmed version of the next item, along with the length of its `repr`.
+        """
+        key = self.items[len(self.results)][0]
+        self.results.append((key, trimmed))
+        self.changed = self.changed or trimmed is not item
+        # The budget counts strings without quotes, see `force_str`
+        if isinstance(trimmed, str):
+            self.size += len(trimmed)
+        elif type(trimmed) in (dict, list, tuple):
+            self.size += length
+        else:
+            self.size += len(force_str(trimmed))
+        self.length += length + 2
+        if isinstance(self.value, dict):
+            self.size += 1
+            self.length += len(repr(key)) + 2
+        self.full = self.size >= max_size
+
+    def result(self, stats: TrimStats | None) -> tuple[Any, int]:
+        """
+        Returns the trimmed value, along with the length of its `repr`.
+        """
+        dropped = len(self.items) - len(self.results)
+        if stats is not None:
+            stats.dropped_items += dropped
+        length = max(self.length, 2)
+        if isinstance(self.value, tuple) and len(self.results) == 1:
+            length += 1
+
+        # Subtrees which didn't need trimming are returned as they are, rather than copied
+        if not self.changed and not dropped:
+            return self.value, length
+        if isinstance(self.value, dict):
+            return dict(self.results), length
+        items = [trimmed for _, trimmed in self.results]
+        return tuple(items) if isinstance(self.value, tuple) else items, length
+
+
+def _trim_string(value: str, max_size: int, stats: TrimStats | None) -> str:
+    trimmed = truncatechars(value, max_size)
+    if trimmed is not value and stats is not None:
+        stats.truncated_strings += 1
+        stats.truncated_chars += len(value) - len(trimmed) + 3
+    return trimmed
+
+
+def _serialize(value: Any, stats: TrimStats | None) -> str:
+    if isinstance(value, str):
+        return value
+    if stats is not None:
+        stats.serialized_values += 1
+    return json.dumps(value)
+
+
 def trim(
     value,
     max_size=settings.SENTRY_MAX_VARIABLE_SIZE,
     max_depth=6,
     _depth=0,
     _size=0,
+    stats: TrimStats | None = None,
 ):
     """
     Truncates a value to ```MAX_VARIABLE_SIZE```.
 
-    The method of truncation depends on the type of value.
-    """
-    options = {
-        "max_depth": max_depth,
-        "max_size": max_size,
-        "_depth": _depth + 1,
-    }
+    The method of truncation depends on the type of value. Strings are truncated, and dicts
+    and lists are cut off once the size of their items exceeds the remaining budget. Values
+    nested deeper than `max_depth` are serialized to JSON and truncated as strings.
 
+    Dicts, lists and tuples which don't need trimming are returned as they are rather than
+    copied. Pass `stats` to find out how much was trimmed.
+    """
     if _depth > max_depth:
-        if not isinstance(value, str):
-            value = json.dumps(value)
-        return trim(value, _size=_size, max_size=max_size)
-
-    elif isinstance(value, dict):
-        result: Any = {}
-        _size += 2
-        for k in sorted(value.keys(), key=lambda x: (len(force_str(value[x])), x)):
-            v = value[k]
-            trim_v = trim(v, _size=_size, **options)
-            result[k] = trim_v
-            _size += len(force_str(trim_v)) + 1
-            if _size >= max_size:
-                break
-
-    elif isinstance(value, (list, tuple)):
-        result = []
-        _size += 2
-        for v in value:
-            trim_v = trim(v, _size=_size, **options)
-            result.append(trim_v)
-            _size += len(force_str(trim_v))
-            if _size >= max_size:
-                break
-        if isinstance(value, tuple):
-            result = tuple(result)
-
+        return _trim_string(_serialize(value, stats), max_size - _size, stats)
     elif isinstance(value, str):
-        result = truncatechars(value, max_size - _size)
-
-    else:
-        result = value
-
-    return result
+        return _trim_string(value, max_size - _size, stats)
+    elif not isinstance(value, (dict, list, tuple)):
+        return value
+
+    # Containers are walked with an explicit stack rather than recursively, so that deeply
+    # nested values don't hit the recursion limit
+    stack = [_Frame(value, _depth, _size)]
+    while True:
+        frame = stack[-1]
+        while not frame.full and len(frame.results) < len(frame.items):
+            item = frame.items[len(frame.results)][1]
+            if frame.depth >= max_depth:
+                trimmed = _trim_string(_serialize(item, stats), max_size - frame.size, stats)
+            elif isinstance(item, (dict, list, tuple)):
+                stack.append(_Frame(item, frame.depth + 1, frame.size))
+                break
+            elif isinstance(item, str):
+                trimmed = _trim_string(item, max_size - frame.size, stats)
+            else:
+                trimmed = item
+            frame.add(item, trimmed, len(repr(trimmed)), max_size)
+        else:
+            stack.pop()
+            trimmed, length = frame.result(stats)
+            if not stack:
+                return trimmed
+            stack[-1].add(frame.value, trimmed, length, max_size)
 
 
 def get_path(data: PathSearchable, *path, should_log=False, **kwargs):
@@ -10,7 +10,7 @@ import time
 from collections import namedtuple
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
 from concurrent.futures import ThreadPoolExecutor
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from hashlib import sha1
@@ -23,9 +23,10 @@ import urllib3
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.core.cache import cache
-from snuba_sdk import DeleteQuery, MetricsQuery, Request
+from snuba_sdk import Column, Condition, DeleteQuery, MetricsQuery, Op, Query, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -1123,6 +1124,9 @@ def _apply_cache_and_build_results(
         for query_pos, snuba_request in snuba_requests_list:
             to_query.append((query_pos, snuba_request, None))
 
+    if to_query and options.get("snuba.query-singleflight.referrers"):
+        to_query = _apply_singleflight(to_query, results)
+
     if to_query:
         query_results = _bulk_snuba_query([item[1] for item in to_query])
         for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
@@ -1140,6 +1144,143 @@ def _apply_cache_and_build_results(
     return [result[1] for result in results]
 
 
+# Columns the end of a query's time range is read from to pick the TTL of
+# shared singleflight results.
+_QUERY_END_COLUMNS = frozenset(["timestamp", "finish_ts", "end_timestamp", "time"])
+
+
+def _get_query_end(request: Request) -> datetime | None:
+    """
+    Return the (exclusive) end of the time range a SnQL query covers, if it
+    can be read from its top-level conditions.
+    """
+    if not isinstance(request.query, Query):
+        return None
+
+    end = None
+    for condition in request.query.where or ():
+        if (
+            isinstance(condition, Condition)
+            and isinstance(condition.lhs, Column)
+            and condition.lhs.name in _QUERY_END_COLUMNS
+            and condition.op in (Op.LT, Op.LTE)
+            and isinstance(condition.rhs, datetime)
+        ):
+            value = condition.rhs
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            end = value if end is None else min(end, value)
+    return end
+
+
+def get_singleflight_ttl(request: Request) -> int:
+    """
+    Results of queries whose time range ends in the past can't change much
+    anymore and are shared for longer: the TTL grows with the age of the end
+    of the time range, between the configured minimum and maximum.
+    """
+    min_ttl = options.get("snuba.query-singleflight.min-ttl")
+    max_ttl = options.get("snuba.query-singleflight.max-ttl")
+    end = _get_query_end(request)
+    if end is None:
+        return min_ttl
+
+    age = (datetime.now(timezone.utc) - end).total_seconds()
+    return int(min(max_ttl, max(min_ttl, age * options.get("snuba.query-singleflight.ttl-ratio"))))
+
+
+def _apply_singleflight(
+    to_query: list[tuple[int, SnubaRequest, str | None]],
+    results: list[tuple[int, Any]],
+) -> list[tuple[int, SnubaRequest, str | None]]:
+    """
+    Deduplicate identical in-flight queries across web workers.
+
+    For every eligible request, a short-lived shared result is looked up
+    first. On a miss, the first worker to take the Redis lock for the query
+    runs it and shares the result, while every other worker waits for that
+    result instead of querying Snuba itself. Results found this way are
+    appended to `results`, the requests that still need to be sent to Snuba
+    are returned.
+    """
+    from sentry.locks import locks
+    from sentry.utils.locking import UnableToAcquireLock
+
+    referrers = set(options.get("snuba.query-singleflight.referrers"))
+
+    def metric_tags(snuba_request: SnubaRequest, result: str) -> dict[str, str]:
+        return {"referrer": snuba_request.referrer or "unknown", "result": result}
+
+    leaders: list[tuple[int, SnubaRequest, str, str | None]] = []
+    followers: list[tuple[int, SnubaRequest, str]] = []
+    remaining: list[tuple[int, SnubaRequest, str | None]] = []
+
+    with ExitStack() as held_locks:
+        for query_pos, snuba_request, opt_cache_key in to_query:
+            # Consistent reads must always see the latest data.
+            if snuba_request.referrer not in referrers or snuba_request.request.flags.consistent:
+                remaining.append((query_pos, snuba_request, opt_cache_key))
+                continue
+
+            result_key = f"{get_cache_key(snuba_request.request)}:sf"
+            cached_result = cache.get(result_key)
+            if cached_result is not None:
+                metrics.incr("snuba.query_singleflight", tags=metric_tags(snuba_request, "hit"))
+                results.append((query_pos, json.loads(cached_result)))
+                continue
+
+            lock = locks.get(
+                f"{result_key}:lock",
+                duration=options.get("snuba.query-singleflight.lock-duration"),
+                name="snuba_singleflight",
+            )
+            try:
+                held_locks.enter_context(lock.acquire())
+            except UnableToAcquireLock:
+                followers.append((query_pos, snuba_request, result_key))
+            else:
+                metrics.incr("snuba.query_singleflight", tags=metric_tags(snuba_request, "miss"))
+                leaders.append((query_pos, snuba_request, result_key, opt_cache_key))
+
+        if leaders:
+            query_results = _bulk_snuba_query([item[1] for item in leaders])
+            for result, (query_pos, snuba_request, result_key, opt_cache_key) in zip(
+                query_results, leaders
+            ):
+                value = json.dumps(result)
+                cache.set(result_key, value, get_singleflight_ttl(snuba_request.request))
+                if opt_cache_key:
+                    cache.set(opt_cache_key, value, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+                results.append((query_pos, result))
+
+    deadline = time.monotonic() + options.get("snuba.query-singleflight.wait-timeout")
+    delay = 0.01
+    while followers:
+        shared = cache.get_many([result_key for _, _, result_key in followers])
+        waiting = []
+        for query_pos, snuba_request, result_key in followers:
+            if result_key in shared:
+                metrics.incr(
+                    "snuba.query_singleflight", tags=metric_tags(snuba_request, "coalesced")
+                )
+                results.append((query_pos, json.loads(shared[result_key])))
+            else:
+                waiting.append((query_pos, snuba_request, result_key))
+        followers = waiting
+
+        if followers and time.monotonic() + delay > deadline:
+            # The leader is taking too long or failed, run the queries ourselves.
+            for query_pos, snuba_request, _ in followers:
+                metrics.incr("snuba.query_singleflight", tags=metric_tags(snuba_request, "timeout"))
+                remaining.append((query_pos, snuba_request, None))
+            break
+        elif followers:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+    return remaining
+
+
 def _is_rejected_query(body: Any) -> bool:
     return (
         "quota_allowance" in body
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from sentry.api.serializers import serialize
+from sentry.api.serializers.loader import AttrsLoader
+from sentry.api.serializers.models.group import GroupSerializerSnuba
+from sentry.models.groupassignee import GroupAssignee
+from sentry.models.groupbookmark import GroupBookmark
+from sentry.models.groupsnooze import GroupSnooze
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark, requires_snuba
+
+pytestmark = [requires_snuba]
+
+NUM_GROUPS = 100
+
+
+@pytest.fixture
+def groups(factories, default_project, default_user):
+    groups = [factories.create_group(project=default_project) for _ in range(NUM_GROUPS)]
+    for group in groups[::3]:
+        GroupBookmark.objects.create(project=default_project, group=group, user_id=default_user.id)
+    for group in groups[1::3]:
+        GroupAssignee.objects.create(project=default_project, group=group, user_id=default_user.id)
+    for group in groups[2::3]:
+        GroupSnooze.objects.create(group=group, count=100, actor_id=default_user.id)
+    return groups
+
+
+# Lookups running on the loader's threads use their own database connections, which only see
+# committed data.
+@django_db_all(transaction=True)
+@requires_pytest_benchmark
+@pytest.mark.parametrize("concurrent", [False, True], ids=["sequential", "concurrent"])
+def test_benchmark_group_serializer(concurrent, groups, default_user, benchmark):
+    loaders: list[AttrsLoader] = []
+    original_load = AttrsLoader.load
+
+    def load(self):
+        loaders.append(self)
+        return original_load(self)
+
+    with (
+        override_options({"api.serializers.group.concurrent-attrs": concurrent}),
+        patch.object(AttrsLoader, "load", load),
+    ):
+        result = benchmark.pedantic(
+            serialize, args=(groups, default_user, GroupSerializerSnuba()), rounds=5
+        )
+
+    assert len(result) == NUM_GROUPS
+    assert sum(r["isBookmarked"] for r in result) == len(groups[::3])
+    benchmark.extra_info["queries"] = sum(loaders[-1].query_counts.values())
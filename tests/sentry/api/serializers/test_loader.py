@@ -0,0 +1,118 @@
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from sentry.api.serializers.loader import AttrsLoader
+from sentry.models.group import Group
+from sentry.testutils.pytest.fixtures import django_db_all
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_requires(concurrent):
+    loader = AttrsLoader("test", concurrent=concurrent)
+    loader.add("a", lambda: 1)
+    loader.add("b", lambda a: a + 1, requires=("a",))
+    loader.add("c", lambda a, b: a + b, requires=("a", "b"))
+
+    assert loader.load() == {"a": 1, "b": 2, "c": 3}
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_batch_merges_requests(concurrent):
+    calls = []
+
+    def get_users(user_ids):
+        calls.append(user_ids)
+        return {user_id: f"user-{user_id}" for user_id in user_ids}
+
+    loader = AttrsLoader("test", concurrent=concurrent)
+    loader.add_batch("users", get_users)
+    loader.add("snoozes", lambda: loader.request("users", [1, 2]), batches=("users",))
+    loader.add("resolutions", lambda: loader.request("users", [2, 3]), batches=("users",))
+    loader.add("actors", lambda users: users[3], requires=("users",))
+
+    results = loader.load()
+    assert calls == [{1, 2, 3}]
+    assert results["users"] == {1: "user-1", 2: "user-2", 3: "user-3"}
+    assert results["actors"] == "user-3"
+
+
+def test_batch_without_requests():
+    loader = AttrsLoader("test")
+    loader.add_batch("users", lambda user_ids: pytest.fail("unexpected call"))
+    loader.add("snoozes", lambda: None, batches=("users",))
+
+    assert loader.load()["users"] == {}
+
+
+def test_concurrent():
+    # Both lookups only finish once the other one has started
+    barrier = threading.Barrier(2, timeout=5)
+    loader = AttrsLoader("test", concurrent=True)
+    loader.add("a", barrier.wait)
+    loader.add("b", barrier.wait)
+
+    assert set(loader.load()) == {"a", "b"}
+
+
+def test_concurrent_context():
+    var: ContextVar[str] = ContextVar("test_concurrent_context", default="unset")
+    loader = AttrsLoader("test", concurrent=True)
+    loader.add("a", var.get)
+
+    token = var.set("set")
+    try:
+        assert loader.load() == {"a": "set"}
+    finally:
+        var.reset(token)
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_error(concurrent):
+    def fail():
+        raise ValueError("lookup failed")
+
+    loader = AttrsLoader("test", concurrent=concurrent)
+    loader.add("a", fail)
+    loader.add("b", lambda a: a, requires=("a",))
+
+    with pytest.raises(ValueError, match="lookup failed"):
+        loader.load()
+
+
+def test_invalid_requirements():
+    loader = AttrsLoader("test")
+    loader.add("a", lambda b: b, requires=("b",))
+    with pytest.raises(ValueError, match="unknown"):
+        loader.load()
+
+    loader = AttrsLoader("test")
+    loader.add("a", lambda b: b, requires=("b",))
+    loader.add("b", lambda a: a, requires=("a",))
+    with pytest.raises(ValueError, match="circular"):
+        loader.load()
+
+    with pytest.raises(ValueError, match="already registered"):
+        loader.add("a", lambda: None)
+
+
+@django_db_all
+def test_query_counts(default_project):
+    loader = AttrsLoader("test")
+    loader.add("none", lambda: None)
+    loader.add("groups", lambda: list(Group.objects.filter(project=default_project)))
+
+    loader.load()
+    assert loader.query_counts == {"none": 0, "groups": 1}
+
+
+@django_db_all
+def test_concurrent_in_transaction(default_project):
+    # Tests run in a transaction, whose writes the pool's connections couldn't see
+    group = Group.objects.create(project=default_project)
+    loader = AttrsLoader("test", concurrent=True)
+    loader.add("thread", threading.get_ident)
+    loader.add("groups", lambda: list(Group.objects.filter(id=group.id)))
+
+    assert loader.load() == {"thread": threading.get_ident(), "groups": [group]}
@@ -211,6 +211,68 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    def test_incr_coalesced(self):
+        self.buf.coalesce_window = 60
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1}, extra={"foo": "bar"})
+        self.buf.incr(model, {"times_seen": 2}, {"pk": 1}, extra={"foo": "baz"})
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2}, signal_only=True)
+        assert client.zrange("b:p", 0, -1) == []
+
+        self.buf.flush_coalesced()
+        assert self.buf.get(model, ["times_seen"], {"pk": 1}) == {"times_seen": 3}
+        assert self.buf.get(model, ["times_seen"], {"pk": 2}) == {"times_seen": 1}
+
+        key = self.buf._make_key(model, filters={"pk": 1})
+        result = _hgetall_decode_keys(client, key, self.buf.is_redis_cluster)
+        if self.buf.is_redis_cluster:
+            assert self.buf._load_value(json.loads(result["e+foo"])) == "baz"
+        else:
+            assert pickle.loads(result["e+foo"]) == "baz"
+        other_key = self.buf._make_key(model, filters={"pk": 2})
+        assert "s" in _hgetall_decode_keys(client, other_key, self.buf.is_redis_cluster)
+
+        pending = client.zrange("b:p", 0, -1)
+        if not self.buf.is_redis_cluster:
+            pending = [k.decode("utf-8") for k in pending]
+        assert sorted(pending) == sorted([key, other_key])
+
+    def test_incr_coalesced_flushes_at_max_keys(self):
+        self.buf.coalesce_window = 60
+        self.buf.coalesce_max_keys = 2
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        assert self.buf.get(model, ["times_seen"], {"pk": 1}) == {"times_seen": 0}
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+        assert self.buf.get(model, ["times_seen"], {"pk": 1}) == {"times_seen": 1}
+        assert self.buf.get(model, ["times_seen"], {"pk": 2}) == {"times_seen": 1}
+        assert self.buf._coalesced == {}
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batched(self, process):
+        self.buf.batched_process = True
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        keys = []
+        for pk in range(1, 51):
+            self.buf.incr(Group, {"times_seen": pk}, {"pk": pk})
+            keys.append(self.buf._make_key(Group, {"pk": pk}))
+
+        locked_key = keys[0]
+        client.set(self.buf._make_lock_key(locked_key), "1")
+        self.buf.process(batch_keys=keys)
+
+        assert sorted(process.mock_calls, key=lambda call: call.args[2]["pk"]) == [
+            mock.call(Group, {"times_seen": pk}, {"pk": pk}, {}, None) for pk in range(2, 51)
+        ]
+        for key in keys[1:]:
+            assert not client.exists(key)
+            assert not client.exists(self.buf._make_lock_key(key))
+        # the locked key is left for the next run
+        assert client.exists(locked_key)
+
     def group_rule_data_by_project_id(self, buffer, project_ids):
         project_ids_to_rule_data = defaultdict(list)
         for proj_id in project_ids:
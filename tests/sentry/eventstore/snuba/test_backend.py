@@ -2,10 +2,12 @@ from unittest import mock
 
 from snuba_sdk import Column, Condition, Op
 
+from sentry import nodestore
 from sentry.eventstore.base import Filter
 from sentry.eventstore.models import Event
 from sentry.eventstore.snuba.backend import SnubaEventStorage
 from sentry.issues.grouptype import PerformanceNPlusOneGroupType
+from sentry.nodestore.local_cache import get_caller, use_local_cache
 from sentry.testutils.cases import PerformanceIssueTestCase, SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now
 from sentry.utils import snuba
@@ -123,6 +125,69 @@ class SnubaEventStorageTest(TestCase, SnubaTestCase, PerformanceIssueTestCase):
         assert events[1].event_id == "b" * 32
         assert events[2].event_id == "a" * 32
 
+    def test_iter_events(self):
+        filter = Filter(
+            project_ids=[self.project1.id, self.project2.id],
+            conditions=[["type", "!=", "transaction"]],
+        )
+        tenant_ids = {"organization_id": 123, "referrer": "r"}
+
+        events = list(self.eventstore.iter_events(filter, batch_size=2, tenant_ids=tenant_ids))
+        assert [event.event_id for event in events] == ["c" * 32, "b" * 32, "a" * 32]
+        assert all(event.data._node_data for event in events)
+
+        events = list(
+            self.eventstore.iter_events(filter, limit=2, batch_size=1, tenant_ids=tenant_ids)
+        )
+        assert [event.event_id for event in events] == ["c" * 32, "b" * 32]
+
+        project = self.create_project()
+        assert list(self.eventstore.iter_events(Filter(project_ids=[project.id]))) == []
+
+        with mock.patch.object(snuba, "aliased_query", wraps=snuba.aliased_query) as query:
+            events = self.eventstore.iter_events(filter, batch_size=2, tenant_ids=tenant_ids)
+            assert next(events).event_id == "c" * 32
+            # Without pipelining, a page is handed out before the next one is queried
+            assert query.call_count == 1
+
+    def test_iter_events_pipelined(self):
+        filter = Filter(
+            project_ids=[self.project1.id, self.project2.id],
+            conditions=[["type", "!=", "transaction"]],
+        )
+        tenant_ids = {"organization_id": 123, "referrer": "r"}
+        # Nodes are fetched on other threads, which don't see the data of the test transaction
+        nodes = {
+            event.data.id: event.data.data for event in (self.event1, self.event2, self.event3)
+        }
+        callers = []
+
+        def get_multi_side_effect(node_ids):
+            callers.append(get_caller())
+            return {node_id: nodes[node_id] for node_id in node_ids}
+
+        with (
+            self.options(
+                {
+                    "eventstore.iter-events.pipelined": True,
+                    "nodestore.local-cache.max-bytes": 1024 * 1024,
+                }
+            ),
+            mock.patch.object(
+                nodestore.backend, "get_multi", side_effect=get_multi_side_effect
+            ) as get_multi,
+            use_local_cache("test"),
+        ):
+            events = self.eventstore.iter_events(filter, batch_size=2, tenant_ids=tenant_ids)
+            event = next(events)
+            assert event.event_id == "c" * 32
+            assert event.data["event_id"] == "c" * 32
+            assert [event.event_id for event in events] == ["b" * 32, "a" * 32]
+            # One fetch per page
+            assert get_multi.call_count == 2
+            # The pool sees the scopes of the caller
+            assert callers == ["test", "test"]
+
     @mock.patch("sentry.nodestore.get_multi")
     def test_get_unfetched_events(self, get_multi):
         events = self.eventstore.get_unfetched_events(
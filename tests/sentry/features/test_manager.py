@@ -59,6 +59,27 @@ class MockUserBatchHandler(features.BatchFeatureHandler):
         raise NotImplementedError("unreachable")
 
 
+class CountingEntityHandler(MockBatchHandler):
+    features = {"organizations:feature", "organizations:entity-feature", "projects:feature"}
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.has_calls = 0
+        self.batch_has_calls = 0
+
+    def has(self, feature, actor, skip_entity=False):
+        self.has_calls += 1
+        return self.enabled
+
+    def batch_has(self, feature_names, *args: Any, **kwargs: Any):
+        self.batch_has_calls += 1
+        results = super().batch_has(feature_names, *args, **kwargs)
+        return {
+            key: {name: self.enabled for name in feature_results}
+            for key, feature_results in results.items()
+        }
+
+
 class FeatureManagerTest(TestCase):
     def test_feature_registry(self):
         manager = features.FeatureManager()
@@ -415,3 +436,69 @@ class FeatureManagerTest(TestCase):
         manager = features.FeatureManager()
         with pytest.raises(NotImplementedError):
             manager.add("users:some-test", OrganizationFeature, FeatureHandlerStrategy.OPTIONS)
+
+    @override_options({"features.evaluation-cache.enabled": True})
+    def test_evaluation_scope(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        manager.add("projects:feature", ProjectFeature)
+        handler = CountingEntityHandler()
+        manager.add_entity_handler(handler)
+
+        with manager.evaluation_scope("test"):
+            for _ in range(3):
+                assert manager.has("organizations:feature", self.organization)
+                assert manager.has("projects:feature", self.project, actor=self.user)
+
+            # Both entities were prefetched on first use
+            assert handler.batch_has_calls == 2
+            assert handler.has_calls == 0
+
+            # Flags changed within the scope are not visible
+            handler.enabled = False
+            assert manager.has("organizations:feature", self.organization)
+
+        # But they are in the next one
+        with manager.evaluation_scope("test"):
+            assert not manager.has("organizations:feature", self.organization)
+
+        # Outside of a scope, every check is evaluated
+        manager.has("organizations:feature", self.organization)
+        manager.has("organizations:feature", self.organization)
+        assert handler.has_calls == 2
+
+    @override_options({"features.evaluation-cache.enabled": True})
+    def test_evaluation_scope_registered_handler(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        manager.add("organizations:entity-feature", OrganizationFeature)
+        registered_handler = mock.Mock(return_value=False)
+        registered_handler.features = ["organizations:feature"]
+        manager.add_handler(registered_handler)
+        handler = CountingEntityHandler()
+        manager.add_entity_handler(handler)
+
+        with manager.evaluation_scope("test"):
+            # Registered handlers take precedence over the prefetched results
+            assert not manager.has("organizations:feature", self.organization)
+            assert not manager.has("organizations:feature", self.organization)
+            assert manager.has("organizations:entity-feature", self.organization)
+            # The entity handler is skipped without being prefetched
+            manager.has("organizations:entity-feature", self.organization, skip_entity=True)
+
+        assert len(registered_handler.mock_calls) == 1
+        assert handler.batch_has_calls == 1
+        assert handler.has_calls == 0
+
+    def test_evaluation_scope_disabled(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        handler = CountingEntityHandler()
+        manager.add_entity_handler(handler)
+
+        with manager.evaluation_scope("test"):
+            manager.has("organizations:feature", self.organization)
+            manager.has("organizations:feature", self.organization)
+
+        assert handler.batch_has_calls == 0
+        assert handler.has_calls == 2
@@ -1,21 +1,15 @@
 import pytest
 
+from sentry.grouping.parameterization import Parameterizer, UniqueIdExperiment
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.safe import get_path
 from tests.sentry.grouping import GROUPING_INPUTS_DIR, GroupingInput, get_grouping_inputs
 
 GROUPING_INPUTS = get_grouping_inputs(GROUPING_INPUTS_DIR)
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name",
     sorted(CONFIGURATIONS.keys()),
@@ -37,3 +31,49 @@ def run_configuration(grouping_input: GroupingInput, config_name: str) -> None:
     event.project = None  # type: ignore[assignment]
 
     event.get_hashes()
+
+
+def _get_messages(grouping_input: GroupingInput) -> list[str]:
+    data = grouping_input.data
+    messages = [
+        get_path(data, "logentry", "formatted"),
+        get_path(data, "logentry", "message"),
+        data.get("message"),
+    ]
+    messages.extend(
+        get_path(exception, "value")
+        for exception in get_path(data, "exception", "values", filter=True) or ()
+    )
+    return [message for message in messages if isinstance(message, str) and message]
+
+
+@requires_pytest_benchmark
+def test_benchmark_parameterization(benchmark):
+    messages = [
+        message for grouping_input in GROUPING_INPUTS for message in _get_messages(grouping_input)
+    ]
+
+    def run():
+        for message in messages:
+            parameterizer = Parameterizer(
+                regex_pattern_keys=(
+                    "email",
+                    "url",
+                    "hostname",
+                    "ip",
+                    "uuid",
+                    "sha1",
+                    "md5",
+                    "date",
+                    "duration",
+                    "hex",
+                    "float",
+                    "int",
+                    "quoted_str",
+                    "bool",
+                ),
+                experiments=(UniqueIdExperiment,),
+            )
+            parameterizer.parameterize_all(message)
+
+    benchmark(run)
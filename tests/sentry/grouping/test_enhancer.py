@@ -11,6 +11,8 @@ from sentry.grouping.component import FrameGroupingComponent, StacktraceGrouping
 from sentry.grouping.enhancer import (
     ENHANCEMENT_BASES,
     Enhancements,
+    clear_enhancements_cache,
+    get_rust_enhancements,
     is_valid_profiling_action,
     is_valid_profiling_matcher,
     keep_profiling_rules,
@@ -139,6 +141,26 @@ def test_parse_empty_with_base():
     assert enhancements
 
 
+def test_enhancements_are_cached():
+    clear_enhancements_cache()
+    rules = "function:foo -app"
+    enhancements = Enhancements.from_rules_text(rules, bases=["newstyle:2023-01-11"])
+
+    assert Enhancements.from_rules_text(rules, bases=["newstyle:2023-01-11"]) is enhancements
+    assert Enhancements.from_rules_text(rules) is not enhancements
+    assert Enhancements.from_rules_text(rules, version=3) is not enhancements
+
+    base64_string = enhancements.base64_string
+    with mock.patch(
+        "sentry.grouping.enhancer.get_rust_enhancements", wraps=get_rust_enhancements
+    ) as parse:
+        from_base64 = Enhancements.from_base64_string(base64_string)
+        assert Enhancements.from_base64_string(base64_string) is from_base64
+        assert Enhancements.from_base64_string(base64_string.encode("ascii")) is from_base64
+    assert parse.call_count == 1
+    assert from_base64.base64_string == base64_string
+
+
 def test_parsing_errors():
     with pytest.raises(InvalidEnhancerConfig):
         Enhancements.from_rules_text("invalid.message:foo -> bar")
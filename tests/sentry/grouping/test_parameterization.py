@@ -6,6 +6,7 @@ from sentry.grouping.parameterization import (
     ParameterizationRegexExperiment,
     Parameterizer,
     UniqueIdExperiment,
+    _UniqueId,
 )
 
 
@@ -268,6 +269,41 @@ def test_parameterize_regex_experiment_cached_compiled():
     mocked_pattern.assert_called_once()
 
 
+def test_parameterize_skips_regex_without_candidates(parameterizer):
+    with mock.patch.object(Parameterizer, "_make_regex_from_patterns") as make_regex:
+        assert parameterizer.parametrize_w_regex("blah had a problem") == "blah had a problem"
+
+    make_regex.assert_not_called()
+    assert parameterizer.matches_counter == {}
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "blah had a problem at /var/log",
+        "connection to db-1.internal failed",
+        "call to datetime.datetime(now) failed",
+        'user="bob" enabled=false',
+        "deadbeefdeadbeefdeadbeefdeadbeef is not known",
+    ],
+)
+def test_parameterize_prefilter_matches_full_regex(input, parameterizer):
+    full_regex = parameterizer._parameterization_regex
+    expected = full_regex.sub(lambda match: f"<{match.lastgroup}>", input)
+    assert parameterizer.parametrize_w_regex(input) == expected
+
+
+def test_uniq_id_token_count_cached():
+    _UniqueId.num_tokens_from_string.cache_clear()
+    with mock.patch.object(_UniqueId, "tiktoken_encoding") as encoding:
+        encoding.return_value.encode.return_value = [1, 2, 3]
+        assert _UniqueId.num_tokens_from_string("2d896d92") == 3
+        assert _UniqueId.num_tokens_from_string("2d896d92") == 3
+
+    encoding.return_value.encode.assert_called_once_with("2d896d92")
+    _UniqueId.num_tokens_from_string.cache_clear()
+
+
 # These are test cases that we should fix
 @pytest.mark.xfail()
 @pytest.mark.parametrize(
@@ -7,6 +7,7 @@ from sentry.models.repository import Repository
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, resolve_actors
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import assume_test_silo_mode_of
 from sentry.testutils.skips import requires_snuba
 from sentry.types.actor import Actor, ActorType
@@ -773,6 +774,13 @@ class ProjectOwnershipTestCase(TestCase):
         assert assignee.team_id == processing_team.id
 
 
+@override_options({"ownership.rule-index.enabled": True})
+class ProjectOwnershipRuleIndexTestCase(ProjectOwnershipTestCase):
+    """
+    Runs the tests above with rules matched through `sentry.ownership.index`.
+    """
+
+
 class ResolveActorsTestCase(TestCase):
     def test_no_actors(self):
         assert resolve_actors([], self.project.id) == {}
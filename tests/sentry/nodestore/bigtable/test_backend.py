@@ -9,6 +9,8 @@ from google.cloud.bigtable.row_data import DEFAULT_RETRY_READ_ROWS
 from google.rpc.status_pb2 import Status
 
 from sentry.nodestore.bigtable.backend import BigtableNodeStorage
+from sentry.nodestore.compression import decode, encode
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
 
@@ -175,3 +177,15 @@ def test_compression() -> None:
     assert ns.store.compression == "zlib"
     ns = BigtableNodeStorage(compression=False)
     assert ns.store.compression is None
+
+
+@pytest.mark.django_db
+def test_codec_blobs_are_not_compressed_again() -> None:
+    ns = MockedBigtableNodeStorage(project="test", compression="zstd")
+    with override_options({"nodestore.compression": "zstd"}):
+        ns.set("a" * 32, {"foo": "bar"})
+
+    columns = ns.store._get_table()._rows[b"a" * 32]
+    assert ns.store.flags_column not in columns
+    assert columns[ns.store.data_column][0].value == encode(b'{"foo":"bar"}', "zstd")
+    assert decode(ns._get_bytes("a" * 32)) == b'{"foo":"bar"}'
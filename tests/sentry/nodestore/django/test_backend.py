@@ -1,3 +1,4 @@
+import base64
 import pickle
 from datetime import timedelta
 from unittest import mock
@@ -6,8 +7,10 @@ import pytest
 from django.utils import timezone
 
 from sentry.nodestore.base import json_dumps
+from sentry.nodestore.compression import encode
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.nodestore.django.models import Node
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils.strings import compress
 
@@ -52,6 +55,25 @@ class TestDjangoNodeStorage:
             b'{"foo":"bar"}'
         )
 
+    @pytest.mark.parametrize("codec", ["zlib", "zstd"])
+    def test_set_with_codec(self, codec):
+        with override_options({"nodestore.compression": codec}):
+            self.ns.set("d2502ebbd7df41ceba8d3275595cac33", {"foo": "bar"})
+
+        # Blobs compressed by the codec aren't compressed a second time
+        assert Node.objects.get(id="d2502ebbd7df41ceba8d3275595cac33").data == base64.b64encode(
+            encode(b'{"foo":"bar"}', codec)
+        ).decode("utf-8")
+        assert self.ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "bar"}
+
+    def test_get_compressed_codec_blob(self):
+        # Written before codec blobs were stored without compression
+        node = Node.objects.create(
+            id="d2502ebbd7df41ceba8d3275595cac33", data=compress(encode(b'{"foo": "bar"}', "zstd"))
+        )
+
+        assert self.ns.get(node.id) == {"foo": "bar"}
+
     def test_delete(self):
         node = Node.objects.create(id="d2502ebbd7df41ceba8d3275595cac33", data='{"foo": "bar"}')
 
@@ -0,0 +1,65 @@
+import os
+import uuid
+
+import pytest
+from django.test import override_settings
+
+from sentry.constants import DATA_ROOT
+from sentry.nodestore import compression
+from sentry.nodestore.base import json_dumps
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from sentry.utils.samples import load_data
+
+COPIES_PER_SAMPLE = 20
+
+
+def load_nodes() -> list[bytes]:
+    """
+    Copies of the sample events shipped in `sentry/data/samples`, as nodestore would write
+    them.
+    """
+    samples_dir = os.path.join(DATA_ROOT, "samples")
+    platforms = sorted(name[: -len(".json")] for name in os.listdir(samples_dir))
+
+    nodes = []
+    for platform in platforms:
+        for _ in range(COPIES_PER_SAMPLE):
+            data = load_data(platform)
+            if data is None:
+                continue
+            # Make the copies differ the same way real events do
+            data["event_id"] = uuid.uuid4().hex
+            nodes.append(json_dumps(json.loads(json.dumps(data))).encode("utf8"))
+    return nodes
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("codec", ["zlib", "zstd", "zstd+dict"])
+def test_benchmark_codecs(codec, benchmark, tmp_path):
+    # The dictionary is trained on half of the copies of each sample and the codecs are
+    # measured on the other half, so the dictionary never sees the exact blob it compresses
+    nodes = load_nodes()
+    training, nodes = nodes[::2], nodes[1::2]
+
+    compression.get_dictionary.cache_clear()
+    with override_settings(SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR=str(tmp_path)):
+        dictionary_id = 0
+        if codec == "zstd+dict":
+            dictionary_id = compression.write_dictionary(
+                compression.train_dictionary(training, 16 * 1024)
+            )
+
+        def run() -> list[bytes]:
+            encoded = [
+                compression.encode(node, codec.split("+")[0], dictionary_id) for node in nodes
+            ]
+            for value in encoded:
+                compression.decode(value)
+            return encoded
+
+        encoded = benchmark(run)
+
+    benchmark.extra_info["compression_ratio"] = sum(len(value) for value in encoded) / sum(
+        len(node) for node in nodes
+    )
@@ -4,6 +4,7 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 """
 
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
@@ -98,3 +99,70 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {"nodestore.set-subkeys.enable-set-cache-item": False, "nodestore.write-envelope": True}
+)
+def test_set_subkeys_envelope(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+    ns.set("node_1", {"foo": "a"})
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_read_legacy_after_envelope_rollout(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    with override_options({"nodestore.write-envelope": True}):
+        assert ns.get("node_1") == {"foo": "a"}
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_compressed(ns, codec):
+    with override_options({"nodestore.compression": codec}):
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+        assert ns.get("node_1") == {"foo": "a"}
+
+    # Blobs record their codec, so they stay readable after the option changes.
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.local-cache.max-bytes": 1024,
+    }
+)
+def test_local_cache(ns):
+    from sentry.nodestore.local_cache import local_cache, use_local_cache
+
+    local_cache.clear()
+    ns.set("node_1", {"foo": "a"})
+
+    with use_local_cache("test"):
+        assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+
+        with mock.patch.object(ns, "_get_bytes_multi") as get_bytes_multi:
+            result = ns.get_multi(["node_1"])
+            assert result == {"node_1": {"foo": "a"}}
+            # every read returns its own copy
+            result["node_1"]["foo"] = "mutated"
+            assert ns.get("node_1") == {"foo": "a"}
+        assert not get_bytes_multi.called
+
+        ns.set("node_1", {"foo": "b"})
+        assert ns.get("node_1") == {"foo": "b"}
+
+        ns.delete("node_1")
+        assert ns.get("node_1") is None
@@ -0,0 +1,52 @@
+import pytest
+from django.test import override_settings
+
+from sentry.nodestore import compression
+from sentry.nodestore.base import json_dumps
+
+
+def _nodes(count: int) -> list[bytes]:
+    return [
+        json_dumps(
+            {
+                "event_id": f"{i:032x}",
+                "platform": "python",
+                "message": f"Something went wrong in request {i}",
+                "tags": [["environment", "production"], ["level", "error"]],
+            }
+        ).encode("utf8")
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+def test_roundtrip(codec):
+    value = b'{"foo":"bar"}'
+    encoded = compression.encode(value, codec)
+    assert compression.is_encoded(encoded)
+    assert compression.decode(encoded) == value
+
+
+def test_decode_passthrough():
+    assert compression.decode(b'{"foo":"bar"}') == b'{"foo":"bar"}'
+
+
+def test_dictionary_roundtrip(tmp_path):
+    compression.get_dictionary.cache_clear()
+    nodes = _nodes(500)
+
+    with override_settings(SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR=str(tmp_path)):
+        dictionary_id = compression.write_dictionary(compression.train_dictionary(nodes, 4096))
+        assert (tmp_path / f"{dictionary_id}.zdict").exists()
+
+        encoded = compression.encode(nodes[0], "zstd", dictionary_id)
+        assert compression.decode(encoded) == nodes[0]
+        assert len(encoded) < len(compression.encode(nodes[0], "zstd"))
+
+
+def test_unknown_dictionary(tmp_path):
+    compression.get_dictionary.cache_clear()
+
+    with override_settings(SENTRY_NODESTORE_COMPRESSION_DICTIONARY_DIR=str(tmp_path)):
+        with pytest.raises(compression.UnknownDictionary):
+            compression.encode(b"{}", "zstd", 1234)
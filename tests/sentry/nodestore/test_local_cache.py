@@ -0,0 +1,50 @@
+from unittest import mock
+
+from sentry.nodestore.local_cache import LocalNodeCache, get_caller, use_local_cache
+from sentry.testutils.helpers import override_options
+
+
+@override_options({"nodestore.local-cache.max-bytes": 10, "nodestore.local-cache.ttl": 60})
+def test_lru_eviction_by_size():
+    cache = LocalNodeCache()
+    cache.set_many({"a": b"aaaa", "b": b"bbbb"})
+    assert cache.size == 8
+
+    # touch "a" so "b" becomes the least recently used entry
+    assert cache.get_many(["a"], "test") == {"a": b"aaaa"}
+
+    cache.set_many({"c": b"cccc"})
+    assert cache.get_many(["a", "b", "c"], "test") == {"a": b"aaaa", "c": b"cccc"}
+    assert cache.size == 8
+
+    # entries larger than the whole cache are never stored
+    cache.set_many({"d": b"d" * 11})
+    assert cache.get_many(["d"], "test") == {}
+
+
+@override_options({"nodestore.local-cache.max-bytes": 100, "nodestore.local-cache.ttl": 60})
+def test_ttl_and_delete():
+    cache = LocalNodeCache()
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set_many({"a": b"aaaa", "b": b"bbbb"})
+
+    cache.delete_many(["b"])
+    assert len(cache) == 1
+
+    with mock.patch("time.monotonic", return_value=1059.0):
+        assert cache.get_many(["a", "b"], "test") == {"a": b"aaaa"}
+    with mock.patch("time.monotonic", return_value=1061.0):
+        assert cache.get_many(["a"], "test") == {}
+    assert cache.size == 0
+
+
+def test_caller_scope():
+    with override_options({"nodestore.local-cache.max-bytes": 100}):
+        assert get_caller() is None
+        with use_local_cache("post_process"):
+            assert get_caller() == "post_process"
+        assert get_caller() is None
+
+    with override_options({"nodestore.local-cache.max-bytes": 0}):
+        with use_local_cache("post_process"):
+            assert get_caller() is None
@@ -348,6 +348,36 @@ class OptionsManagerTest(TestCase):
         with pytest.raises(UnknownOption):
             self.manager.unregister("does-not-exist")
 
+    @patch("sentry.options.snapshot.OptionsSnapshot.start")
+    def test_snapshot(self, mock_start):
+        self.manager.register("bar", default="default")
+        self.manager.set("foo", "bar")
+        snapshot = self.manager.enable_snapshot(interval=60)
+        try:
+            assert self.manager.get("foo") == "bar"
+            assert self.manager.get("bar") == "default"
+            assert snapshot.values == {"foo": "bar", "bar": "default"}
+            with pytest.raises(UnknownOption):
+                self.manager.get("does-not-exist")
+
+            # Changes made elsewhere show up once the snapshot is refreshed
+            self.store.set(self.manager.lookup_key("foo"), "baz", UpdateChannel.UNKNOWN)
+            assert self.manager.get("foo") == "bar"
+            snapshot.refresh()
+            assert self.manager.get("foo") == "baz"
+            assert snapshot.version == 1
+
+            # Changes made in this process request a refresh right away
+            self.manager.set("foo", "qux")
+            assert snapshot._refresh_requested.is_set()
+            snapshot.refresh()
+            assert self.manager.get("foo") == "qux"
+            assert snapshot.version == 2
+        finally:
+            self.manager.disable_snapshot()
+
+        assert self.manager.snapshot is None
+
     def test_all(self):
         self.manager.register("bar")
 
@@ -0,0 +1,71 @@
+import random
+from typing import Any
+
+import pytest
+
+from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, load_schema
+from sentry.ownership.index import OwnershipRuleIndex
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_EVENTS = 20
+NUM_RULES = 5000
+NUM_FRAMES = 100
+
+EXTENSIONS = ["py", "js", "tsx", "go", "java", "rb"]
+
+
+def make_schema(rule_count: int) -> dict[str, Any]:
+    rules = []
+    for i in range(rule_count):
+        team = Owner("team", f"team-{i % 200}")
+        kind = i % 10
+        if kind == 0:
+            pattern = f"*.{EXTENSIONS[i % len(EXTENSIONS)]}"
+        elif kind < 5:
+            pattern = f"/src/service{i % 300}/module{i}/"
+        elif kind < 8:
+            pattern = f"src/**/handler{i}.{EXTENSIONS[i % len(EXTENSIONS)]}"
+        else:
+            pattern = f"/lib/package{i}/*"
+        rules.append(Rule(Matcher("codeowners", pattern), [team]))
+    return dump_schema(rules)
+
+
+def make_event(rng: random.Random, frame_count: int, rule_count: int) -> dict[str, Any]:
+    frames = []
+    for _ in range(frame_count):
+        i = rng.randrange(rule_count * 2)
+        extension = rng.choice(EXTENSIONS)
+        filename = rng.choice(
+            [
+                f"src/service{i % 300}/module{i}/file.{extension}",
+                f"src/app/handlers/handler{i}.{extension}",
+                f"lib/package{i}/index.{extension}",
+                f"vendor/thing{i}/main.{extension}",
+            ]
+        )
+        frames.append({"filename": filename, "abs_path": "/srv/app/" + filename, "in_app": True})
+    return {"platform": "python", "stacktrace": {"frames": frames}}
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("indexed", [False, True], ids=["all_rules", "index"])
+def test_benchmark_matching_rules(indexed, benchmark):
+    # A CODEOWNERS-sized schema, and events with deep stacktraces
+    rng = random.Random(0)
+    schema = make_schema(NUM_RULES)
+    events = [
+        (data, Matcher.munge_if_needed(data))
+        for data in (make_event(rng, NUM_FRAMES, NUM_RULES) for _ in range(NUM_EVENTS))
+    ]
+    index = OwnershipRuleIndex(load_schema(schema))
+
+    def run() -> list[list[Rule]]:
+        if indexed:
+            return [index.get_matching_rules(data, munged_data) for data, munged_data in events]
+        return [
+            [rule for rule in load_schema(schema) if rule.test(data, munged_data)]
+            for data, munged_data in events
+        ]
+
+    benchmark(run)
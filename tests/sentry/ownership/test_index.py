@@ -0,0 +1,100 @@
+from typing import Any
+
+import pytest
+
+from sentry.ownership.grammar import Matcher, Rule, dump_schema, parse_rules
+from sentry.ownership.index import OwnershipRuleIndex, _get_literal_segment, get_rule_index
+
+RULES = parse_rules(
+    """
+*.js                            #frontend
+path:src/sentry/*               david@sentry.io
+path:src/sentry/api/**/*.py     #api
+path:*/templates/*.html         #frontend
+path:static/app/components/?ar.tsx  #frontend
+url:http://google.com/*         #backend
+tags.foo:bar                    tagperson@sentry.io
+module:foo.bar                  #workflow
+codeowners:/src/sentry/models/  #models
+codeowners:docs/                #docs
+codeowners:*.md                 #docs
+codeowners:src/**/utils.py      #utils
+"""
+)
+
+EVENTS: list[dict[str, Any]] = [
+    {},
+    {"stacktrace": {"frames": [{"filename": "foo.js"}]}},
+    {"stacktrace": {"frames": [{"filename": "src/sentry/api/endpoints/thing.py"}]}},
+    {"stacktrace": {"frames": [{"abs_path": "C:\\src\\sentry\\models\\group.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "SRC/Sentry/Models/Group.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "app/templates/index.html"}]}},
+    {"stacktrace": {"frames": [{"filename": "static/app/components/bar.tsx"}]}},
+    {"stacktrace": {"frames": [{"filename": "docs/README.md", "in_app": False}]}},
+    {"stacktrace": {"frames": [{"filename": "src/sentry/utils/utils.py"}]}},
+    {"stacktrace": {"frames": [{"module": "foo.bar"}, {"filename": "src/other.rb"}]}},
+    {"request": {"url": "http://google.com/search"}},
+    {"tags": [["foo", "bar"]]},
+    {
+        "platform": "java",
+        "exception": {
+            "values": [
+                {
+                    "stacktrace": {
+                        "frames": [
+                            {"module": "io.sentry.example.Application", "filename": "App.java"}
+                        ]
+                    }
+                }
+            ]
+        },
+    },
+]
+
+
+@pytest.mark.parametrize("data", EVENTS)
+def test_matching_rules_identical(data: dict[str, Any]) -> None:
+    munged_data = Matcher.munge_if_needed(data)
+    expected = [rule for rule in RULES if rule.test(data, munged_data)]
+    assert OwnershipRuleIndex(RULES).get_matching_rules(data, munged_data) == expected
+
+
+def test_candidates() -> None:
+    index = OwnershipRuleIndex(RULES)
+    data = {"stacktrace": {"frames": [{"filename": "src/sentry/models/group.py"}]}}
+    candidates = index.get_candidates(data, Matcher.munge_if_needed(data))
+
+    # Rules without a literal segment and tag rules are always candidates. The url and module
+    # rules, and the path rules with a segment the event doesn't have, are left out.
+    assert [str(rule.matcher) for rule in candidates] == [
+        "path:*.js",
+        "path:src/sentry/*",
+        "path:src/sentry/api/**/*.py",
+        "tags.foo:bar",
+        "codeowners:/src/sentry/models/",
+        "codeowners:*.md",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "segment"),
+    [
+        ("src/sentry/*", "sentry"),
+        ("*.py", None),
+        ("/docs/", "docs"),
+        ("static/app/components/?ar.tsx", "components"),
+        ("src/[ab]/index.js", "index.js"),
+        ("src\\ foo/bar.py", None),
+        ("Foo/Bar.py", "bar.py"),
+    ],
+)
+def test_get_literal_segment(pattern: str, segment: str | None) -> None:
+    assert _get_literal_segment(pattern) == segment
+
+
+def test_get_rule_index_cached() -> None:
+    schema = dump_schema(RULES)
+    index = get_rule_index(schema)
+    assert get_rule_index(dump_schema(RULES)) is index
+    assert get_rule_index(dump_schema(RULES[1:])) is not index
+    assert index.rules == [Rule.load(rule) for rule in schema["rules"]]
@@ -7,6 +7,7 @@ the mock indexer actually behaves the same as the postgres indexer.
 """
 
 from collections.abc import Mapping
+from unittest import mock
 
 import pytest
 
@@ -559,6 +560,39 @@ def test_rate_limited(indexer, use_case_id, writes_limiter_option_name):
     assert len(rate_limited_strings - rate_limited_strings2) == 2
 
 
+def test_rate_limited_cache(indexer, indexer_cache, use_case_id, writes_limiter_option_name):
+    if isinstance(indexer, RawSimpleIndexer):
+        pytest.skip("mock indexer does not support rate limiting")
+
+    caching_indexer = CachingIndexer(indexer_cache, indexer)
+    org_strings = {1: {"a", "b", "c"}}
+
+    with override_options(
+        {
+            f"{writes_limiter_option_name}.per-org": [
+                {"window_seconds": 10, "granularity_seconds": 10, "limit": 1}
+            ],
+            "sentry-metrics.indexer.rate-limited-cache.window": 60,
+        }
+    ):
+        results = caching_indexer.bulk_record({use_case_id: org_strings})
+        rate_limited_strings = {k for k, v in results[use_case_id][1].items() if v is None}
+        assert len(rate_limited_strings) == 2
+
+        # Rate limited strings are rejected again without going to the database
+        with mock.patch.object(indexer, "bulk_record") as mock_bulk_record:
+            results = caching_indexer.bulk_record({use_case_id: org_strings})
+            assert not mock_bulk_record.called
+
+    assert {k for k, v in results[use_case_id][1].items() if v is None} == rate_limited_strings
+    for string in rate_limited_strings:
+        assert results.get_fetch_metadata()[use_case_id][1][string] == Metadata(
+            id=None,
+            fetch_type=FetchType.RATE_LIMITED,
+            fetch_type_ext=FetchTypeExt(is_global=False),
+        )
+
+
 def test_bulk_reverse_resolve(indexer):
     """
     Tests reverse resolve properly returns the corresponding strings
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from unittest import mock
 
 import pytest
 from django.conf import settings
@@ -240,3 +241,69 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+def test_local_cache(use_case_id: str) -> None:
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": True,
+            "sentry-metrics.indexer.write-new-cache-namespace": True,
+            "sentry-metrics.indexer.local-cache.size": 100,
+        }
+    ):
+        local_indexer_cache = StringIndexerCache(
+            **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
+        )
+        cache.clear()
+        namespace = "test"
+        values = {f"{use_case_id}:100:hello": 2, f"{use_case_id}:100:bye": 3}
+        local_indexer_cache.set_many(namespace, values)
+
+        # Served from the local tier even though the shared cache is gone
+        cache.clear()
+        assert local_indexer_cache.get_many(namespace, values.keys()) == values
+
+        local_indexer_cache.delete_many(namespace, list(values.keys()))
+        assert local_indexer_cache.get_many(namespace, values.keys()) == {
+            f"{use_case_id}:100:hello": None,
+            f"{use_case_id}:100:bye": None,
+        }
+
+        # Values read from the shared cache are kept locally
+        local_indexer_cache.set_many(namespace, values)
+        local_indexer_cache._get_local_cache().clear()
+        assert local_indexer_cache.get_many(namespace, values.keys()) == values
+        cache.clear()
+        assert local_indexer_cache.get_many(namespace, values.keys()) == values
+
+
+def test_refresh_candidates(use_case_id: str) -> None:
+    with override_options(
+        {
+            "sentry-metrics.indexer.local-cache.size": 100,
+            "sentry-metrics.indexer.refresh-ahead.min-hits": 2,
+        }
+    ):
+        local_indexer_cache = StringIndexerCache(
+            **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
+        )
+        namespace = "test"
+        hot_key = f"{use_case_id}:100:hot"
+        cold_key = f"{use_case_id}:100:cold"
+        local_indexer_cache.set_many(namespace, {hot_key: 1, cold_key: 2})
+
+        with mock.patch.object(
+            local_indexer_cache, "_get_refresh_written_before", return_value=2**40
+        ):
+            local_indexer_cache.get_many(namespace, [hot_key, cold_key])
+            assert local_indexer_cache.take_refresh_candidates(namespace) == set()
+
+            local_indexer_cache.get_many(namespace, [hot_key])
+            assert local_indexer_cache.take_refresh_candidates(namespace) == {hot_key}
+
+            # Only handed out once until the key has been written again
+            local_indexer_cache.get_many(namespace, [hot_key])
+            assert local_indexer_cache.take_refresh_candidates(namespace) == set()
+
+        local_indexer_cache.get_many(namespace, [hot_key, hot_key])
+        assert local_indexer_cache.take_refresh_candidates(namespace) == set()
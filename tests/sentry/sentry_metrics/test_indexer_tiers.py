@@ -0,0 +1,33 @@
+from unittest import mock
+
+from sentry.sentry_metrics.indexer.base import FetchTypeExt
+from sentry.sentry_metrics.indexer.tiers import BloomFilter, RateLimitedStrings
+
+
+def test_bloom_filter() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"sessions:1:{i}")
+
+    assert all(f"sessions:1:{i}" in bloom for i in range(1000))
+    false_positives = sum(f"sessions:2:{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_rate_limited_strings() -> None:
+    with mock.patch("sentry.sentry_metrics.indexer.tiers.time.monotonic", return_value=0):
+        rate_limited = RateLimitedStrings(window=10, capacity=100)
+        rate_limited.add("sessions:1:a", FetchTypeExt(is_global=False))
+        rate_limited.add("sessions:1:b", FetchTypeExt(is_global=True))
+
+        assert rate_limited.get("sessions:1:a") == FetchTypeExt(is_global=False)
+        assert rate_limited.get("sessions:1:b") == FetchTypeExt(is_global=True)
+        assert rate_limited.get("sessions:1:c") is None
+
+    # Still known for one more window after it rotated
+    with mock.patch("sentry.sentry_metrics.indexer.tiers.time.monotonic", return_value=15):
+        assert rate_limited.get("sessions:1:a") == FetchTypeExt(is_global=False)
+
+    with mock.patch("sentry.sentry_metrics.indexer.tiers.time.monotonic", return_value=26):
+        assert rate_limited.get("sessions:1:a") is None
+        assert rate_limited.get("sessions:1:b") is None
@@ -1,11 +1,13 @@
 import threading
 from datetime import datetime
 
+import pytest
 import rapidjson
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import Message, Partition, Topic, Value
 
 from sentry.spans.consumers.process.factory import ProcessSpansStrategyFactory
+from sentry.testutils.helpers.options import override_options
 
 
 class FakeProcess(threading.Thread):
@@ -17,7 +19,20 @@ class FakeProcess(threading.Thread):
         pass
 
 
-def test_basic(monkeypatch, request):
+@pytest.fixture(params=[False, True], ids=["flush", "streaming_flush"])
+def streaming_flush(request):
+    with override_options(
+        {
+            "standalone-spans.buffer-batched-ingestion.enable": False,
+            "standalone-spans.buffer-streaming-flush.enable": request.param,
+            "standalone-spans.buffer-flush-max-bytes": 1024 * 1024,
+            "standalone-spans.buffer-max-segment-bytes": 1024 * 1024,
+        }
+    ):
+        yield request.param
+
+
+def test_basic(monkeypatch, request, streaming_flush):
     # Flush very aggressively to make test pass instantly
     monkeypatch.setattr("time.sleep", lambda _: None)
 
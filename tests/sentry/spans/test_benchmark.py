@@ -0,0 +1,55 @@
+import itertools
+import random
+
+import pytest
+import rapidjson
+
+from sentry.spans.buffer import Span, SpansBuffer
+from sentry.testutils.skips import requires_pytest_benchmark
+
+TRACES_PER_BATCH = 50
+SPANS_PER_TRACE = 20
+ROUNDS = 20
+
+
+def make_batch(rng: random.Random, trace_ids: itertools.count) -> list[Span]:
+    spans = []
+    for _ in range(TRACES_PER_BATCH):
+        trace_id = f"{next(trace_ids):032x}"
+        span_ids = [f"{rng.getrandbits(64):016x}" for _ in range(SPANS_PER_TRACE)]
+        for i, span_id in enumerate(span_ids):
+            # The first span is the segment span, everything else hangs off a
+            # random span before it.
+            parent_span_id = span_ids[rng.randrange(i)] if i else None
+            spans.append(
+                Span(
+                    payload=rapidjson.dumps({"span_id": span_id}).encode("ascii"),
+                    trace_id=trace_id,
+                    span_id=span_id,
+                    parent_span_id=parent_span_id,
+                    project_id=1,
+                    is_segment_span=not i,
+                )
+            )
+    rng.shuffle(spans)
+    return spans
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("batched_ingestion", [False, True], ids=["per_span", "batched"])
+def test_benchmark_process_spans(batched_ingestion, benchmark):
+    buffer = SpansBuffer(assigned_shards=list(range(32)), batched_ingestion=batched_ingestion)
+    rng = random.Random(0)
+    trace_ids = itertools.count(1)
+
+    def setup():
+        return (make_batch(rng, trace_ids), 0), {}
+
+    benchmark.pedantic(buffer.process_spans, setup=setup, rounds=ROUNDS)
+
+    segments = buffer.flush_segments(now=3600)
+    assert len(segments) == TRACES_PER_BATCH * ROUNDS
+    assert sum(len(segment.spans) for segment in segments.values()) == (
+        TRACES_PER_BATCH * SPANS_PER_TRACE * ROUNDS
+    )
+    buffer.done_flush_segments(segments)
@@ -45,19 +45,23 @@ def _normalize_output(output: dict[SegmentKey, FlushedSegment]):
         segment.spans.sort(key=lambda span: span.payload["span_id"])
 
 
-@pytest.fixture(params=["cluster", "single"])
+@pytest.fixture(
+    params=[("cluster", False), ("single", False), ("cluster", True), ("single", True)],
+    ids=["cluster", "single", "cluster-batched", "single-batched"],
+)
 def buffer(request):
-    if request.param == "cluster":
+    redis_type, batched_ingestion = request.param
+    if redis_type == "cluster":
         from sentry.testutils.helpers.redis import use_redis_cluster
 
         with use_redis_cluster("default"):
-            buf = SpansBuffer(assigned_shards=list(range(32)))
+            buf = SpansBuffer(assigned_shards=list(range(32)), batched_ingestion=batched_ingestion)
             # since we patch the default redis cluster only temporarily, we
             # need to clean it up ourselves.
             buf.client.flushall()
             yield buf
     else:
-        yield SpansBuffer(assigned_shards=list(range(32)))
+        yield SpansBuffer(assigned_shards=list(range(32)), batched_ingestion=batched_ingestion)
 
 
 def assert_ttls(client: StrictRedis[bytes]):
@@ -496,3 +500,248 @@ def test_flush_rebalance(buffer: SpansBuffer):
     assert not rv
 
     assert_clean(buffer.client)
+
+
+def _flush_streaming(buffer: SpansBuffer, now: int, **kwargs) -> dict[SegmentKey, FlushedSegment]:
+    return dict(buffer.iter_flush_segments(now=now, **kwargs))
+
+
+def test_iter_flush_segments(buffer: SpansBuffer):
+    # Enough spans in a single segment for SSCAN to need multiple pages
+    spans = [
+        Span(
+            payload=_payload(b"a" * 16),
+            trace_id="a" * 32,
+            span_id="a" * 16,
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+        )
+    ] + [
+        Span(
+            payload=_payload(b"%016x" % i),
+            trace_id="a" * 32,
+            span_id="%016x" % i,
+            parent_span_id="a" * 16,
+            project_id=1,
+        )
+        for i in range(1, 2000)
+    ]
+
+    process_spans(spans, buffer, now=0)
+
+    assert _flush_streaming(buffer, now=5) == {}
+    expected = buffer.flush_segments(now=11)
+    rv = _flush_streaming(buffer, now=11)
+    _normalize_output(expected)
+    _normalize_output(rv)
+    assert rv == expected
+    assert len(rv[_segment_id(1, "a" * 32, "a" * 16)].spans) == 2000
+
+    buffer.done_flush_segments(rv)
+    assert _flush_streaming(buffer, now=30) == {}
+
+    assert_clean(buffer.client)
+
+
+def test_iter_flush_segments_max_bytes(buffer: SpansBuffer, monkeypatch):
+    monkeypatch.setattr("sentry.spans.buffer.FLUSH_SCAN_SEGMENTS", 1)
+
+    spans = [
+        Span(
+            payload=_payload(span_id),
+            trace_id=trace_id,
+            span_id=span_id.decode("ascii"),
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+        )
+        for trace_id, span_id in [("a" * 32, b"a" * 16), ("b" * 32, b"b" * 16)]
+    ]
+
+    process_spans(spans, buffer, now=0)
+
+    # Only one segment fits into a flush, the other one stays in the queue.
+    rv = _flush_streaming(buffer, now=11, max_bytes=1)
+    assert len(rv) == 1
+    buffer.done_flush_segments(rv)
+
+    rv2 = _flush_streaming(buffer, now=11, max_bytes=1)
+    assert len(rv2) == 1
+    assert rv2.keys() != rv.keys()
+    buffer.done_flush_segments(rv2)
+
+    assert _flush_streaming(buffer, now=30) == {}
+
+    assert_clean(buffer.client)
+
+
+def test_iter_flush_segments_max_segment_bytes(buffer: SpansBuffer):
+    spans = [
+        Span(
+            payload=_payload(b"a" * 16),
+            trace_id="a" * 32,
+            span_id="a" * 16,
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+        ),
+        Span(
+            payload=_payload(b"b" * 16),
+            trace_id="a" * 32,
+            span_id="b" * 16,
+            parent_span_id="a" * 16,
+            project_id=1,
+        ),
+        Span(
+            payload=_payload(b"c" * 16),
+            trace_id="c" * 32,
+            span_id="c" * 16,
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+        ),
+    ]
+
+    process_spans(spans, buffer, now=0)
+
+    # The first segment is too large to be flushed along with others, so it's skipped and
+    # read on its own by the next flush. Both are flushed in full.
+    max_segment_bytes = len(_payload(b"a" * 16)) + 1
+    rv = _flush_streaming(buffer, now=11, max_segment_bytes=max_segment_bytes)
+    assert len(rv) == 1
+    buffer.done_flush_segments(rv)
+    rv2 = _flush_streaming(buffer, now=11, max_segment_bytes=max_segment_bytes)
+    assert len(rv2) == 1
+    buffer.done_flush_segments(rv2)
+
+    rv.update(rv2)
+    _normalize_output(rv)
+    assert rv == {
+        _segment_id(1, "a" * 32, "a" * 16): FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[
+                _output_segment(b"a" * 16, b"a" * 16, True),
+                _output_segment(b"b" * 16, b"a" * 16, False),
+            ],
+        ),
+        _segment_id(1, "c" * 32, "c" * 16): FlushedSegment(
+            queue_key=mock.ANY, spans=[_output_segment(b"c" * 16, b"c" * 16, True)]
+        ),
+    }
+
+    assert _flush_streaming(buffer, now=30) == {}
+
+    assert_clean(buffer.client)
+
+
+def _trace_segment(shard: int, trace_i: int, num_spans: int = 1) -> list[Span]:
+    # With 32 assigned shards, the segment is queued in `shard`
+    trace_id = "%032x" % ((trace_i + 1) * 32 + shard)
+    root_span_id = "%016x" % ((trace_i + 1) * 32 + shard)
+    return [
+        Span(
+            payload=_payload(root_span_id.encode("ascii")),
+            trace_id=trace_id,
+            span_id=root_span_id,
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+        )
+    ] + [
+        Span(
+            payload=_payload(b"%016x" % (0xFF00 + i)),
+            trace_id=trace_id,
+            span_id="%016x" % (0xFF00 + i),
+            parent_span_id=root_span_id,
+            project_id=1,
+        )
+        for i in range(1, num_spans)
+    ]
+
+
+def _trace_segment_key(shard: int, trace_i: int) -> SegmentKey:
+    return _segment_id(
+        1, "%032x" % ((trace_i + 1) * 32 + shard), "%016x" % ((trace_i + 1) * 32 + shard)
+    )
+
+
+def test_iter_flush_segments_max_segment_bytes_later_shard(buffer: SpansBuffer):
+    # The oversized segment is queued in the second shard, behind segments of the first
+    process_spans(
+        _trace_segment(0, 0) + _trace_segment(1, 0, num_spans=2) + _trace_segment(1, 1),
+        buffer,
+        now=0,
+    )
+
+    max_segment_bytes = len(_payload(b"a" * 16)) + 1
+    rv = _flush_streaming(buffer, now=11, max_segment_bytes=max_segment_bytes)
+    # Segments queued after the oversized one are still flushed
+    assert rv.keys() == {_trace_segment_key(0, 0), _trace_segment_key(1, 1)}
+    buffer.done_flush_segments(rv)
+
+    # Even though the first shard always has segments due, the oversized segment is
+    # flushed by the next flush
+    process_spans(_trace_segment(0, 1), buffer, now=1)
+    rv = _flush_streaming(buffer, now=12, max_segment_bytes=max_segment_bytes)
+    assert rv.keys() == {_trace_segment_key(1, 0), _trace_segment_key(0, 1)}
+    assert len(rv[_trace_segment_key(1, 0)].spans) == 2
+    buffer.done_flush_segments(rv)
+
+    assert _flush_streaming(buffer, now=30) == {}
+
+    assert_clean(buffer.client)
+
+
+def test_iter_flush_segments_max_bytes_rotates_shards(buffer: SpansBuffer, monkeypatch):
+    monkeypatch.setattr("sentry.spans.buffer.FLUSH_SCAN_SEGMENTS", 1)
+
+    process_spans(_trace_segment(0, 0) + _trace_segment(1, 0), buffer, now=0)
+
+    # Only one segment fits into a flush
+    rv = _flush_streaming(buffer, now=11, max_bytes=1)
+    assert rv.keys() == {_trace_segment_key(0, 0)}
+    buffer.done_flush_segments(rv)
+
+    # The next flush starts with the second shard, even though the first one has
+    # segments due again
+    process_spans(_trace_segment(0, 1), buffer, now=1)
+    rv = _flush_streaming(buffer, now=12, max_bytes=1)
+    assert rv.keys() == {_trace_segment_key(1, 0)}
+    buffer.done_flush_segments(rv)
+
+    rv = _flush_streaming(buffer, now=30)
+    assert rv.keys() == {_trace_segment_key(0, 1)}
+    buffer.done_flush_segments(rv)
+
+    assert_clean(buffer.client)
+
+
+def test_flushed_segment_without_payloads(buffer: SpansBuffer):
+    process_spans(
+        [
+            Span(
+                payload=_payload(b"a" * 16),
+                trace_id="a" * 32,
+                span_id="a" * 16,
+                parent_span_id=None,
+                project_id=1,
+                is_segment_span=True,
+            )
+        ],
+        buffer,
+        now=0,
+    )
+
+    rv = {
+        segment_key: flushed_segment.without_payloads()
+        for segment_key, flushed_segment in _flush_streaming(buffer, now=11).items()
+    }
+    assert rv == {
+        _segment_id(1, "a" * 32, "a" * 16): FlushedSegment(
+            queue_key=mock.ANY, spans=[OutputSpan(payload={"span_id": "a" * 16})]
+        ),
+    }
+    buffer.done_flush_segments(rv)
+
+    assert_clean(buffer.client)
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import patch
+
+import grpc
+import pytest
+from sentry_protos.taskbroker.v1.taskbroker_pb2 import (
+    TASK_ACTIVATION_STATUS_COMPLETE,
+    FetchNextTask,
+    GetTaskRequest,
+    GetTaskResponse,
+    SetTaskStatusRequest,
+    SetTaskStatusResponse,
+    TaskActivation,
+)
+
+from sentry.taskworker.client import TaskworkerClient
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_TASKS = 500
+# Roughly the round trip to a broker in the same region
+BROKER_LATENCY = 0.002
+
+
+class BrokerError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode):
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+
+class LocalBrokerMethod:
+    def __init__(self, broker: "LocalBroker", handler):
+        self.broker = broker
+        self.handler = handler
+
+    def __call__(self, request, **kwargs):
+        time.sleep(self.broker.latency)
+        return self.handler(request)
+
+    def future(self, request, **kwargs) -> Future:
+        return self.broker.executor.submit(self, request)
+
+
+class LocalBroker:
+    """
+    In-process stand-in for a taskbroker, which hands out no-op activations and records their
+    status updates. Every call takes `latency` seconds, calls made through futures run
+    concurrently.
+    """
+
+    def __init__(self, num_tasks: int, latency: float):
+        self.latency = latency
+        self.pending = deque(
+            TaskActivation(
+                id=f"task-{i}",
+                namespace="examples",
+                taskname="examples.simple_task",
+                parameters='{"args": [], "kwargs": {}}',
+                processing_deadline_duration=10,
+            )
+            for i in range(num_tasks)
+        )
+        self.completed: set[str] = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=32)
+        self.GetTask = LocalBrokerMethod(self, self.get_task)
+        self.SetTaskStatus = LocalBrokerMethod(self, self.set_task_status)
+
+    def _next_task(self) -> TaskActivation | None:
+        with self.lock:
+            return self.pending.popleft() if self.pending else None
+
+    def get_task(self, request: GetTaskRequest) -> GetTaskResponse:
+        task = self._next_task()
+        if task is None:
+            raise BrokerError(grpc.StatusCode.NOT_FOUND)
+        return GetTaskResponse(task=task)
+
+    def set_task_status(self, request: SetTaskStatusRequest) -> SetTaskStatusResponse:
+        with self.lock:
+            self.completed.add(request.id)
+        if request.HasField("fetch_next_task"):
+            task = self._next_task()
+            if task is not None:
+                return SetTaskStatusResponse(task=task)
+        return SetTaskStatusResponse()
+
+
+def process_one_at_a_time(client: TaskworkerClient) -> None:
+    task = client.get_task()
+    while task is not None:
+        task = client.update_task(task.id, TASK_ACTIVATION_STATUS_COMPLETE, FetchNextTask())
+
+
+def process_batched(client: TaskworkerClient, batch_size: int) -> None:
+    tasks = client.get_tasks(count=batch_size)
+    while tasks:
+        results = client.update_tasks(
+            [(task.id, TASK_ACTIVATION_STATUS_COMPLETE, FetchNextTask()) for task in tasks]
+        )
+        tasks = [result for result in results if isinstance(result, TaskActivation)]
+        if not tasks:
+            tasks = client.get_tasks(count=batch_size)
+
+
+@django_db_all
+@requires_pytest_benchmark
+@pytest.mark.parametrize("batch_size", [1, 16])
+def test_benchmark_task_throughput(batch_size, benchmark):
+    brokers: list[LocalBroker] = []
+
+    def setup():
+        broker = LocalBroker(NUM_TASKS, BROKER_LATENCY)
+        brokers.append(broker)
+        with patch.object(TaskworkerClient, "_connect_to_host", return_value=broker):
+            client = TaskworkerClient("localhost:50051", 1)
+        return (client,), {}
+
+    def run(client: TaskworkerClient) -> None:
+        if batch_size == 1:
+            process_one_at_a_time(client)
+        else:
+            process_batched(client, batch_size)
+
+    benchmark.pedantic(run, setup=setup, rounds=3)
+
+    for broker in brokers:
+        broker.executor.shutdown()
+        assert not broker.pending
+        assert len(broker.completed) == NUM_TASKS
@@ -27,6 +27,18 @@ class MockServiceCall:
     metadata: tuple[tuple[str, str | bytes], ...] | None = None
 
 
+class MockFuture:
+    """Stub for the futures returned by grpc service methods"""
+
+    def __init__(self, response: Any):
+        self.response = response
+
+    def result(self, timeout: float | None = None) -> Any:
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
 class MockServiceMethod:
     """Stub for grpc service methods"""
 
@@ -53,6 +65,12 @@ class MockServiceMethod:
             raise res.response
         return res.response
 
+    def future(self, *args, **kwargs):
+        res = self.responses[0]
+        tail = self.responses[1:]
+        self.responses = tail + [res]
+        return MockFuture(res.response)
+
     def with_call(self, *args, **kwargs):
         res = self.responses[0]
         if res.metadata:
@@ -429,3 +447,113 @@ def test_client_loadbalance():
 
             client.update_task(task_3.id, TASK_ACTIVATION_STATUS_COMPLETE, None)
             assert client._task_id_to_host == {}
+
+
+@django_db_all
+def test_get_tasks_ok():
+    channel = MockChannel()
+    for task_id in ("abc123", "def456"):
+        channel.add_response(
+            "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+            GetTaskResponse(
+                task=TaskActivation(
+                    id=task_id,
+                    namespace="testing",
+                    taskname="do_thing",
+                    parameters="",
+                    headers={},
+                    processing_deadline_duration=10,
+                )
+            ),
+        )
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.NOT_FOUND, "no pending task found"),
+    )
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        result = client.get_tasks(namespace="testing", count=3)
+
+        assert [task.id for task in result] == ["abc123", "def456"]
+        assert client._task_id_to_host == {
+            "abc123": "localhost-0:50051",
+            "def456": "localhost-0:50051",
+        }
+
+
+@django_db_all
+def test_get_tasks_not_found():
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.NOT_FOUND, "no pending task found"),
+    )
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        assert client.get_tasks(count=4) == []
+
+
+@django_db_all
+def test_get_tasks_failure():
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.INTERNAL, "something bad"),
+    )
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        with pytest.raises(grpc.RpcError):
+            client.get_tasks(count=4)
+
+
+@django_db_all
+def test_update_tasks():
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/SetTaskStatus",
+        SetTaskStatusResponse(
+            task=TaskActivation(
+                id="ghi789",
+                namespace="testing",
+                taskname="do_thing",
+                parameters="",
+                headers={},
+                processing_deadline_duration=10,
+            )
+        ),
+    )
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/SetTaskStatus",
+        MockGrpcError(grpc.StatusCode.UNAVAILABLE, "broker went away"),
+    )
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/SetTaskStatus",
+        MockGrpcError(grpc.StatusCode.NOT_FOUND, "no pending tasks found"),
+    )
+    with patch("sentry.taskworker.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient("localhost:50051", 1)
+        client._task_id_to_host = {
+            "abc123": "localhost-0:50051",
+            "def456": "localhost-0:50051",
+            "xyz000": "localhost-0:50051",
+        }
+        result = client.update_tasks(
+            [
+                ("abc123", TASK_ACTIVATION_STATUS_COMPLETE, FetchNextTask(namespace=None)),
+                ("def456", TASK_ACTIVATION_STATUS_RETRY, None),
+                ("unknown", TASK_ACTIVATION_STATUS_COMPLETE, None),
+                ("xyz000", TASK_ACTIVATION_STATUS_COMPLETE, FetchNextTask(namespace=None)),
+            ]
+        )
+
+        assert len(result) == 4
+        assert isinstance(result[0], TaskActivation) and result[0].id == "ghi789"
+        assert isinstance(result[1], grpc.RpcError)
+        assert result[1].code() == grpc.StatusCode.UNAVAILABLE
+        assert result[2] is None
+        assert result[3] is None
+        assert client._task_id_to_host == {"ghi789": "localhost-0:50051"}
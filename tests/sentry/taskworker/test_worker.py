@@ -103,6 +103,18 @@ class TestTaskWorker(TestCase):
         assert example_tasks.retry_task
         assert example_tasks.at_most_once_task
 
+    def test_forkserver_process_type(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="forkserver",
+        )
+        assert taskworker.mp_context.get_start_method() == "forkserver"
+
+        with pytest.raises(ValueError):
+            TaskWorker(rpc_host="127.0.0.1:50051", num_brokers=1, process_type="nope")
+
     def test_fetch_task(self) -> None:
         taskworker = TaskWorker(
             rpc_host="127.0.0.1:50051", num_brokers=1, max_child_task_count=100, process_type="fork"
@@ -274,6 +286,109 @@ class TestTaskWorker(TestCase):
             assert redis.get("no-retries-remaining"), "key should exist if except block was hit"
             redis.delete("no-retries-remaining")
 
+    def test_fetch_tasks_limited_by_queue_size(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            child_tasks_queue_maxsize=3,
+            fetch_batch_size=8,
+        )
+        with mock.patch.object(taskworker.client, "get_tasks") as mock_get:
+            mock_get.return_value = [SIMPLE_TASK, RETRY_TASK, FAIL_TASK]
+            taskworker.run_once()
+            mock_get.assert_called_once_with(None, 3)
+
+            # The queue is full, nothing is fetched
+            assert not taskworker._add_task()
+            mock_get.assert_called_once()
+
+        fetched = [taskworker._child_tasks.get(timeout=1) for _ in range(3)]
+        assert [task.id for task in fetched] == [SIMPLE_TASK.id, RETRY_TASK.id, FAIL_TASK.id]
+        taskworker.shutdown()
+
+    def test_send_results(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            child_tasks_queue_maxsize=2,
+            fetch_batch_size=8,
+        )
+        err = grpc.RpcError("update task failed")
+        setattr(err, "code", lambda: grpc.StatusCode.UNAVAILABLE)
+        results = [
+            ProcessingResult(task_id="1", status=TASK_ACTIVATION_STATUS_COMPLETE),
+            ProcessingResult(task_id="2", status=TASK_ACTIVATION_STATUS_RETRY),
+            ProcessingResult(task_id="3", status=TASK_ACTIVATION_STATUS_COMPLETE),
+        ]
+        with mock.patch.object(taskworker, "client") as mock_client:
+            mock_client.update_tasks.return_value = [SIMPLE_TASK, None, err]
+            taskworker._send_results(results)
+
+            # Only as many tasks as fit into the child tasks queue are requested
+            updates = mock_client.update_tasks.call_args[0][0]
+            assert [(task_id, status) for task_id, status, _ in updates] == [
+                (result.task_id, result.status) for result in results
+            ]
+            assert [fetch_next is not None for _, _, fetch_next in updates] == [
+                True,
+                True,
+                False,
+            ]
+
+        assert taskworker._child_tasks.get(timeout=1).id == SIMPLE_TASK.id
+        # Results of unavailable brokers are retried
+        assert taskworker._processed_tasks.get(timeout=1).task_id == "3"
+        assert taskworker._setstatus_backoff_seconds == 1
+        taskworker.shutdown()
+
+    def test_run_once_batched(self) -> None:
+        max_runtime = 5
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            fetch_batch_size=4,
+        )
+        with mock.patch.object(taskworker, "client") as mock_client:
+
+            def get_tasks_response(namespace, count):
+                if mock_client.get_tasks.call_count == 1:
+                    return [SIMPLE_TASK, RETRY_STATE_TASK]
+                return []
+
+            def update_tasks_response(updates):
+                return [None] * len(updates)
+
+            mock_client.get_tasks.side_effect = get_tasks_response
+            mock_client.update_tasks.side_effect = update_tasks_response
+            taskworker.start_result_thread()
+            taskworker.start_spawn_children_thread()
+
+            start = time.time()
+            while True:
+                taskworker.run_once()
+                updated = [
+                    task_id
+                    for call in mock_client.update_tasks.call_args_list
+                    for task_id, _, _ in call[0][0]
+                ]
+                if len(updated) >= 2:
+                    break
+                if time.time() - start > max_runtime:
+                    taskworker.shutdown()
+                    raise AssertionError("Timeout waiting for update_tasks to be called")
+
+            taskworker.shutdown()
+            assert sorted(updated) == sorted([SIMPLE_TASK.id, RETRY_STATE_TASK.id])
+            assert not mock_client.get_task.called
+            assert not mock_client.update_task.called
+            redis_clusters.get("default").delete("no-retries-remaining")
+
 
 @pytest.mark.django_db
 @mock.patch("sentry.taskworker.workerchild.capture_checkin")
@@ -514,3 +629,38 @@ def test_child_process_terminate_task(mock_capture: mock.Mock) -> None:
     assert result.status == TASK_ACTIVATION_STATUS_FAILURE
     assert mock_capture.call_count == 1
     assert type(mock_capture.call_args.args[0]) is ProcessingDeadlineExceeded
+
+
+@pytest.mark.django_db
+@mock.patch("sentry.utils.memory.get_private_rss_usage", return_value=3 * 1024 * 1024)
+@mock.patch("sentry.utils.memory.get_current_rss_usage", return_value=40 * 1024 * 1024)
+@mock.patch("sentry.utils.metrics.distribution")
+def test_child_process_reports_startup(
+    mock_distribution: mock.Mock, mock_rss: mock.Mock, mock_private_rss: mock.Mock
+) -> None:
+    todo: queue.Queue[TaskActivation] = queue.Queue()
+    processed: queue.Queue[ProcessingResult] = queue.Queue()
+    shutdown = Event()
+
+    todo.put(SIMPLE_TASK)
+    child_process(
+        todo,
+        processed,
+        shutdown,
+        max_task_count=1,
+        processing_pool_name="test",
+        process_type="forkserver",
+        spawned_at=time.time() - 1,
+    )
+
+    assert processed.get().status == TASK_ACTIVATION_STATUS_COMPLETE
+    startup = {
+        call.args[0]: call
+        for call in mock_distribution.call_args_list
+        if call.args[0].startswith("taskworker.worker.child_startup.")
+    }
+    assert startup["taskworker.worker.child_startup.rss"].args[1] == 40 * 1024 * 1024
+    assert startup["taskworker.worker.child_startup.private_rss"].args[1] == 3 * 1024 * 1024
+    duration = startup["taskworker.worker.child_startup.duration"]
+    assert duration.args[1] >= 1
+    assert duration.kwargs["tags"] == {"process_type": "forkserver", "processing_pool": "test"}
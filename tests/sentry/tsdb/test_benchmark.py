@@ -0,0 +1,52 @@
+import copy
+from datetime import datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.base import ONE_HOUR, TSDBModel
+from sentry.tsdb.redis import RedisTSDB
+
+GROUPS = 500
+BUCKETS = 24
+
+
+@pytest.fixture
+def tsdb() -> tuple[RedisTSDB, list[int], datetime, datetime]:
+    """
+    Counters for `GROUPS` groups over the last `BUCKETS` hours.
+    """
+    db = RedisTSDB(
+        prefix="ts-benchmark:",
+        rollups=((ONE_HOUR, BUCKETS),),
+        cluster="tsdb",
+        enable_batched_reads=True,
+    )
+
+    end = timezone.now()
+    start = end - timedelta(hours=BUCKETS - 1)
+    keys = list(range(1, GROUPS + 1))
+    for hour in range(BUCKETS):
+        db.incr_multi(
+            [(TSDBModel.group, key, {"count": key % 7}) for key in keys],
+            timestamp=start + timedelta(hours=hour),
+        )
+
+    return db, keys, start, end
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("batched", [False, True], ids=["unbatched", "batched"])
+@pytest.mark.parametrize("method", ["get_range", "get_timeseries_sums"])
+def test_benchmark_counter_reads(tsdb, method, batched, benchmark):
+    db, keys, start, end = tsdb
+    if not batched:
+        db = copy.copy(db)
+        db.enable_batched_reads = False
+
+    read = getattr(db, method)
+    # Warm up the script cache and connections
+    read(TSDBModel.group, keys, start, end)
+
+    benchmark(read, TSDBModel.group, keys, start, end)
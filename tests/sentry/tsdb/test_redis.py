@@ -1,3 +1,4 @@
+import copy
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
@@ -649,3 +650,39 @@ class RedisTSDBTest(TestCase):
             [b"eta", b"7"],
             [b"bar", b"7"],
         ]
+
+
+class RedisTSDBBatchedReadsTest(RedisTSDBTest):
+    @override_options(
+        {"redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}}
+    )
+    def setUp(self):
+        self.db = RedisTSDB(
+            rollups=(
+                # time in seconds, samples to keep
+                (10, 30),  # 5 minutes at 10 seconds
+                (ONE_MINUTE, 120),  # 2 hours at 1 minute
+                (ONE_HOUR, 24),  # 1 days at 1 hour
+                (ONE_DAY, 30),  # 30 days at 1 day
+            ),
+            vnodes=64,
+            enable_frequency_sketches=True,
+            enable_batched_reads=True,
+            cluster="tsdb",
+        )
+
+    def test_batched_reads_match_unbatched(self):
+        unbatched = copy.copy(self.db)
+        unbatched.enable_batched_reads = False
+
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        keys = list(range(1, 200))
+        for i, key in enumerate(keys):
+            self.db.incr(TSDBModel.group, key, now + timedelta(hours=i % 4), count=i)
+
+        assert self.db.get_range(
+            TSDBModel.group, keys, now, now + timedelta(hours=3)
+        ) == unbatched.get_range(TSDBModel.group, keys, now, now + timedelta(hours=3))
+        assert self.db.get_timeseries_sums(
+            TSDBModel.group, keys, now, now + timedelta(hours=3)
+        ) == {key: i for i, key in enumerate(keys)}
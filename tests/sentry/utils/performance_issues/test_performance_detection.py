@@ -13,16 +13,19 @@ from sentry.issues.grouptype import (
 )
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers import override_options
-from sentry.testutils.performance_issues.event_generators import get_event
-from sentry.utils.performance_issues.base import DetectorType, total_span_time
+from sentry.testutils.performance_issues.event_generators import EVENTS, get_event
+from sentry.utils.performance_issues.base import DetectorType, SpanIndex, total_span_time
 from sentry.utils.performance_issues.detectors.n_plus_one_db_span_detector import (
     NPlusOneDBSpanDetector,
 )
 from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
     EventPerformanceProblem,
     _detect_performance_problems,
     detect_performance_problems,
     get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
 )
 from sentry.utils.performance_issues.performance_problem import PerformanceProblem
 
@@ -111,6 +114,25 @@ class PerformanceDetectionTest(TestCase):
         detect_performance_problems({}, self.project)
         assert mock.call_count == 1
 
+    def test_run_detectors_on_data_matches_run_detector_on_data(self):
+        settings = get_detection_settings(self.project.id)
+        for event_name in sorted(EVENTS):
+            event = get_event(event_name)
+
+            expected = []
+            for detector_class in DETECTOR_CLASSES:
+                detector = detector_class(settings, event)
+                run_detector_on_data(detector, event)
+                expected.append(detector.stored_problems)
+
+            span_index = SpanIndex()
+            detectors = [
+                detector_class(settings, event, span_index) for detector_class in DETECTOR_CLASSES
+            ]
+            run_detectors_on_data(detectors, event)
+
+            assert [detector.stored_problems for detector in detectors] == expected, event_name
+
     @override_options(BASE_DETECTOR_OPTIONS)
     def test_detector_respects_project_option_settings(self):
         n_plus_one_event = get_event("n-plus-one-in-django-index-view")
@@ -0,0 +1,27 @@
+from typing import Any
+
+import pytest
+
+from sentry.testutils.factories import get_fixture_path
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from sentry.utils.safe import trim
+
+# A wide payload with thousands of frames and samples, and a deep tree of spans
+PAYLOADS = {
+    "wide": ("profiles", "valid_ios_profile.json"),
+    "deep": ("events", "performance_problems", "n-plus-one-db", "n-plus-one-db-mongodb.json"),
+}
+
+
+def load_payload(name: str) -> Any:
+    with open(get_fixture_path(*PAYLOADS[name])) as f:
+        return json.load(f)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("payload", sorted(PAYLOADS))
+@pytest.mark.parametrize("max_size,max_depth", [(512, 6), (1_000_000, 50)])
+def test_benchmark_trim(payload, max_size, max_depth, benchmark):
+    value = load_payload(payload)
+    benchmark.pedantic(trim, args=(value,), kwargs={"max_size": max_size, "max_depth": max_depth})
@@ -8,7 +8,10 @@ from typing import Any
 import pytest
 
 from sentry.testutils.cases import TestCase
+from sentry.testutils.factories import get_fixture_path
+from sentry.utils import json
 from sentry.utils.safe import (
+    TrimStats,
     get_path,
     safe_execute,
     safe_urlencode,
@@ -16,6 +19,7 @@ from sentry.utils.safe import (
     setdefault_path,
     trim,
 )
+from sentry.utils.strings import truncatechars
 
 a_very_long_string = "a" * 1024
 
@@ -62,6 +66,134 @@ class TrimTest(unittest.TestCase):
         a = {"a": {"b": {"c": []}}}
         assert trm(a) == {"a": {"b": {"c": "[]"}}}
 
+    def test_tuple(self):
+        assert trim(("a", ("b",))) == ("a", ("b",))
+        assert trim((a_very_long_string, "b")) == (a_very_long_string[:507] + "...",)
+
+    def test_unchanged_is_not_copied(self):
+        a = {"a": "x" * 10, "b": ["b", {"c": 1}]}
+        assert trim(a) is a
+
+        # Keys are trimmed in order of the length of their values
+        b = {"b": ["b", {"c": 1}], "a": "x" * 10}
+        result = trim(b)
+        assert result == b
+        assert list(result) == ["a", "b"]
+        assert result["b"] is b["b"]
+
+        c = {"a": {"c": 1}, "b": ["b", a_very_long_string]}
+        result = trim(c)
+        assert result["a"] is c["a"]
+        assert result["b"] is not c["b"]
+
+    def test_deeply_nested(self):
+        a: dict[str, Any] = {}
+        inner = a
+        for _ in range(5000):
+            inner["a"] = [{}]
+            inner = inner["a"][0]
+        inner["a"] = a_very_long_string
+
+        assert trim(a, max_size=100000, max_depth=20000) is a
+
+        result = trim(a, max_size=20500, max_depth=20000)
+        inner = result
+        for _ in range(5000):
+            inner = inner["a"][0]
+        assert inner["a"] == a_very_long_string[:495] + "..."
+
+    def test_stats(self):
+        stats = TrimStats()
+        a = {"a": a_very_long_string, "b": list(range(500)), "c": {"d": {"e": 1}}}
+        result = trim(a, max_depth=1, stats=stats)
+        assert result == {"c": {"d": '{"e":1}'}, "a": a_very_long_string[:490] + "..."}
+        assert stats == TrimStats(
+            truncated_strings=1, truncated_chars=1024 - 490, dropped_items=1, serialized_values=1
+        )
+
+
+# A wide payload with thousands of frames and samples, and a deep tree of spans
+TRIM_PAYLOADS = {
+    "wide": ("profiles", "valid_ios_profile.json"),
+    "deep": ("events", "performance_problems", "n-plus-one-db", "n-plus-one-db-mongodb.json"),
+}
+
+
+def load_trim_payload(name: str) -> Any:
+    with open(get_fixture_path(*TRIM_PAYLOADS[name])) as f:
+        return json.load(f)
+
+
+def recursive_trim(value, max_size=512, max_depth=6, _depth=0, _size=0):
+    """
+    The recursive implementation `trim` replaced, to compare its results against.
+    """
+    options = {
+        "max_depth": max_depth,
+        "max_size": max_size,
+        "_depth": _depth + 1,
+    }
+
+    if _depth > max_depth:
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        return recursive_trim(value, _size=_size, max_size=max_size)
+
+    elif isinstance(value, dict):
+        result: Any = {}
+        _size += 2
+        for k in sorted(value.keys(), key=lambda x: (len(str(value[x])), x)):
+            v = value[k]
+            trim_v = recursive_trim(v, _size=_size, **options)
+            result[k] = trim_v
+            _size += len(str(trim_v)) + 1
+            if _size >= max_size:
+                break
+
+    elif isinstance(value, (list, tuple)):
+        result = []
+        _size += 2
+        for v in value:
+            trim_v = recursive_trim(v, _size=_size, **options)
+            result.append(trim_v)
+            _size += len(str(trim_v))
+            if _size >= max_size:
+                break
+        if isinstance(value, tuple):
+            result = tuple(result)
+
+    elif isinstance(value, str):
+        result = truncatechars(value, max_size - _size)
+
+    else:
+        result = value
+
+    return result
+
+
+@pytest.mark.parametrize("payload", sorted(TRIM_PAYLOADS))
+@pytest.mark.parametrize(
+    "max_size,max_depth", [(512, 6), (4096, 6), (4096, 2), (1_000_000, 50), (100, 0)]
+)
+def test_trim_matches_recursive_trim(payload, max_size, max_depth):
+    value = load_trim_payload(payload)
+    expected = recursive_trim(value, max_size=max_size, max_depth=max_depth)
+    result = trim(value, max_size=max_size, max_depth=max_depth)
+    assert result == expected
+    assert str(result) == str(expected)
+
+
+@pytest.mark.parametrize("payload", sorted(TRIM_PAYLOADS))
+def test_trim_stats_on_payloads(payload):
+    value = load_trim_payload(payload)
+    stats = TrimStats()
+    trim(value, stats=stats)
+    assert stats.dropped_items > 0
+
+    stats = TrimStats()
+    assert trim(value, max_size=1_000_000, max_depth=50, stats=stats) == value
+    assert stats == TrimStats()
+
 
 class SafeExecuteTest(TestCase):
     def test_with_nameless_function(self):
@@ -3,26 +3,34 @@ from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
+from snuba_sdk import Column, Condition, Entity, Function, Op, Query, Request
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
+from sentry.locks import locks
 from sentry.models.grouprelease import GroupRelease
 from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import json
 from sentry.utils.snuba import (
     ROUND_UP,
     RetrySkipTimeout,
     SnubaQueryParams,
     UnqualifiedQueryError,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
+    get_singleflight_ttl,
     get_snuba_column_name,
     get_snuba_translators,
     quantize_time,
+    raw_snql_query,
 )
 
 
@@ -443,3 +451,79 @@ def test_retries():
         snuba_pool.urlopen("POST", "/query", body="{}")
 
     assert connection_mock.request.call_count == 1
+
+
+class SingleflightTest(TestCase):
+    referrer = "api.dashboards.widget.line-chart"
+
+    def make_request(self, end: datetime) -> Request:
+        return Request(
+            dataset="events",
+            app_id="default",
+            query=Query(
+                match=Entity("events"),
+                select=[Function("count", [], "count")],
+                where=[
+                    Condition(Column("project_id"), Op.EQ, self.project.id),
+                    Condition(Column("timestamp"), Op.GTE, end - timedelta(days=1)),
+                    Condition(Column("timestamp"), Op.LT, end),
+                ],
+            ),
+            tenant_ids={"organization_id": self.organization.id},
+        )
+
+    @override_options({"snuba.query-singleflight.min-ttl": 5})
+    def test_ttl(self):
+        now = timezone.now()
+        assert get_singleflight_ttl(self.make_request(now)) == 5
+        assert get_singleflight_ttl(self.make_request(now - timedelta(hours=1))) == 36
+        assert get_singleflight_ttl(self.make_request(now - timedelta(days=7))) == 300
+
+    def test_shared_result(self):
+        request = self.make_request(timezone.now())
+        result = {"data": [{"count": 1}], "meta": []}
+
+        with (
+            override_options({"snuba.query-singleflight.referrers": [self.referrer]}),
+            mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[result]) as query,
+        ):
+            assert raw_snql_query(request, self.referrer) == result
+            assert raw_snql_query(request, self.referrer) == result
+            assert query.call_count == 1
+
+            # other referrers are not shared
+            raw_snql_query(request, "api.discover.query-table")
+            assert query.call_count == 2
+
+    def test_coalesced(self):
+        request = self.make_request(timezone.now())
+        result_key = f"{get_cache_key(request)}:sf"
+        result = {"data": [{"count": 1}], "meta": []}
+
+        def leader_finishes(_):
+            cache.set(result_key, json.dumps(result), 60)
+
+        lock = locks.get(f"{result_key}:lock", duration=30)
+        with (
+            override_options({"snuba.query-singleflight.referrers": [self.referrer]}),
+            mock.patch("sentry.utils.snuba._bulk_snuba_query") as query,
+            mock.patch("time.sleep", side_effect=leader_finishes),
+            lock.acquire(),
+        ):
+            assert raw_snql_query(request, self.referrer) == result
+            assert not query.called
+
+    @override_options({"snuba.query-singleflight.wait-timeout": 0.0})
+    def test_leader_timeout(self):
+        request = self.make_request(timezone.now())
+        result_key = f"{get_cache_key(request)}:sf"
+        result = {"data": [{"count": 1}], "meta": []}
+
+        lock = locks.get(f"{result_key}:lock", duration=30)
+        with (
+            override_options({"snuba.query-singleflight.referrers": [self.referrer]}),
+            mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[result]) as query,
+            lock.acquire(),
+        ):
+            assert raw_snql_query(request, self.referrer) == result
+            assert query.call_count == 1
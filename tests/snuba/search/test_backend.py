@@ -30,10 +30,11 @@ from sentry.models.groupowner import GroupOwner
 from sentry.models.groupsubscription import GroupSubscription
 from sentry.search.snuba.backend import EventsDatasetSnubaSearchBackend, SnubaSearchBackendBase
 from sentry.search.snuba.executors import TrendsSortWeights
+from sentry.search.snuba.search_cache import SearchStateCache
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import SnubaTestCase, TestCase, TransactionTestCase
 from sentry.testutils.helpers import Feature, apply_feature_flag_on_cls
-from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.helpers.datetime import before_now, freeze_time
 from sentry.types.group import GroupSubStatus, PriorityLevel
 from sentry.utils import json
 from sentry.utils.snuba import SENTRY_SNUBA_MAP
@@ -2560,7 +2561,50 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
 
 
 class EventsSnubaSearchTest(TestCase, EventsSnubaSearchTestCases):
-    pass
+    def _page_through(self, **kwargs):
+        groups = []
+        hits = []
+        cursor = None
+        while True:
+            results = self.make_query(limit=1, count_hits=True, cursor=cursor, **kwargs)
+            groups.extend(results)
+            hits.append(results.hits)
+            if not results.next.has_results:
+                return groups, hits
+            cursor = results.next
+
+    def test_state_cache_pagination(self):
+        expected = self._page_through(sort_by="freq")
+
+        with (
+            # Keep the time window of all pages in the same bucket
+            freeze_time(timezone.now()),
+            self.options({"snuba.search.state-cache-ttl": 300}),
+            mock.patch.object(
+                SearchStateCache,
+                "set_candidates",
+                side_effect=SearchStateCache.set_candidates,
+                autospec=True,
+            ) as set_candidates,
+        ):
+            assert self._page_through(sort_by="freq") == expected
+            # Candidates are only selected from Postgres for the first page
+            assert set_candidates.call_count == 1
+
+    def test_state_cache_post_filtering(self):
+        with self.options({"snuba.search.max-pre-snuba-candidates": 1}):
+            expected = self._page_through(sort_by="freq")
+            with self.options({"snuba.search.state-cache-ttl": 300}):
+                groups, hits = self._page_through(sort_by="freq")
+
+        assert set(groups) == set(expected[0]) == {self.group1, self.group2}
+        assert len(set(hits)) == 1
+
+    def test_estimate_hits(self):
+        with self.options({"snuba.search.estimate-hits": True}):
+            results = self.make_query(sort_by="date", count_hits=True)
+        assert set(results) == {self.group1, self.group2}
+        assert results.hits == 2
 
 
 @apply_feature_flag_on_cls("organizations:issue-search-group-attributes-side-query")
@@ -3,6 +3,7 @@ from functools import cached_property
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 
 from sentry.issues.grouptype import ProfileFileIOGroupType
@@ -17,6 +18,7 @@ from sentry.search.events.constants import (
 )
 from sentry.tagstore.exceptions import GroupTagKeyNotFound, TagKeyNotFound
 from sentry.tagstore.snuba.backend import SnubaTagStorage
+from sentry.tagstore.snuba.tasks import refresh_tagstore_cache
 from sentry.tagstore.types import GroupTagValue, TagValue
 from sentry.testutils.abstract import Abstract
 from sentry.testutils.cases import PerformanceIssueTestCase, SnubaTestCase, TestCase
@@ -795,6 +797,101 @@ class TagStorageTest(TestCase, SnubaTestCase, SearchIssueTestMixin, PerformanceI
             == []
         )
 
+    def test_get_tag_value_paginator_stale_while_revalidate(self):
+        start = self.now - timedelta(days=1)
+        # Far enough in the future that the quantized end includes all events
+        end = self.now + timedelta(minutes=10)
+
+        def get_values(query=None, end=end):
+            return [
+                tv.value
+                for tv in self.ts.get_tag_value_paginator_for_projects(
+                    [self.proj1.id],
+                    [self.proj1env1.id],
+                    "sentry:user",
+                    start=start,
+                    end=end,
+                    query=query,
+                    tenant_ids={"referrer": "r", "organization_id": 1234},
+                ).get_result(10)
+            ]
+
+        with (
+            self.options({"tagstore.stale-while-revalidate.max-staleness": 600}),
+            mock.patch("sentry.tagstore.snuba.tasks.refresh_tagstore_cache.delay") as refresh,
+        ):
+            assert get_values() == ["id:user1", "id:user2"]
+
+            # Searches are answered from the cached values
+            with mock.patch("sentry.utils.snuba.query") as query:
+                assert get_values("user1") == ["id:user1"]
+                assert get_values("user") == ["id:user1", "id:user2"]
+                assert get_values("User") == []
+                assert not query.called
+
+            # Unless they use LIKE wildcards
+            assert get_values("user_") == ["id:user1", "id:user2"]
+
+            # The next time bucket is served from the previous one, and refreshed once
+            next_end = end + timedelta(minutes=5)
+            with mock.patch("sentry.utils.snuba.query") as query:
+                assert get_values(end=next_end) == ["id:user1", "id:user2"]
+                assert get_values("user2", end=next_end) == ["id:user2"]
+                assert not query.called
+            assert refresh.call_count == 1
+
+        refresh_tagstore_cache(**refresh.call_args.kwargs)
+        with (
+            self.options({"tagstore.stale-while-revalidate.max-staleness": 600}),
+            mock.patch("sentry.tagstore.snuba.tasks.refresh_tagstore_cache.delay") as refresh,
+            mock.patch("sentry.utils.snuba.query") as query,
+        ):
+            assert get_values(end=next_end) == ["id:user1", "id:user2"]
+            assert not query.called
+            assert not refresh.called
+
+    def test_get_tag_keys_for_projects_stale_while_revalidate(self):
+        start = self.now - timedelta(days=1)
+        end = self.now + timedelta(minutes=10)
+
+        def get_keys(end=end):
+            return {
+                tk.key
+                for tk in self.ts.get_tag_keys_for_projects(
+                    [self.proj1.id],
+                    [self.proj1env1.id],
+                    start,
+                    end,
+                    use_cache=True,
+                    tenant_ids={"referrer": "r", "organization_id": 1234},
+                )
+            }
+
+        with (
+            self.options({"tagstore.stale-while-revalidate.max-staleness": 600}),
+            mock.patch("sentry.tagstore.snuba.tasks.refresh_tagstore_cache.delay") as refresh,
+        ):
+            keys = get_keys()
+            assert {"foo", "baz", "browser", "sentry:user"} <= keys
+
+            with mock.patch("sentry.utils.snuba.query") as query:
+                assert get_keys() == keys
+                assert get_keys(end + timedelta(minutes=5)) == keys
+                assert not query.called
+            assert refresh.call_count == 1
+
+            # Stale results are only served up to the max staleness
+            cache.clear()
+            get_keys()
+            with (
+                mock.patch("sentry.tagstore.snuba.cache.time.time") as now,
+                mock.patch("sentry.utils.snuba.query", return_value={}) as query,
+            ):
+                now.return_value = timezone.now().timestamp() + 601
+                assert get_keys(end + timedelta(minutes=5)) == set()
+                assert query.called
+            assert refresh.call_count == 1
+
     def test_numeric_tag_value_paginator(self):
         from sentry.tagstore.types import TagValue
 